@@ -0,0 +1,5 @@
+-- Migration para revocar los tokens de acceso al cambiar la contraseña
+-- Ejecutar en la base de datos go_baby_go
+
+ALTER TABLE `administradores`
+  ADD COLUMN IF NOT EXISTS `token_version` int(11) NOT NULL DEFAULT 1;
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la analítica de formularios (GET /api/eventos/{id}/analitica/{tipo}).
+
+    python benchmarks/bench_analitica.py --detalles 1000000 --preguntas 20
+
+Sobre una base SQLite temporal (o la de --url) crea un evento con un
+formulario pre de --preguntas preguntas (una de cada cuatro textual, el resto
+de selección con cuatro opciones) y las respuestas necesarias para llegar a
+--detalles filas en detalle_respuestas. Mide:
+  - el conteo en Python recorriendo las filas de detalle (enfoque previo);
+  - el cálculo con GROUP BY en la base (fallo de caché);
+  - la lectura servida desde la caché, que sólo consulta los contadores.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from src.db.database import (
+    Base, DetalleRespuesta, Evento, Formulario, InscripcionEvento, Opcion, Pregunta, Respuesta, Voluntario,
+    get_engine_options
+)
+from src.services.analitica_service import AnaliticaService
+
+LOTE = 50000
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def poblar(engine, SessionLocal, detalles, num_preguntas):
+    db = SessionLocal()
+    formulario = Formulario(nombre="Benchmark", preguntas=[
+        Pregunta(
+            texto=f"Pregunta {i}",
+            tipo="textual" if i % 4 == 3 else "seleccion_unica",
+            orden=i,
+            opciones=[] if i % 4 == 3 else [Opcion(texto_opcion=f"Opción {j}", orden=j) for j in range(4)]
+        )
+        for i in range(num_preguntas)
+    ])
+    evento = Evento(nombre="Benchmark", lugar="Bogotá", descripcion="Analítica", formulario_pre=formulario)
+    db.add(evento)
+    db.commit()
+    preguntas = [(p.id, [o.id for o in p.opciones]) for p in formulario.preguntas]
+    evento_id, formulario_id = evento.id, formulario.id
+    db.close()
+
+    num_respuestas = detalles // num_preguntas
+    with engine.begin() as conexion:
+        conexion.execute(insert(Voluntario.__table__), [
+            {"id": i + 1, "nombre": f"V{i}", "correo": f"v{i}@example.com", "confirmacion_correo": f"v{i}@example.com",
+             "numero_identificacion": str(i)}
+            for i in range(num_respuestas)
+        ])
+        conexion.execute(insert(InscripcionEvento.__table__), [
+            {"id": i + 1, "voluntario_id": i + 1, "evento_id": evento_id, "completado_pre": True}
+            for i in range(num_respuestas)
+        ])
+        conexion.execute(insert(Respuesta.__table__), [
+            {"id": i + 1, "inscripcion_id": i + 1, "tipo_formulario": "pre", "codigo_respuesta": str(i)}
+            for i in range(num_respuestas)
+        ])
+        filas = []
+        for respuesta_id in range(1, num_respuestas + 1):
+            for pregunta_id, opciones in preguntas:
+                if opciones:
+                    filas.append({"respuesta_id": respuesta_id, "pregunta_id": pregunta_id,
+                                  "opcion_id": opciones[respuesta_id % len(opciones)], "texto_respuesta": None})
+                else:
+                    filas.append({"respuesta_id": respuesta_id, "pregunta_id": pregunta_id,
+                                  "opcion_id": None, "texto_respuesta": "" if respuesta_id % 5 == 0 else "Texto"})
+            if len(filas) >= LOTE:
+                conexion.execute(insert(DetalleRespuesta.__table__), filas)
+                filas = []
+        if filas:
+            conexion.execute(insert(DetalleRespuesta.__table__), filas)
+        conexion.execute(Evento.__table__.update().where(Evento.id == evento_id).values(
+            total_voluntarios=num_respuestas, completados_pre=num_respuestas, respuestas_pre=num_respuestas
+        ))
+    return evento_id, formulario_id, num_respuestas * num_preguntas
+
+
+def main(url, detalles, num_preguntas, repeticiones):
+    engine = create_engine(url, **get_engine_options(url))
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    inicio = time.perf_counter()
+    evento_id, formulario_id, total = poblar(engine, SessionLocal, detalles, num_preguntas)
+    print(f"Datos: {total} detalles de respuesta en {time.perf_counter() - inicio:.1f} s")
+
+    servicio = AnaliticaService()
+
+    def contar_en_python():
+        db = SessionLocal()
+        por_opcion, respondidas = Counter(), {}
+        for respuesta_id, pregunta_id, opcion_id, texto in db.query(
+            DetalleRespuesta.respuesta_id, DetalleRespuesta.pregunta_id,
+            DetalleRespuesta.opcion_id, DetalleRespuesta.texto_respuesta
+        ).join(Respuesta).join(InscripcionEvento).filter(
+            InscripcionEvento.evento_id == evento_id, Respuesta.tipo_formulario == "pre"
+        ).yield_per(5000):
+            if opcion_id is not None:
+                por_opcion[opcion_id] += 1
+            if opcion_id is not None or texto:
+                respondidas.setdefault(pregunta_id, set()).add(respuesta_id)
+        db.close()
+
+    def calcular():
+        db = SessionLocal()
+        servicio.calcular(db, evento_id, "pre", formulario_id)
+        db.close()
+
+    def desde_cache():
+        db = SessionLocal()
+        servicio.obtener(db, evento_id, "pre")
+        db.close()
+
+    python = medir(contar_en_python, repeticiones)
+    agregado = medir(calcular, repeticiones)
+    desde_cache()
+    cache = medir(desde_cache, repeticiones * 100)
+
+    print(f"Conteo en Python:    {python:.1f} ms")
+    print(f"GROUP BY en la base: {agregado:.1f} ms")
+    print(f"Desde la caché:      {cache:.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="URL de la base (por defecto, SQLite temporal)")
+    parser.add_argument("--detalles", type=int, default=1000000)
+    parser.add_argument("--preguntas", type=int, default=20)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+    url = args.url
+    if url is None:
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_analitica.db")
+    main(url, args.detalles, args.preguntas, args.repeticiones)
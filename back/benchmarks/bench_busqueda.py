@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la búsqueda de texto completo (GET /api/voluntarios/buscar).
+
+    python benchmarks/bench_busqueda.py --voluntarios 500000 --repeticiones 20
+
+Sobre una base SQLite temporal (o la de --url, MariaDB con busqueda_migration.sql)
+inserta N voluntarios con nombres combinados de listas fijas; los índices se
+llenan con los triggers en la misma inserción. Mide por tipo de búsqueda la
+latencia (p50 y p95) de busqueda_service.buscar_voluntarios frente al
+LIKE '%...%' que habría que hacer sin índice, y el costo de las escrituras
+con el índice activo.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, or_
+from sqlalchemy.orm import sessionmaker
+
+from src.db.database import Base, Voluntario, get_engine_options
+from src.services.busqueda_service import busqueda_service
+
+NOMBRES = ["Ana", "Beto", "Carla", "Diego", "Elena", "Felipe", "Gloria", "Hugo", "Isabel", "Julián",
+           "Karen", "Luis", "María", "Nicolás", "Olga", "Pedro", "Rosa", "Santiago", "Tatiana", "Valeria"]
+APELLIDOS = ["García", "Rodríguez", "Martínez", "López", "González", "Pérez", "Sánchez", "Ramírez", "Torres",
+             "Flórez", "Rivera", "Gómez", "Díaz", "Vargas", "Castro", "Ortiz", "Rojas", "Moreno", "Muñoz", "Suárez"]
+LOTE = 50000
+
+BUSQUEDAS = {
+    "nombre común": "maria garcia",
+    "prefijo corto": "jul",
+    "correo exacto": "usuario123456@example.com",
+    "identificación": "1000123456",
+}
+
+
+def poblar(engine, voluntarios):
+    aleatorio = random.Random(7)
+    with engine.begin() as conexion:
+        for inicio in range(0, voluntarios, LOTE):
+            conexion.execute(insert(Voluntario.__table__), [
+                {
+                    "nombre": f"{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)} {aleatorio.choice(APELLIDOS)}",
+                    "correo": f"usuario{i}@example.com",
+                    "confirmacion_correo": f"usuario{i}@example.com",
+                    "numero_identificacion": str(1000000000 + i),
+                }
+                for i in range(inicio, min(inicio + LOTE, voluntarios))
+            ])
+
+
+def latencias(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return statistics.median(tiempos), tiempos[int(len(tiempos) * 0.95) - 1]
+
+
+def main(url, voluntarios, repeticiones):
+    engine = create_engine(url, **get_engine_options(url))
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    inicio = time.perf_counter()
+    poblar(engine, voluntarios)
+    print(f"Inserción de {voluntarios} voluntarios con índice: {time.perf_counter() - inicio:.1f} s")
+
+    db = SessionLocal()
+    for nombre, busqueda in BUSQUEDAS.items():
+        terminos = busqueda_service.terminos(busqueda)
+        like = db.query(Voluntario.id).filter(*(
+            or_(Voluntario.nombre.like(f"%{t}%"), Voluntario.correo.like(f"%{t}%"),
+                Voluntario.numero_identificacion.like(f"%{t}%"))
+            for t in terminos
+        )).order_by(Voluntario.id).limit(20)
+        p50_fts, p95_fts = latencias(lambda: busqueda_service.buscar_voluntarios(db, busqueda), repeticiones)
+        p50_like, p95_like = latencias(lambda: like.all(), max(repeticiones // 4, 1))
+        print(f"{nombre:<15} texto completo p50 {p50_fts:7.2f} ms p95 {p95_fts:7.2f} ms | "
+              f"LIKE p50 {p50_like:8.2f} ms p95 {p95_like:8.2f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="URL de la base (por defecto, SQLite temporal)")
+    parser.add_argument("--voluntarios", type=int, default=500000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+    url = args.url
+    if url is None:
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_busqueda.db")
+    main(url, args.voluntarios, args.repeticiones)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la edición de un formulario grande.
+
+    python benchmarks/bench_formularios.py --preguntas 200 --opciones 4
+
+Crea un formulario con N preguntas de selección y le aplica una edición típica
+(10 textos cambiados, 5 preguntas quitadas y 5 nuevas). Compara el borrado y
+recreación de todas las preguntas (implementación anterior de
+update_formulario, reproducida aquí) con la actualización por diferencias de
+formulario_crud.update_formulario, en tiempo y en sentencias SQL.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.db.database import Base, Formulario, Pregunta, Opcion
+from src.crud import formulario_crud
+from src.schemas.FormularioSchema import FormularioCreate, FormularioUpdate
+
+
+def recrear(db, formulario_id, formulario):
+    # update_formulario antes de la actualización por diferencias
+    db_formulario = formulario_crud.get_formulario(db, formulario_id)
+    db_formulario.version += 1
+    pregunta_ids = [p.id for p in db_formulario.preguntas]
+    db.query(Opcion).filter(Opcion.pregunta_id.in_(pregunta_ids)).delete(synchronize_session=False)
+    db.query(Pregunta).filter(Pregunta.formulario_id == formulario_id).delete(synchronize_session=False)
+    for pregunta in formulario.preguntas:
+        db_pregunta = Pregunta(formulario_id=formulario_id, texto=pregunta.texto, tipo=pregunta.tipo)
+        db.add(db_pregunta)
+        db.flush()
+        for opcion in pregunta.opciones:
+            db.add(Opcion(pregunta_id=db_pregunta.id, texto_opcion=opcion.texto_opcion))
+    db.commit()
+
+
+def edicion(db, formulario_id):
+    db.expire_all()
+    preguntas = [
+        {
+            "id": p.id, "texto": p.texto, "tipo": p.tipo,
+            "opciones": [{"id": o.id, "texto_opcion": o.texto_opcion} for o in p.opciones],
+        }
+        for p in db.get(Formulario, formulario_id).preguntas if p.activa
+    ]
+    for pregunta in preguntas[:10]:
+        pregunta["texto"] += " (editada)"
+    del preguntas[-5:]
+    preguntas += [
+        {"texto": f"Nueva {i}", "tipo": "seleccion_unica", "opciones": [{"texto_opcion": "Sí"}, {"texto_opcion": "No"}]}
+        for i in range(5)
+    ]
+    return FormularioUpdate(nombre="Benchmark", preguntas=preguntas)
+
+
+def medir(engine, SessionLocal, aplicar, num_preguntas, num_opciones):
+    db = SessionLocal()
+    formulario = formulario_crud.create_formulario(db, FormularioCreate(nombre="Benchmark", preguntas=[
+        {"texto": f"Pregunta {i}", "tipo": "seleccion_multiple",
+         "opciones": [{"texto_opcion": f"Opción {j}"} for j in range(num_opciones)]}
+        for i in range(num_preguntas)
+    ]))
+    cambios = edicion(db, formulario.id)
+
+    sentencias = []
+    registrar = lambda *args: sentencias.append(args[2])
+    event.listen(engine, "before_cursor_execute", registrar)
+    inicio = time.perf_counter()
+    aplicar(db, formulario.id, cambios)
+    duracion = time.perf_counter() - inicio
+    event.remove(engine, "before_cursor_execute", registrar)
+    db.close()
+    return duracion * 1000, len(sentencias)
+
+
+def main(num_preguntas, num_opciones):
+    logging.disable(logging.INFO)
+    # SQLite reutiliza los ids borrados y la recreación los vuelve a asignar en la misma sesión
+    warnings.filterwarnings("ignore", message="Identity map already had an identity")
+    url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_formularios.db")
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    antes = medir(engine, SessionLocal, recrear, num_preguntas, num_opciones)
+    despues = medir(engine, SessionLocal, formulario_crud.update_formulario, num_preguntas, num_opciones)
+
+    print(f"Formulario de {num_preguntas} preguntas x {num_opciones} opciones")
+    print(f"Borrar y recrear:       {antes[0]:8.1f} ms  {antes[1]:5d} sentencias")
+    print(f"Por diferencias:        {despues[0]:8.1f} ms  {despues[1]:5d} sentencias")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preguntas", type=int, default=200)
+    parser.add_argument("--opciones", type=int, default=4)
+    args = parser.parse_args()
+    main(args.preguntas, args.opciones)
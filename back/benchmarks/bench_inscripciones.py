@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inscripciones concurrentes contra un backend en ejecución.
+
+Levantar el backend en el modo a medir y ejecutar, por ejemplo:
+
+    DB_ASYNC=0 uvicorn src.main:app --port 8001
+    python benchmarks/bench_inscripciones.py --evento 1 --concurrencia 500
+
+    DB_ASYNC=1 uvicorn src.main:app --port 8001
+    python benchmarks/bench_inscripciones.py --evento 1 --concurrencia 500
+
+    INSCRIPCIONES_BUFFER=1 uvicorn src.main:app --port 8001
+    python benchmarks/bench_inscripciones.py --evento 1 --concurrencia 500
+
+En modo diferido las respuestas son 202 y la latencia medida es la del encolado;
+el script espera además a que la cola se drene y reporta cuánto tardó.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+async def inscribir(client, evento_id, latencias, codigos, seguimiento):
+    correo = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    datos = {
+        "nombre": "Voluntario Benchmark",
+        "correo": correo,
+        "confirmacion_correo": correo,
+        "numero_identificacion": uuid.uuid4().hex[:10],
+        "evento_id": evento_id,
+        "aceptacion_terminos": True,
+    }
+    inicio = time.perf_counter()
+    response = await client.post("/api/voluntarios/inscripcion/", json=datos)
+    latencias.append((time.perf_counter() - inicio) * 1000)
+    codigos[response.status_code] = codigos.get(response.status_code, 0) + 1
+    if response.status_code == 202:
+        seguimiento.append(response.json()["id_seguimiento"])
+
+
+async def esperar_cola(client, seguimiento):
+    # Basta con esperar la última encolada: la cola se drena en orden
+    while seguimiento:
+        response = await client.get(f"/api/voluntarios/inscripcion/estado/{seguimiento[-1]}")
+        if response.json()["estado"] != "pendiente":
+            return
+        await asyncio.sleep(0.05)
+
+
+async def main(url, evento_id, concurrencia, total):
+    latencias, codigos, seguimiento = [], {}, []
+    limites = httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=120) as client:
+        semaforo = asyncio.Semaphore(concurrencia)
+
+        async def tarea():
+            async with semaforo:
+                await inscribir(client, evento_id, latencias, codigos, seguimiento)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(tarea() for _ in range(total)))
+        duracion = time.perf_counter() - inicio
+        await esperar_cola(client, seguimiento)
+        duracion_total = time.perf_counter() - inicio
+
+    print(f"Peticiones: {total}  Concurrencia: {concurrencia}  Duración: {duracion:.2f}s")
+    print(f"Throughput: {total / duracion:.1f} req/s")
+    print(f"Latencia p50: {statistics.median(latencias):.1f} ms  "
+          f"p95: {percentil(latencias, 95):.1f} ms  p99: {percentil(latencias, 99):.1f} ms")
+    print(f"Códigos de respuesta: {codigos}")
+    if seguimiento:
+        print(f"Cola drenada a los {duracion_total:.2f}s "
+              f"(throughput hasta confirmar: {total / duracion_total:.1f} inscripciones/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--evento", type=int, required=True)
+    parser.add_argument("--concurrencia", type=int, default=500)
+    parser.add_argument("--total", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.evento, args.concurrencia, args.total))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicios de sesión concurrentes contra un backend en ejecución.
+
+Mide el throughput de /api/auth/login y, en paralelo, la latencia de las
+inscripciones, que comparten el threadpool del servidor. Crear primero un
+administrador (src/create_admin.py) y ejecutar, por ejemplo:
+
+    uvicorn src.main:app --port 8001
+    python benchmarks/bench_login.py --correo admin@gobabygofundacion.org --contrasena admin1234 --evento 1
+
+Con HASH_WORKERS y HASH_MAX_PENDIENTES se ajusta el pool de hashing; las
+respuestas 503 indican que el pool rechazó la petición por saturación.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def resumen(nombre, latencias, codigos, duracion):
+    print(f"{nombre}: {len(latencias)} peticiones, {len(latencias) / duracion:.1f} req/s, "
+          f"p50 {statistics.median(latencias):.1f} ms, p99 {percentil(latencias, 99):.1f} ms, códigos {codigos}")
+
+
+async def medir(client, peticion, latencias, codigos):
+    inicio = time.perf_counter()
+    response = await peticion(client)
+    latencias.append((time.perf_counter() - inicio) * 1000)
+    codigos[response.status_code] = codigos.get(response.status_code, 0) + 1
+
+
+async def main(url, correo, contrasena, evento_id, concurrencia, total):
+    def login(client):
+        return client.post("/api/auth/login", data={"username": correo, "password": contrasena})
+
+    def inscripcion(client):
+        correo_voluntario = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+        return client.post("/api/voluntarios/inscripcion/", json={
+            "nombre": "Voluntario Benchmark",
+            "correo": correo_voluntario,
+            "confirmacion_correo": correo_voluntario,
+            "numero_identificacion": uuid.uuid4().hex[:10],
+            "evento_id": evento_id,
+            "aceptacion_terminos": True,
+        })
+
+    resultados = {"login": ([], {}), "inscripcion": ([], {})}
+    limites = httpx.Limits(max_connections=concurrencia * 2, max_keepalive_connections=concurrencia * 2)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=120) as client:
+        semaforo = asyncio.Semaphore(concurrencia)
+
+        async def tarea(peticion, latencias, codigos):
+            async with semaforo:
+                await medir(client, peticion, latencias, codigos)
+
+        inicio = time.perf_counter()
+        tareas = [tarea(login, *resultados["login"]) for _ in range(total)]
+        if evento_id is not None:
+            tareas += [tarea(inscripcion, *resultados["inscripcion"]) for _ in range(total)]
+        await asyncio.gather(*tareas)
+        duracion = time.perf_counter() - inicio
+
+    print(f"Concurrencia: {concurrencia}  Duración: {duracion:.2f}s")
+    for nombre, (latencias, codigos) in resultados.items():
+        if latencias:
+            resumen(nombre, latencias, codigos, duracion)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--correo", required=True)
+    parser.add_argument("--contrasena", required=True)
+    parser.add_argument("--evento", type=int, default=None, help="Evento para las inscripciones simultáneas")
+    parser.add_argument("--concurrencia", type=int, default=50)
+    parser.add_argument("--total", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.correo, args.contrasena, args.evento, args.concurrencia, args.total))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark de paginación por offset frente a paginación por cursor (keyset)
+sobre inscripciones_eventos.
+
+    python benchmarks/bench_paginacion.py --filas 1000000
+
+Crea (o reutiliza) una base SQLite de prueba con las filas indicadas para un
+único evento y mide el tiempo de obtener una página a distintas profundidades.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from src.db.database import Base, Evento, Voluntario, InscripcionEvento
+from src.crud import voluntario_crud
+
+
+def poblar(db, filas):
+    if db.query(func.count(InscripcionEvento.id)).scalar() >= filas:
+        return db.query(Evento.id).first()[0]
+
+    evento = Evento(nombre="Benchmark", lugar="Bogotá", descripcion="Paginación")
+    db.add(evento)
+    db.flush()
+    ahora = datetime.now()
+    lote = 50_000
+    # Un voluntario por inscripción: (voluntario_id, evento_id) es única
+    for inicio in range(0, filas, lote):
+        fin = min(inicio + lote, filas)
+        db.execute(insert(Voluntario.__table__), [
+            {"id": i + 1, "nombre": f"Voluntario {i}", "correo": f"bench{i}@example.com",
+             "confirmacion_correo": f"bench{i}@example.com", "numero_identificacion": str(i)}
+            for i in range(inicio, fin)
+        ])
+        db.execute(insert(InscripcionEvento.__table__), [
+            {
+                "voluntario_id": i + 1,
+                "evento_id": evento.id,
+                "fecha_inscripcion": ahora,
+                "aceptado": False,
+                "completado_pre": False,
+                "completado_post": False,
+                "aceptacion_terminos": True,
+            }
+            for i in range(inicio, fin)
+        ])
+    db.commit()
+    return evento.id
+
+
+def medir(funcion, repeticiones=5):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tiempos)
+
+
+def main(ruta, filas, limit):
+    engine = create_engine(f"sqlite:///{ruta}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    evento_id = poblar(db, filas)
+
+    print(f"{'profundidad':>12} {'offset (ms)':>12} {'cursor (ms)':>12}")
+    for profundidad in (0, 1_000, 10_000, 100_000, filas // 2, filas - limit):
+        # Id del último elemento de la página anterior, como lo codificaría el cursor
+        despues_de_id = db.query(InscripcionEvento.id).filter(
+            InscripcionEvento.evento_id == evento_id
+        ).order_by(InscripcionEvento.id).offset(max(profundidad - 1, 0)).limit(1).scalar()
+        if profundidad == 0:
+            despues_de_id = None
+
+        offset = medir(lambda: voluntario_crud.get_inscripciones_by_evento(
+            db, evento_id=evento_id, skip=profundidad, limit=limit
+        ))
+        cursor = medir(lambda: voluntario_crud.get_inscripciones_by_evento(
+            db, evento_id=evento_id, limit=limit, despues_de_id=despues_de_id
+        ))
+        print(f"{profundidad:>12} {offset:>12.2f} {cursor:>12.2f}")
+        db.expunge_all()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="bench_paginacion.db")
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    main(args.db, args.filas, args.limit)
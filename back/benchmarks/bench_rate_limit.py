@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark del limitador de peticiones (src/core/rate_limit.py).
+
+Mide, sin red ni framework, el costo por petición que agrega el middleware
+sobre una aplicación ASGI vacía: en una ruta sin reglas y en una ruta con
+límite por IP y por cuenta (que además lee y reenvía el cuerpo).
+
+    python benchmarks/bench_rate_limit.py --iteraciones 200000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.rate_limit import MemoriaLimites, RateLimitMiddleware, Regla
+
+
+async def app_vacia(scope, receive, send):
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def scope(path, ip):
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "client": (ip, 50000),
+        "headers": [(b"content-type", b"application/x-www-form-urlencoded")],
+    }
+
+
+async def medir(app, path, iteraciones):
+    cuerpo = {"type": "http.request", "body": b"username=admin%40example.com&password=x", "more_body": False}
+
+    async def receive():
+        return cuerpo
+
+    async def send(mensaje):
+        pass
+
+    inicio = time.perf_counter()
+    for i in range(iteraciones):
+        # Una IP distinta por petición para no agotar la cubeta
+        await app(scope(path, f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"), receive, send)
+    return (time.perf_counter() - inicio) / iteraciones * 1e6
+
+
+async def main(iteraciones):
+    reglas = {
+        ("POST", "/login"): [
+            Regla("login_ip", capacidad=10, ventana=60),
+            Regla("login_cuenta", capacidad=10 ** 9, ventana=1, clave="username"),
+        ]
+    }
+    limitada = RateLimitMiddleware(app_vacia, reglas=reglas, backend=MemoriaLimites(), proxies_confiables=0)
+
+    base = await medir(app_vacia, "/login", iteraciones)
+    sin_reglas = await medir(limitada, "/otra", iteraciones)
+    con_reglas = await medir(limitada, "/login", iteraciones)
+
+    print(f"Iteraciones: {iteraciones}")
+    print(f"App sin middleware:          {base:.2f} µs/petición")
+    print(f"Ruta sin reglas:             {sin_reglas:.2f} µs/petición (+{sin_reglas - base:.2f} µs)")
+    print(f"Ruta con límite IP + cuenta: {con_reglas:.2f} µs/petición (+{con_reglas - base:.2f} µs)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iteraciones", type=int, default=200_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iteraciones))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark del acceso SQL directo (src/crud/event) frente al equivalente con el ORM.
+
+    python benchmarks/bench_sql_directo.py --eventos 5000 --repeticiones 50
+
+Sobre una base SQLite temporal (o la de --url) mide:
+  - la inserción de N eventos: Session.add_all + commit frente a executemany;
+  - la lectura de la página de estadísticas de /api/eventos/stats:
+    evento_crud.get_eventos_with_stats frente a get_event.get_events_with_stats.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from src.db.database import Base, Evento, get_engine_options
+from src.db.db_connection import Database
+from src.crud import evento_crud
+from src.crud.event import create_event, get_event
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main(url, eventos, repeticiones, limite):
+    engine = create_engine(url, **get_engine_options(url))
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    database = Database(engine)
+    filas = [(f"Evento {i}", date(2025, 1, 1), "Bogotá", "Benchmark") for i in range(eventos)]
+
+    def limpiar():
+        with engine.begin() as conexion:
+            conexion.execute(delete(Evento))
+
+    def insertar_orm():
+        db = SessionLocal()
+        db.add_all(Evento(nombre=n, fecha_evento=f, lugar=l, descripcion=d) for n, f, l, d in filas)
+        db.commit()
+        db.close()
+
+    limpiar()
+    inicio = time.perf_counter()
+    insertar_orm()
+    orm_insercion = time.perf_counter() - inicio
+
+    limpiar()
+    inicio = time.perf_counter()
+    create_event.create_events(filas, database=database)
+    directo_insercion = time.perf_counter() - inicio
+
+    def leer_orm():
+        db = SessionLocal()
+        evento_crud.get_eventos_with_stats(db, limit=limite)
+        db.close()
+
+    orm_lectura = medir(leer_orm, repeticiones)
+    directo_lectura = medir(lambda: get_event.get_events_with_stats(limit=limite, database=database), repeticiones)
+
+    print(f"Inserción de {eventos} eventos:  ORM {orm_insercion * 1000:.1f} ms | executemany {directo_insercion * 1000:.1f} ms")
+    print(f"Estadísticas (limit={limite}):    ORM {orm_lectura:.2f} ms | SQL directo {directo_lectura:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="URL de la base (por defecto, SQLite temporal)")
+    parser.add_argument("--eventos", type=int, default=5000)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    parser.add_argument("--limite", type=int, default=100)
+    args = parser.parse_args()
+    url = args.url
+    if url is None:
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_sql_directo.db")
+    main(url, args.eventos, args.repeticiones, args.limite)
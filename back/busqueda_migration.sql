@@ -0,0 +1,12 @@
+-- Migration para la búsqueda de texto completo sobre voluntarios y respuestas textuales
+-- Ejecutar en la base de datos go_baby_go
+
+-- InnoDB construye los índices con los datos existentes y los mantiene en cada escritura
+ALTER TABLE `voluntarios`
+  ADD FULLTEXT INDEX IF NOT EXISTS `ft_voluntarios` (`nombre`, `correo`, `numero_identificacion`);
+
+ALTER TABLE `detalle_respuestas`
+  ADD FULLTEXT INDEX IF NOT EXISTS `ft_detalle_respuestas` (`texto_respuesta`);
+
+-- En SQLite los índices FTS5 se crean y se llenan al iniciar la aplicación
+-- (crear_indices_busqueda en src/db/database.py)
@@ -0,0 +1,27 @@
+-- Migration para agregar contadores materializados de inscripciones a eventos
+-- Ejecutar en la base de datos go_baby_go
+
+ALTER TABLE `eventos`
+  ADD COLUMN IF NOT EXISTS `total_voluntarios` int(11) NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS `voluntarios_aceptados` int(11) NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS `completados_pre` int(11) NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS `completados_post` int(11) NOT NULL DEFAULT 0;
+
+-- Inicializar los contadores a partir de las inscripciones existentes
+-- (equivalente a ejecutar: python src/recalcular_contadores.py)
+UPDATE `eventos` e
+LEFT JOIN (
+  SELECT
+    `evento_id`,
+    COUNT(*) AS total,
+    SUM(`aceptado` = 1) AS aceptados,
+    SUM(`completado_pre` = 1) AS pre,
+    SUM(`completado_post` = 1) AS post
+  FROM `inscripciones_eventos`
+  GROUP BY `evento_id`
+) c ON c.`evento_id` = e.`id`
+SET
+  e.`total_voluntarios` = COALESCE(c.total, 0),
+  e.`voluntarios_aceptados` = COALESCE(c.aceptados, 0),
+  e.`completados_pre` = COALESCE(c.pre, 0),
+  e.`completados_post` = COALESCE(c.post, 0);
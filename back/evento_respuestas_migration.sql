@@ -0,0 +1,21 @@
+-- Migration para los contadores de respuestas recibidas por evento
+-- Ejecutar en la base de datos go_baby_go
+
+ALTER TABLE `eventos`
+  ADD COLUMN IF NOT EXISTS `respuestas_pre` int(11) NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS `respuestas_post` int(11) NOT NULL DEFAULT 0;
+
+-- Inicializar los contadores a partir de las respuestas existentes
+UPDATE `eventos` e
+LEFT JOIN (
+  SELECT
+    i.`evento_id`,
+    SUM(r.`tipo_formulario` = 'pre') AS pre,
+    SUM(r.`tipo_formulario` = 'post') AS post
+  FROM `respuestas` r
+  JOIN `inscripciones_eventos` i ON i.`id` = r.`inscripcion_id`
+  GROUP BY i.`evento_id`
+) c ON c.`evento_id` = e.`id`
+SET
+  e.`respuestas_pre` = COALESCE(c.pre, 0),
+  e.`respuestas_post` = COALESCE(c.post, 0);
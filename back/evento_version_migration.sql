@@ -0,0 +1,5 @@
+-- Migration para versionar eventos (ETag de los endpoints de lectura)
+-- Ejecutar en la base de datos go_baby_go
+
+ALTER TABLE `eventos`
+  ADD COLUMN IF NOT EXISTS `version` int(11) NOT NULL DEFAULT 1;
@@ -0,0 +1,15 @@
+-- Migration para editar formularios por diferencias: orden explícito y retiro
+-- de preguntas/opciones que ya tienen respuestas
+-- Ejecutar en la base de datos go_baby_go
+
+ALTER TABLE `preguntas`
+  ADD COLUMN IF NOT EXISTS `orden` int(11) NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS `activa` tinyint(1) NOT NULL DEFAULT 1;
+
+ALTER TABLE `opciones`
+  ADD COLUMN IF NOT EXISTS `orden` int(11) NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS `activa` tinyint(1) NOT NULL DEFAULT 1;
+
+-- El orden existente es el de inserción
+UPDATE `preguntas` SET `orden` = `id` WHERE `orden` = 0;
+UPDATE `opciones` SET `orden` = `id` WHERE `orden` = 0;
@@ -0,0 +1,5 @@
+-- Migration para versionar formularios (caché de formularios serializados)
+-- Ejecutar en la base de datos go_baby_go
+
+ALTER TABLE `formularios`
+  ADD COLUMN IF NOT EXISTS `version` int(11) NOT NULL DEFAULT 1;
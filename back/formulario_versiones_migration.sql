@@ -0,0 +1,22 @@
+-- Migration para las revisiones inmutables de formularios
+-- Ejecutar en la base de datos go_baby_go
+
+CREATE TABLE IF NOT EXISTS `formulario_versiones` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `formulario_id` int(11) NOT NULL,
+  `version` int(11) NOT NULL,
+  `contenido` text NOT NULL,
+  `fecha_creacion` datetime DEFAULT current_timestamp(),
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_formulario_version` (`formulario_id`,`version`),
+  CONSTRAINT `formulario_versiones_ibfk_1` FOREIGN KEY (`formulario_id`) REFERENCES `formularios` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+ALTER TABLE `respuestas`
+  ADD COLUMN IF NOT EXISTS `formulario_version_id` int(11) DEFAULT NULL,
+  ADD KEY IF NOT EXISTS `formulario_version_id` (`formulario_version_id`),
+  ADD CONSTRAINT `respuestas_ibfk_2` FOREIGN KEY (`formulario_version_id`) REFERENCES `formulario_versiones` (`id`);
+
+-- Las respuestas existentes quedan con formulario_version_id NULL y se leen con
+-- los textos actuales; la revisión de cada formulario se registra al recibir
+-- su primera respuesta o al editarlo
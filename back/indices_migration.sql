@@ -0,0 +1,31 @@
+-- Migration para los índices y restricciones de unicidad de las consultas frecuentes
+-- Ejecutar en la base de datos go_baby_go
+
+-- Antes de crear las restricciones UNIQUE no debe haber duplicados.
+-- Estas consultas deben devolver cero filas; si no, fusionar los registros primero.
+SELECT `correo`, COUNT(*) AS `total`
+FROM `voluntarios`
+GROUP BY `correo`
+HAVING COUNT(*) > 1;
+
+SELECT `voluntario_id`, `evento_id`, COUNT(*) AS `total`
+FROM `inscripciones_eventos`
+GROUP BY `voluntario_id`, `evento_id`
+HAVING COUNT(*) > 1;
+
+-- Búsqueda del voluntario por correo en cada inscripción
+ALTER TABLE `voluntarios`
+  ADD UNIQUE KEY IF NOT EXISTS `correo` (`correo`);
+
+-- Una inscripción por voluntario y evento; listados de inscripciones por evento
+ALTER TABLE `inscripciones_eventos`
+  ADD UNIQUE KEY IF NOT EXISTS `uq_inscripcion_voluntario_evento` (`voluntario_id`, `evento_id`),
+  ADD KEY IF NOT EXISTS `idx_inscripciones_evento` (`evento_id`, `id`);
+
+-- Respuestas pre/post de una inscripción
+ALTER TABLE `respuestas`
+  ADD KEY IF NOT EXISTS `idx_respuestas_inscripcion_tipo` (`inscripcion_id`, `tipo_formulario`);
+
+-- Validación de tokens de recuperación de contraseña
+ALTER TABLE `password_reset_tokens`
+  ADD KEY IF NOT EXISTS `idx_token_valid` (`token`, `expires_at`, `used`);
@@ -28,6 +28,7 @@ CREATE TABLE `administradores` (
   `nombre` varchar(255) NOT NULL,
   `correo` varchar(255) NOT NULL,
   `contrasena_hash` varchar(255) NOT NULL,
+  `token_version` int(11) NOT NULL DEFAULT 1,
   PRIMARY KEY (`id`),
   UNIQUE KEY `correo` (`correo`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -50,6 +51,7 @@ CREATE TABLE `detalle_respuestas` (
   KEY `respuesta_id` (`respuesta_id`),
   KEY `pregunta_id` (`pregunta_id`),
   KEY `opcion_id` (`opcion_id`),
+  FULLTEXT KEY `ft_detalle_respuestas` (`texto_respuesta`),
   CONSTRAINT `detalle_respuestas_ibfk_1` FOREIGN KEY (`respuesta_id`) REFERENCES `respuestas` (`id`),
   CONSTRAINT `detalle_respuestas_ibfk_2` FOREIGN KEY (`pregunta_id`) REFERENCES `preguntas` (`id`),
   CONSTRAINT `detalle_respuestas_ibfk_3` FOREIGN KEY (`opcion_id`) REFERENCES `opciones` (`id`)
@@ -72,6 +74,13 @@ CREATE TABLE `eventos` (
   `lugar` varchar(255) DEFAULT NULL,
   `formulario_pre_evento` int(11) DEFAULT NULL,
   `formulario_post_evento` int(11) DEFAULT NULL,
+  `version` int(11) NOT NULL DEFAULT 1,
+  `total_voluntarios` int(11) NOT NULL DEFAULT 0,
+  `voluntarios_aceptados` int(11) NOT NULL DEFAULT 0,
+  `completados_pre` int(11) NOT NULL DEFAULT 0,
+  `completados_post` int(11) NOT NULL DEFAULT 0,
+  `respuestas_pre` int(11) NOT NULL DEFAULT 0,
+  `respuestas_post` int(11) NOT NULL DEFAULT 0,
   PRIMARY KEY (`id`),
   KEY `formulario_pre_evento` (`formulario_pre_evento`),
   KEY `formulario_post_evento` (`formulario_post_evento`),
@@ -91,10 +100,54 @@ CREATE TABLE `formularios` (
   `id` int(11) NOT NULL AUTO_INCREMENT,
   `nombre` varchar(255) NOT NULL,
   `fecha_creacion` datetime DEFAULT current_timestamp(),
+  `version` int(11) NOT NULL DEFAULT 1,
   PRIMARY KEY (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `formulario_versiones`
+--
+
+DROP TABLE IF EXISTS `formulario_versiones`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8mb4 */;
+CREATE TABLE `formulario_versiones` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `formulario_id` int(11) NOT NULL,
+  `version` int(11) NOT NULL,
+  `contenido` text NOT NULL,
+  `fecha_creacion` datetime DEFAULT current_timestamp(),
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_formulario_version` (`formulario_id`,`version`),
+  CONSTRAINT `formulario_versiones_ibfk_1` FOREIGN KEY (`formulario_id`) REFERENCES `formularios` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `inscripciones_eventos`
+--
+
+DROP TABLE IF EXISTS `inscripciones_eventos`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8mb4 */;
+CREATE TABLE `inscripciones_eventos` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `voluntario_id` int(11) NOT NULL,
+  `evento_id` int(11) NOT NULL,
+  `fecha_inscripcion` datetime DEFAULT current_timestamp(),
+  `aceptado` tinyint(1) DEFAULT 0,
+  `completado_pre` tinyint(1) DEFAULT 0,
+  `completado_post` tinyint(1) DEFAULT 0,
+  `aceptacion_terminos` tinyint(1) DEFAULT 0,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_inscripcion_voluntario_evento` (`voluntario_id`,`evento_id`),
+  KEY `idx_inscripciones_evento` (`evento_id`,`id`),
+  CONSTRAINT `inscripciones_eventos_ibfk_1` FOREIGN KEY (`voluntario_id`) REFERENCES `voluntarios` (`id`),
+  CONSTRAINT `inscripciones_eventos_ibfk_2` FOREIGN KEY (`evento_id`) REFERENCES `eventos` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `opciones`
 --
@@ -106,12 +159,37 @@ CREATE TABLE `opciones` (
   `id` int(11) NOT NULL AUTO_INCREMENT,
   `pregunta_id` int(11) NOT NULL,
   `texto_opcion` varchar(255) NOT NULL,
+  `orden` int(11) NOT NULL DEFAULT 0,
+  `activa` tinyint(1) NOT NULL DEFAULT 1,
   PRIMARY KEY (`id`),
   KEY `pregunta_id` (`pregunta_id`),
   CONSTRAINT `opciones_ibfk_1` FOREIGN KEY (`pregunta_id`) REFERENCES `preguntas` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `password_reset_tokens`
+--
+
+DROP TABLE IF EXISTS `password_reset_tokens`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8mb4 */;
+CREATE TABLE `password_reset_tokens` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `admin_id` int(11) NOT NULL,
+  `token` varchar(255) NOT NULL,
+  `expires_at` datetime NOT NULL,
+  `used` tinyint(1) DEFAULT 0,
+  `created_at` datetime DEFAULT current_timestamp(),
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `token` (`token`),
+  KEY `admin_id` (`admin_id`),
+  KEY `expires_at` (`expires_at`),
+  KEY `idx_token_valid` (`token`,`expires_at`,`used`),
+  CONSTRAINT `password_reset_tokens_ibfk_1` FOREIGN KEY (`admin_id`) REFERENCES `administradores` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `preguntas`
 --
@@ -124,6 +202,8 @@ CREATE TABLE `preguntas` (
   `formulario_id` int(11) NOT NULL,
   `texto` text NOT NULL,
   `tipo` enum('textual','seleccion_multiple','seleccion_unica') NOT NULL,
+  `orden` int(11) NOT NULL DEFAULT 0,
+  `activa` tinyint(1) NOT NULL DEFAULT 1,
   PRIMARY KEY (`id`),
   KEY `formulario_id` (`formulario_id`),
   CONSTRAINT `preguntas_ibfk_1` FOREIGN KEY (`formulario_id`) REFERENCES `formularios` (`id`)
@@ -139,15 +219,16 @@ DROP TABLE IF EXISTS `respuestas`;
 /*!40101 SET character_set_client = utf8mb4 */;
 CREATE TABLE `respuestas` (
   `id` int(11) NOT NULL AUTO_INCREMENT,
-  `formulario_id` int(11) NOT NULL,
-  `correo` varchar(255) DEFAULT NULL,
-  `nombre` varchar(255) DEFAULT NULL,
-  `numero_identificacion` varchar(100) DEFAULT NULL,
+  `inscripcion_id` int(11) NOT NULL,
   `fecha_respuesta` datetime DEFAULT current_timestamp(),
+  `tipo_formulario` enum('pre','post') NOT NULL,
   `codigo_respuesta` varchar(25) DEFAULT NULL,
+  `formulario_version_id` int(11) DEFAULT NULL,
   PRIMARY KEY (`id`),
-  KEY `formulario_id` (`formulario_id`),
-  CONSTRAINT `respuestas_ibfk_1` FOREIGN KEY (`formulario_id`) REFERENCES `formularios` (`id`)
+  KEY `idx_respuestas_inscripcion_tipo` (`inscripcion_id`,`tipo_formulario`),
+  KEY `formulario_version_id` (`formulario_version_id`),
+  CONSTRAINT `respuestas_ibfk_1` FOREIGN KEY (`inscripcion_id`) REFERENCES `inscripciones_eventos` (`id`),
+  CONSTRAINT `respuestas_ibfk_2` FOREIGN KEY (`formulario_version_id`) REFERENCES `formulario_versiones` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -166,6 +247,25 @@ CREATE TABLE `terminos_y_condiciones` (
   PRIMARY KEY (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `voluntarios`
+--
+
+DROP TABLE IF EXISTS `voluntarios`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8mb4 */;
+CREATE TABLE `voluntarios` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `nombre` varchar(255) NOT NULL,
+  `correo` varchar(255) NOT NULL,
+  `confirmacion_correo` varchar(255) NOT NULL,
+  `numero_identificacion` varchar(100) NOT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `correo` (`correo`),
+  FULLTEXT KEY `ft_voluntarios` (`nombre`,`correo`,`numero_identificacion`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
 /*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
 
 /*!40101 SET SQL_MODE=@OLD_SQL_MODE */;
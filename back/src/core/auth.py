@@ -1,13 +1,13 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 import os
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
-from src.db.database import get_db
-from src.crud import administrador_crud
+from src.db.database import Administrador, get_db, env_bool, env_int
+from src.core.cache import CacheLRU
 from src.schemas.AdministradorSchema import AdministradorOut
 
 # JWT configuration
@@ -15,6 +15,41 @@ SECRET_KEY = os.environ.get("SECRET_KEY", "09d25e094faa6ca2556c818166b7a9563b93f
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 
+# Modo sin estado: el administrador se toma de los claims del token, sin consultar
+# la base de datos. Un token sólo deja de valer al expirar.
+AUTH_STATELESS = env_bool("AUTH_STATELESS", False)
+
+# Caché de administradores autenticados por correo (claim "sub"). El TTL acota
+# cuánto tarda una réplica en ver una revocación hecha desde otra.
+principales = CacheLRU(
+    max_entradas=env_int("AUTH_CACHE_SIZE", 1024),
+    ttl=float(os.getenv("AUTH_CACHE_TTL", "30"))
+)
+
+def claims_administrador(admin: Administrador) -> dict:
+    """Claims del token de acceso de un administrador"""
+    return {
+        "sub": admin.correo,
+        "id": admin.id,
+        "nombre": admin.nombre,
+        "ver": admin.token_version or 1
+    }
+
+def invalidar_principal(correo: str) -> None:
+    """Descarta el administrador cacheado, p. ej. tras cambiar su contraseña"""
+    principales.delete(correo)
+
+def _cargar_principal(db: Session, correo: str) -> Optional[Tuple[AdministradorOut, int]]:
+    principal = principales.get(correo)
+    if principal is not None:
+        return principal
+    admin = db.query(Administrador).filter(Administrador.correo == correo).first()
+    if admin is None:
+        return None
+    principal = (AdministradorOut.model_validate(admin), admin.token_version or 1)
+    principales.set(correo, principal)
+    return principal
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -43,9 +78,17 @@ def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = Depends
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-        
-    admin = administrador_crud.get_administrador_by_email(db, email=email)
-    if admin is None:
+    
+    if AUTH_STATELESS and "id" in payload:
+        return AdministradorOut(id=payload["id"], nombre=payload.get("nombre", ""), correo=email)
+    
+    principal = _cargar_principal(db, email)
+    if principal is None:
+        raise credentials_exception
+    
+    # Los tokens sin "ver" son anteriores al versionado y equivalen a la versión 1
+    admin, token_version = principal
+    if payload.get("ver", 1) != token_version:
         raise credentials_exception
         
     return admin 
\ No newline at end of file
@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class CacheLRU:
+    """Caché en memoria del proceso con desalojo LRU y expiración por TTL"""
+
+    def __init__(self, max_entradas: int = 256, ttl: float = 300.0):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave: Hashable) -> Optional[Any]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            valor, expira = entrada
+            if expira < time.monotonic():
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            return valor
+
+    def set(self, clave: Hashable, valor: Any, ttl: Optional[float] = None) -> None:
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entradas[clave] = (valor, expira)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def delete(self, clave: Hashable) -> None:
+        with self._lock:
+            self._entradas.pop(clave, None)
+
+    def delete_where(self, condicion: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for clave in [c for c in self._entradas if condicion(c)]:
+                del self._entradas[clave]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+class CacheCompartida(ABC):
+    """Interfaz de un backend de caché compartido entre réplicas"""
+
+    @abstractmethod
+    def get(self, clave: str) -> Optional[bytes]:
+        """Valor guardado bajo la clave, o None si no está o expiró"""
+
+    @abstractmethod
+    def set(self, clave: str, valor: bytes, ttl: float) -> None:
+        """Guarda el valor por ttl segundos"""
+
+    @abstractmethod
+    def delete(self, clave: str) -> None:
+        """Elimina la clave en todas las réplicas"""
+
+
+class RedisCache(CacheCompartida):
+    """Backend compartido sobre Redis (requiere el paquete opcional redis)"""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("El backend de caché 'redis' requiere instalar el paquete redis") from e
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, clave: str) -> Optional[bytes]:
+        return self._client.get(clave)
+
+    def set(self, clave: str, valor: bytes, ttl: float) -> None:
+        self._client.set(clave, valor, ex=max(int(ttl), 1))
+
+    def delete(self, clave: str) -> None:
+        self._client.delete(clave)
+
+
+def get_cache_compartida() -> Optional[CacheCompartida]:
+    """Backend compartido configurado con CACHE_BACKEND (por defecto sólo caché local)"""
+    backend = os.getenv("CACHE_BACKEND", "memoria").lower()
+    if backend == "redis":
+        return RedisCache(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    if backend in ("", "memoria", "memory"):
+        return None
+    raise ValueError(f"Backend de caché desconocido: {backend}")
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from src.core.metrics import HASH_DURACION, HASH_EN_COLA, HASH_RECHAZOS
+from src.db.database import env_int
+
+# Factor de costo único para todos los hashes de contraseñas (administradores y
+# recuperación de contraseña). Los hashes existentes conservan su propio costo.
+BCRYPT_ROUNDS = env_int("BCRYPT_ROUNDS", 12)
+
+
+class PoolHashing:
+    """Ejecuta bcrypt en un pool de hilos dedicado y acotado.
+
+    bcrypt libera el GIL mientras calcula, así que los hilos del pool no compiten
+    con los que atienden el resto de peticiones. Si ya hay max_pendientes
+    operaciones en curso o en cola, la nueva se rechaza con un 503 en lugar de
+    esperar.
+    """
+
+    def __init__(self, workers: int, max_pendientes: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hashing")
+        self._cupos = threading.BoundedSemaphore(max_pendientes)
+
+    def _enviar(self, funcion: Callable[..., Any], *args: Any) -> Future:
+        if not self._cupos.acquire(blocking=False):
+            HASH_RECHAZOS.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio ocupado, intente de nuevo en unos segundos",
+                headers={"Retry-After": "1"}
+            )
+        HASH_EN_COLA.inc()
+        try:
+            return self._executor.submit(self._ejecutar, funcion, *args)
+        except Exception:
+            self._liberar()
+            raise
+
+    def _ejecutar(self, funcion: Callable[..., Any], *args: Any) -> Any:
+        try:
+            with HASH_DURACION.time():
+                return funcion(*args)
+        finally:
+            self._liberar()
+
+    def _liberar(self) -> None:
+        HASH_EN_COLA.dec()
+        self._cupos.release()
+
+    def ejecutar(self, funcion: Callable[..., Any], *args: Any) -> Any:
+        return self._enviar(funcion, *args).result()
+
+    async def ejecutar_async(self, funcion: Callable[..., Any], *args: Any) -> Any:
+        # El event loop no se bloquea ni ocupa un hilo del threadpool de FastAPI
+        return await asyncio.wrap_future(self._enviar(funcion, *args))
+
+
+def _hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
+
+def _verificar(password: str, hash_guardado: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hash_guardado.encode("utf-8"))
+    except ValueError:
+        # Hash con formato inválido
+        return False
+
+
+_workers = env_int("HASH_WORKERS", os.cpu_count() or 1)
+pool_hashing = PoolHashing(workers=_workers, max_pendientes=env_int("HASH_MAX_PENDIENTES", _workers * 8))
+
+def hash_password(password: str) -> str:
+    return pool_hashing.ejecutar(_hash, password)
+
+def verificar_password(password: str, hash_guardado: str) -> bool:
+    return pool_hashing.ejecutar(_verificar, password, hash_guardado)
+
+async def hash_password_async(password: str) -> str:
+    return await pool_hashing.ejecutar_async(_hash, password)
+
+async def verificar_password_async(password: str, hash_guardado: str) -> bool:
+    return await pool_hashing.ejecutar_async(_verificar, password, hash_guardado)
@@ -0,0 +1,43 @@
+import hashlib
+import os
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Cache-Control por defecto: el cliente guarda la respuesta pero revalida
+# siempre con If-None-Match, de modo que los sondeos reciben 304 sin cuerpo
+CACHE_CONTROL_POR_DEFECTO = "no-cache"
+
+
+def cache_control(ruta: str) -> str:
+    """Cache-Control configurado para una ruta con CACHE_CONTROL_<RUTA>"""
+    return os.getenv(f"CACHE_CONTROL_{ruta.upper()}", CACHE_CONTROL_POR_DEFECTO)
+
+
+def calcular_etag(*partes: Any) -> str:
+    """ETag fuerte a partir de las versiones de las filas que forman la respuesta"""
+    resumen = hashlib.sha1(repr(partes).encode()).hexdigest()
+    return f'"{resumen}"'
+
+
+def etag_coincide(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (valor.strip() for valor in if_none_match.split(","))
+
+
+def aplicar_cabeceras(response: Response, etag: str, ruta: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control(ruta)
+
+
+def respuesta_condicional(request: Request, etag: str, ruta: str) -> Optional[Response]:
+    """Devuelve un 304 Not Modified si el cliente ya tiene esta versión"""
+    if not etag_coincide(request, etag):
+        return None
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    aplicar_cabeceras(response, etag, ruta)
+    return response
@@ -0,0 +1,115 @@
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Métricas del pool de conexiones de la base de datos.
+# Se registran en el registro por defecto de prometheus_client, que es el que
+# expone el Instrumentator de src/main.py en /metrics.
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Conexiones entregadas por el pool de la base de datos"
+)
+DB_POOL_CHECKINS = Counter(
+    "db_pool_checkins_total",
+    "Conexiones devueltas al pool de la base de datos"
+)
+DB_POOL_CONNECTIONS = Counter(
+    "db_pool_connections_total",
+    "Conexiones nuevas abiertas contra la base de datos"
+)
+DB_POOL_INVALIDATIONS = Counter(
+    "db_pool_invalidations_total",
+    "Conexiones descartadas por el pool (caídas o recicladas por pre-ping)"
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "Tamaño configurado del pool de conexiones")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Conexiones actualmente en uso")
+DB_POOL_CHECKED_IN = Gauge("db_pool_checked_in", "Conexiones inactivas disponibles en el pool")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Conexiones abiertas por encima del tamaño del pool")
+
+# Métricas de la caché de formularios serializados
+FORM_CACHE_HITS = Counter(
+    "form_cache_hits_total",
+    "Formularios servidos desde la caché",
+    ["nivel"]
+)
+FORM_CACHE_MISSES = Counter(
+    "form_cache_misses_total",
+    "Formularios que tuvieron que cargarse y serializarse desde la base de datos"
+)
+
+# Métricas del pool de hashing de contraseñas (src/core/hashing.py)
+HASH_EN_COLA = Gauge(
+    "password_hash_queue_depth",
+    "Operaciones bcrypt en curso o esperando un hilo del pool de hashing"
+)
+HASH_RECHAZOS = Counter(
+    "password_hash_rejected_total",
+    "Operaciones bcrypt rechazadas con 503 por saturación del pool"
+)
+HASH_DURACION = Histogram(
+    "password_hash_duration_seconds",
+    "Duración de cada operación bcrypt"
+)
+
+# Métricas del limitador de peticiones (src/core/rate_limit.py)
+RATE_LIMIT_PERMITIDAS = Counter(
+    "rate_limit_allowed_total",
+    "Peticiones que pasaron una regla de límite",
+    ["regla"]
+)
+RATE_LIMIT_RECHAZADAS = Counter(
+    "rate_limit_rejected_total",
+    "Peticiones rechazadas con 429 por una regla de límite",
+    ["regla"]
+)
+# Métricas de las tareas en segundo plano (src/core/tareas.py)
+TAREAS_EN_COLA = Gauge(
+    "background_tasks_queued",
+    "Tareas en segundo plano esperando un worker (incluye reintentos programados)"
+)
+TAREAS_EJECUTADAS = Counter(
+    "background_tasks_total",
+    "Ejecuciones de tareas en segundo plano por resultado (ok, reintento, fallida)",
+    ["tarea", "resultado"]
+)
+
+NOTIFICACIONES_ENVIADAS = Counter(
+    "notifications_sent_total",
+    "Correos de notificación a voluntarios por resultado (ok, reintento, fallida)",
+    ["resultado"]
+)
+
+FORM_SNAPSHOT_CACHE_MISSES = Counter(
+    "form_snapshot_cache_misses_total",
+    "Versiones de formulario decodificadas desde la base de datos"
+)
+
+ANALITICA_CALCULOS = Counter(
+    "form_analytics_computations_total",
+    "Analíticas de formularios calculadas desde la base de datos (fallos de caché)"
+)
+
+RATE_LIMIT_ERRORES = Counter(
+    "rate_limit_backend_errors_total",
+    "Consultas al backend de límites que fallaron (la petición se deja pasar)"
+)
+
+
+def _leer_pool(engine: Engine, metodo: str) -> float:
+    # No todos los pools (SingletonThreadPool, StaticPool, NullPool) exponen estos contadores
+    funcion = getattr(engine.pool, metodo, None)
+    return float(funcion()) if callable(funcion) else 0.0
+
+
+def instrumentar_pool(engine: Engine) -> None:
+    """Publica el estado del pool de conexiones del engine como métricas de Prometheus"""
+    event.listen(engine, "checkout", lambda *args: DB_POOL_CHECKOUTS.inc())
+    event.listen(engine, "checkin", lambda *args: DB_POOL_CHECKINS.inc())
+    event.listen(engine, "connect", lambda *args: DB_POOL_CONNECTIONS.inc())
+    event.listen(engine, "invalidate", lambda *args: DB_POOL_INVALIDATIONS.inc())
+
+    # Los gauges se calculan en el momento del scrape
+    DB_POOL_SIZE.set_function(lambda: _leer_pool(engine, "size"))
+    DB_POOL_CHECKED_OUT.set_function(lambda: _leer_pool(engine, "checkedout"))
+    DB_POOL_CHECKED_IN.set_function(lambda: _leer_pool(engine, "checkedin"))
+    DB_POOL_OVERFLOW.set_function(lambda: max(_leer_pool(engine, "overflow"), 0.0))
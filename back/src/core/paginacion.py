@@ -0,0 +1,43 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+
+def codificar_cursor(ultimo_id: int) -> str:
+    """Token opaco con la posición del último elemento de la página"""
+    contenido = json.dumps({"id": ultimo_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(contenido).decode().rstrip("=")
+
+
+def leer_cursor(cursor: str) -> Optional[int]:
+    """Id a partir del cual continuar; un cursor vacío pide la primera página"""
+    if not cursor:
+        return None
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        return int(datos["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+
+
+def paginar(query, columna_id, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None):
+    """Aplica paginación por clave (despues_de_id) o, si no hay cursor, por offset"""
+    query = query.order_by(columna_id)
+    if despues_de_id is not None:
+        # WHERE id > :ultimo usa el índice de la clave primaria: coste constante
+        # sin importar la profundidad de la página
+        return query.filter(columna_id > despues_de_id).limit(limit)
+    return query.offset(skip).limit(limit)
+
+
+def pagina(items: List[Any], limit: int, get_id: Callable[[Any], int] = lambda item: item.id) -> Dict[str, Any]:
+    """Respuesta paginada por cursor; next_cursor es None en la última página"""
+    next_cursor = codificar_cursor(get_id(items[-1])) if items and len(items) >= limit else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,289 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from src.core.metrics import RATE_LIMIT_ERRORES, RATE_LIMIT_PERMITIDAS, RATE_LIMIT_RECHAZADAS
+from src.db.database import env_int
+
+
+@dataclass(frozen=True)
+class Regla:
+    """Cubeta de tokens: hasta `capacidad` peticiones por `ventana` segundos por clave"""
+    nombre: str
+    capacidad: int
+    ventana: float
+    # "ip" o el campo del cuerpo que identifica la cuenta (correo, usuario...)
+    clave: str = "ip"
+
+    @classmethod
+    def desde_env(cls, nombre: str, por_defecto: str, clave: str = "ip") -> "Regla":
+        # Formato "<peticiones>/<segundos>", p. ej. RATE_LIMIT_LOGIN_IP=20/60
+        valor = os.getenv(f"RATE_LIMIT_{nombre.upper()}", por_defecto)
+        capacidad, ventana = valor.split("/")
+        return cls(nombre=nombre, capacidad=int(capacidad), ventana=float(ventana), clave=clave)
+
+
+class BackendLimites(ABC):
+    """Interfaz de almacenamiento de las cubetas"""
+
+    @abstractmethod
+    async def consumir(self, clave: str, regla: Regla) -> Tuple[bool, float]:
+        """Consume un token; devuelve (permitido, segundos hasta el próximo token)"""
+
+
+class MemoriaLimites(BackendLimites):
+    """Cubetas en memoria del proceso; cada réplica limita por separado"""
+
+    def __init__(self, max_claves: int = 100_000):
+        self.max_claves = max_claves
+        self._cubetas: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def consumir(self, clave: str, regla: Regla) -> Tuple[bool, float]:
+        # Sólo memoria y un lock que nunca se retiene durante un await
+        ahora = time.monotonic()
+        tasa = regla.capacidad / regla.ventana
+        with self._lock:
+            cubeta = self._cubetas.get(clave)
+            if cubeta is None:
+                cubeta = [float(regla.capacidad), ahora]
+                self._cubetas[clave] = cubeta
+                if len(self._cubetas) > self.max_claves:
+                    # Se descarta la clave menos reciente: a lo sumo recupera su cubeta llena
+                    self._cubetas.popitem(last=False)
+            else:
+                self._cubetas.move_to_end(clave)
+                cubeta[0] = min(regla.capacidad, cubeta[0] + (ahora - cubeta[1]) * tasa)
+                cubeta[1] = ahora
+            if cubeta[0] >= 1:
+                cubeta[0] -= 1
+                return True, 0.0
+            return False, (1 - cubeta[0]) / tasa
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cubetas.clear()
+
+
+class RedisLimites(BackendLimites):
+    """Cubetas compartidas entre réplicas sobre Redis (requiere el paquete opcional redis).
+
+    Usa el cliente asíncrono para no bloquear el event loop durante la ida y
+    vuelta al servidor.
+    """
+
+    # Recarga y consumo atómicos en el servidor de Redis
+    SCRIPT = """
+    local capacidad = tonumber(ARGV[1])
+    local tasa = tonumber(ARGV[2])
+    local ahora = tonumber(ARGV[3])
+    local cubeta = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(cubeta[1]) or capacidad
+    local ts = tonumber(cubeta[2]) or ahora
+    tokens = math.min(capacidad, tokens + math.max(0, ahora - ts) * tasa)
+    local permitido = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        permitido = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(ahora))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacidad / tasa) + 1)
+    return {permitido, tostring(tokens)}
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("El backend de límites 'redis' requiere instalar el paquete redis") from e
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def consumir(self, clave: str, regla: Regla) -> Tuple[bool, float]:
+        tasa = regla.capacidad / regla.ventana
+        permitido, tokens = await self._script(
+            keys=[f"rate_limit:{clave}"], args=[regla.capacidad, tasa, time.time()]
+        )
+        if int(permitido):
+            return True, 0.0
+        return False, (1 - float(tokens)) / tasa
+
+
+def get_backend_limites() -> BackendLimites:
+    """Backend configurado con RATE_LIMIT_BACKEND (por defecto en memoria)"""
+    backend = os.getenv("RATE_LIMIT_BACKEND", "memoria").lower()
+    if backend == "redis":
+        return RedisLimites(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    if backend in ("", "memoria", "memory"):
+        return MemoriaLimites(max_claves=env_int("RATE_LIMIT_MAX_CLAVES", 100_000))
+    raise ValueError(f"Backend de límites desconocido: {backend}")
+
+
+# Reglas por ruta (método, path). Los límites por cuenta leen el campo indicado
+# del cuerpo del formulario o JSON.
+REGLAS: Dict[Tuple[str, str], List[Regla]] = {
+    ("POST", "/api/auth/login"): [
+        Regla.desde_env("login_ip", "20/60"),
+        Regla.desde_env("login_cuenta", "10/300", clave="username"),
+    ],
+    ("POST", "/api/auth/forgot-password"): [
+        Regla.desde_env("forgot_password_ip", "5/60"),
+        Regla.desde_env("forgot_password_cuenta", "3/900", clave="email"),
+    ],
+    ("POST", "/api/voluntarios/inscripcion/"): [
+        Regla.desde_env("inscripcion_ip", "60/60"),
+        Regla.desde_env("inscripcion_cuenta", "10/60", clave="correo"),
+    ],
+}
+
+
+# Los cuerpos de estas rutas son formularios pequeños; uno mayor se rechaza con 413
+# antes de acumularlo en memoria
+MAX_CUERPO = env_int("RATE_LIMIT_MAX_CUERPO", 64 * 1024)
+
+
+class CuerpoDemasiadoGrande(Exception):
+    pass
+
+
+def _leer_campos(cuerpo: bytes, content_type: str) -> dict:
+    try:
+        if content_type.startswith("application/x-www-form-urlencoded"):
+            return {k: v[0] for k, v in parse_qs(cuerpo.decode("utf-8")).items()}
+        if content_type.startswith("application/json"):
+            datos = json.loads(cuerpo)
+            return datos if isinstance(datos, dict) else {}
+    except ValueError:
+        pass
+    return {}
+
+
+class RateLimitMiddleware:
+    """Middleware ASGI de límites de peticiones por IP y por cuenta.
+
+    Las rutas sin reglas sólo pagan una búsqueda en un diccionario. En las
+    limitadas por cuenta el cuerpo (hasta `max_cuerpo` bytes) se lee una vez y
+    se reenvía intacto a la aplicación.
+    Si el backend compartido falla, la petición se deja pasar.
+    """
+
+    def __init__(
+        self,
+        app,
+        reglas: Optional[Dict[Tuple[str, str], List[Regla]]] = None,
+        backend: Optional[BackendLimites] = None,
+        proxies_confiables: Optional[int] = None,
+        max_cuerpo: int = MAX_CUERPO
+    ):
+        self.app = app
+        self.reglas = REGLAS if reglas is None else reglas
+        self.backend = backend if backend is not None else get_backend_limites()
+        self.max_cuerpo = max_cuerpo
+        # Detrás del ingress la IP real del cliente llega en X-Forwarded-For: cada uno
+        # de los `proxies_confiables` saltos agrega una entrada al final del encabezado
+        self.proxies_confiables = (
+            env_int("RATE_LIMIT_PROXIES_CONFIABLES", 0) if proxies_confiables is None else proxies_confiables
+        )
+        # Series de métricas resueltas de antemano: .labels() en cada petición es costoso
+        nombres = {regla.nombre for lista in self.reglas.values() for regla in lista}
+        self._permitidas = {nombre: RATE_LIMIT_PERMITIDAS.labels(regla=nombre) for nombre in nombres}
+        self._rechazadas = {nombre: RATE_LIMIT_RECHAZADAS.labels(regla=nombre) for nombre in nombres}
+
+    def _ip(self, scope) -> str:
+        if self.proxies_confiables:
+            entradas = [
+                entrada.strip()
+                for nombre, valor in scope["headers"] if nombre == b"x-forwarded-for"
+                for entrada in valor.decode("latin-1").split(",")
+            ]
+            # Las entradas a la izquierda de la que agregó el primer proxy confiable las controla el cliente
+            if len(entradas) >= self.proxies_confiables:
+                return entradas[-self.proxies_confiables]
+        cliente = scope.get("client")
+        return cliente[0] if cliente else "desconocido"
+
+    async def _leer_cuerpo(self, scope, receive) -> Tuple[List[dict], bytes]:
+        longitud = next((v for k, v in scope["headers"] if k == b"content-length"), None)
+        if longitud is not None and longitud.isdigit() and int(longitud) > self.max_cuerpo:
+            raise CuerpoDemasiadoGrande
+        mensajes, partes, leidos = [], [], 0
+        while True:
+            mensaje = await receive()
+            mensajes.append(mensaje)
+            if mensaje["type"] != "http.request":
+                break
+            parte = mensaje.get("body", b"")
+            leidos += len(parte)
+            if leidos > self.max_cuerpo:
+                raise CuerpoDemasiadoGrande
+            partes.append(parte)
+            if not mensaje.get("more_body", False):
+                break
+        return mensajes, b"".join(partes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        reglas = self.reglas.get((scope["method"], scope["path"]))
+        if not reglas:
+            return await self.app(scope, receive, send)
+
+        campos = None
+        if any(regla.clave != "ip" for regla in reglas):
+            try:
+                mensajes, cuerpo = await self._leer_cuerpo(scope, receive)
+            except CuerpoDemasiadoGrande:
+                return await self._responder(send, 413, "El cuerpo de la solicitud es demasiado grande")
+            content_type = next(
+                (v.decode("latin-1") for k, v in scope["headers"] if k == b"content-type"), ""
+            )
+            campos = _leer_campos(cuerpo, content_type)
+
+            # Se reenvían los mensajes leídos y después se sigue con el receive original
+            # (p. ej. para que la aplicación detecte una desconexión real del cliente)
+            async def reenviar(recibir=receive):
+                return mensajes.pop(0) if mensajes else await recibir()
+            receive = reenviar
+
+        for regla in reglas:
+            if regla.clave == "ip":
+                valor = self._ip(scope)
+            else:
+                valor = campos.get(regla.clave)
+                if not isinstance(valor, str) or not valor:
+                    continue
+                valor = valor.strip().lower()
+            try:
+                permitido, reintentar = await self.backend.consumir(f"{regla.nombre}:{valor}", regla)
+            except Exception:
+                RATE_LIMIT_ERRORES.inc()
+                continue
+            if not permitido:
+                self._rechazadas[regla.nombre].inc()
+                return await self._responder(
+                    send, 429, "Demasiadas solicitudes, intente de nuevo más tarde",
+                    [(b"retry-after", str(max(1, int(reintentar + 0.999))).encode())]
+                )
+            self._permitidas[regla.nombre].inc()
+
+        return await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _responder(send, status: int, detalle: str, cabeceras: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+        cuerpo = json.dumps({"detail": detalle}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(cuerpo)).encode()),
+                *(cabeceras or []),
+            ],
+        })
+        await send({"type": "http.response.body", "body": cuerpo})
@@ -0,0 +1,185 @@
+import asyncio
+import inspect
+import logging
+import os
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from src.core.metrics import TAREAS_EJECUTADAS, TAREAS_EN_COLA
+from src.db.database import env_int
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Tarea:
+    nombre: str
+    funcion: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    max_intentos: int = 3
+    intento: int = 0
+    ultimo_error: Optional[str] = None
+
+
+class GestorTareas:
+    """Cola de tareas en segundo plano dentro del event loop de la aplicación.
+
+    Las tareas síncronas se ejecutan en un hilo (asyncio.to_thread) para no
+    bloquear el loop. Una tarea que falla se reintenta con backoff exponencial
+    y, agotados los intentos, pasa a la lista de fallidas (dead letter).
+    encolar() puede llamarse desde endpoints síncronos, que corren en otros hilos.
+    Los reintentos que siguen programados al detener el gestor también pasan a
+    la lista de fallidas.
+    """
+
+    def __init__(self, workers: int = 2, backoff_base: float = 1.0, backoff_max: float = 60.0, max_fallidas: int = 1000):
+        self.workers = workers
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.fallidas: Deque[Tarea] = deque(maxlen=max_fallidas)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cola: Optional[asyncio.Queue] = None
+        self._tareas_fondo: List[asyncio.Task] = []
+        # Reintentos esperando su backoff, por id de la tarea
+        self._reintentos: Dict[int, Tuple[asyncio.TimerHandle, Tarea]] = {}
+        # Corrutinas agendadas en línea sobre un loop ajeno (gestor sin iniciar)
+        self._en_linea: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def activo(self) -> bool:
+        return self._loop is not None
+
+    async def iniciar(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._cola = asyncio.Queue()
+        self._tareas_fondo = [asyncio.create_task(self._trabajar()) for _ in range(self.workers)]
+
+    async def detener(self, timeout: float = 10.0) -> None:
+        """Espera a que se vacíe la cola (hasta timeout) y detiene los workers y programaciones"""
+        if self._cola is not None:
+            try:
+                await asyncio.wait_for(self._cola.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Se detienen las tareas con %s pendientes", self._cola.qsize())
+        for handle, tarea in self._reintentos.values():
+            handle.cancel()
+            TAREAS_EN_COLA.dec()
+            tarea.ultimo_error = f"reintento pendiente al detener el gestor; último error: {tarea.ultimo_error}"
+            self._descartar(tarea)
+        self._reintentos.clear()
+        for tarea in self._tareas_fondo:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas_fondo, return_exceptions=True)
+        self._tareas_fondo = []
+        self._loop = None
+        self._cola = None
+
+    def encolar(self, nombre: str, funcion: Callable[..., Any], *args: Any, max_intentos: int = 3, **kwargs: Any) -> None:
+        tarea = Tarea(nombre=nombre, funcion=funcion, args=args, kwargs=kwargs, max_intentos=max_intentos)
+        loop = self._loop
+        if loop is None:
+            # Sin gestor iniciado (scripts, pruebas sin lifespan) la tarea se ejecuta en línea
+            self._ejecutar_en_linea(tarea)
+            return
+        TAREAS_EN_COLA.inc()
+        try:
+            en_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            en_loop = False
+        if en_loop:
+            self._cola.put_nowait(tarea)
+        else:
+            loop.call_soon_threadsafe(self._cola.put_nowait, tarea)
+
+    def programar(self, nombre: str, funcion: Callable[..., Any], cada: float, *args: Any) -> None:
+        """Encola la tarea cada `cada` segundos mientras el gestor esté activo"""
+        async def repetir():
+            while True:
+                await asyncio.sleep(cada)
+                self.encolar(nombre, funcion, *args, max_intentos=1)
+        self._tareas_fondo.append(asyncio.create_task(repetir()))
+
+    def _ejecutar_en_linea(self, tarea: Tarea) -> None:
+        tarea.intento = 1
+        try:
+            resultado = tarea.funcion(*tarea.args, **tarea.kwargs)
+            if inspect.iscoroutine(resultado):
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    asyncio.run(resultado)
+                else:
+                    # Desde un endpoint async no se puede bloquear con asyncio.run:
+                    # la corrutina se agenda en el loop en curso
+                    pendiente = loop.create_task(resultado)
+                    self._en_linea.add(pendiente)
+                    pendiente.add_done_callback(partial(self._terminar_en_linea, tarea))
+                    return
+            TAREAS_EJECUTADAS.labels(tarea=tarea.nombre, resultado="ok").inc()
+        except Exception as e:
+            tarea.ultimo_error = repr(e)
+            self._descartar(tarea)
+
+    def _terminar_en_linea(self, tarea: Tarea, pendiente: asyncio.Task) -> None:
+        self._en_linea.discard(pendiente)
+        if pendiente.cancelled():
+            tarea.ultimo_error = "cancelada"
+        elif pendiente.exception() is not None:
+            tarea.ultimo_error = repr(pendiente.exception())
+        else:
+            TAREAS_EJECUTADAS.labels(tarea=tarea.nombre, resultado="ok").inc()
+            return
+        self._descartar(tarea)
+
+    async def _ejecutar(self, tarea: Tarea) -> None:
+        if inspect.iscoroutinefunction(tarea.funcion):
+            await tarea.funcion(*tarea.args, **tarea.kwargs)
+        else:
+            await asyncio.to_thread(tarea.funcion, *tarea.args, **tarea.kwargs)
+
+    async def _trabajar(self) -> None:
+        while True:
+            tarea = await self._cola.get()
+            TAREAS_EN_COLA.dec()
+            try:
+                tarea.intento += 1
+                await self._ejecutar(tarea)
+                TAREAS_EJECUTADAS.labels(tarea=tarea.nombre, resultado="ok").inc()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                tarea.ultimo_error = repr(e)
+                if tarea.intento < tarea.max_intentos:
+                    TAREAS_EJECUTADAS.labels(tarea=tarea.nombre, resultado="reintento").inc()
+                    espera = min(self.backoff_max, self.backoff_base * 2 ** (tarea.intento - 1))
+                    # El reintento espera fuera del worker para no frenar al resto de la cola
+                    TAREAS_EN_COLA.inc()
+                    handle = self._loop.call_later(espera * random.uniform(0.8, 1.2), self._reencolar, tarea)
+                    self._reintentos[id(tarea)] = (handle, tarea)
+                else:
+                    self._descartar(tarea)
+            finally:
+                self._cola.task_done()
+
+    def _reencolar(self, tarea: Tarea) -> None:
+        self._reintentos.pop(id(tarea), None)
+        self._cola.put_nowait(tarea)
+
+    def _descartar(self, tarea: Tarea) -> None:
+        logger.error("Tarea %s descartada tras %s intentos: %s", tarea.nombre, tarea.intento, tarea.ultimo_error)
+        TAREAS_EJECUTADAS.labels(tarea=tarea.nombre, resultado="fallida").inc()
+        with self._lock:
+            self.fallidas.append(tarea)
+
+
+# Instancia global, iniciada desde el lifespan de src/main.py
+gestor_tareas = GestorTareas(
+    workers=env_int("TAREAS_WORKERS", 2),
+    backoff_base=float(os.getenv("TAREAS_BACKOFF_BASE", "1.0"))
+)
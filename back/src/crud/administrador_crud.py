@@ -1,16 +1,15 @@
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from src.db.database import Administrador
 from src.schemas.AdministradorSchema import AdministradorCreate
-from passlib.context import CryptContext
+from src.core.hashing import hash_password, verificar_password, verificar_password_async
 from typing import Optional
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return verificar_password(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return hash_password(password)
 
 def get_administrador(db: Session, administrador_id: int):
     return db.query(Administrador).filter(Administrador.id == administrador_id).first()
@@ -39,4 +38,14 @@ def authenticate_administrador(db: Session, email: str, password: str):
         return False
     if not verify_password(password, administrador.contrasena_hash):
         return False
-    return administrador 
\ No newline at end of file
+    return administrador
+
+async def authenticate_administrador_async(db: Session, email: str, password: str):
+    # Sólo la consulta ocupa un hilo del threadpool; bcrypt corre en el pool de hashing
+    administrador = await run_in_threadpool(get_administrador_by_email, db, email)
+    if not administrador:
+        return False
+    if not await verificar_password_async(password, administrador.contrasena_hash):
+        return False
+    return administrador
+ 
\ No newline at end of file
@@ -0,0 +1,37 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from src.crud import evento_crud
+from src.schemas.EventoSchema import EventoOut, EventoEstadisticasOut, AnaliticaFormularioOut
+from src.services.analitica_service import analitica_service
+
+# Versión asíncrona de src/crud/evento_crud.py. La lógica se reutiliza con
+# AsyncSession.run_sync, que ejecuta la función síncrona sobre la conexión
+# asíncrona; el resultado se serializa dentro de run_sync porque las relaciones
+# perezosas no pueden cargarse fuera de él.
+
+async def get_evento(db: AsyncSession, evento_id: int) -> Optional[EventoOut]:
+    def _get(session):
+        db_evento = evento_crud.get_evento(session, evento_id)
+        return EventoOut.model_validate(db_evento) if db_evento else None
+    return await db.run_sync(_get)
+
+async def get_eventos(db: AsyncSession, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None) -> List[EventoOut]:
+    def _get(session):
+        return [
+            EventoOut.model_validate(e)
+            for e in evento_crud.get_eventos(session, skip=skip, limit=limit, despues_de_id=despues_de_id)
+        ]
+    return await db.run_sync(_get)
+
+async def get_evento_version(db: AsyncSession, evento_id: int):
+    return await db.run_sync(evento_crud.get_evento_version, evento_id)
+
+async def get_eventos_versiones(db: AsyncSession, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None):
+    return await db.run_sync(evento_crud.get_eventos_versiones, skip=skip, limit=limit, despues_de_id=despues_de_id)
+
+async def get_eventos_with_stats(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[EventoEstadisticasOut]:
+    return await db.run_sync(evento_crud.get_eventos_with_stats, skip=skip, limit=limit)
+
+async def get_analitica_formulario(db: AsyncSession, evento_id: int, tipo_formulario: str) -> Optional[AnaliticaFormularioOut]:
+    return await db.run_sync(analitica_service.obtener, evento_id, tipo_formulario)
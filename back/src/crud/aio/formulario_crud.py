@@ -0,0 +1,28 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from src.crud import formulario_crud
+from src.schemas.FormularioSchema import FormularioOut
+from src.services.formulario_cache import formulario_cache
+
+# Versión asíncrona de src/crud/formulario_crud.py (ver src/crud/aio/evento_crud.py)
+
+async def get_formulario(db: AsyncSession, formulario_id: int) -> Optional[FormularioOut]:
+    def _get(session):
+        db_formulario = formulario_crud.get_formulario(session, formulario_id)
+        return FormularioOut.model_validate(db_formulario) if db_formulario else None
+    return await db.run_sync(_get)
+
+async def get_formulario_version(db: AsyncSession, formulario_id: int) -> Optional[int]:
+    return await db.run_sync(formulario_crud.get_formulario_version, formulario_id)
+
+async def get_formulario_json(db: AsyncSession, formulario_id: int, version: Optional[int] = None) -> Optional[bytes]:
+    return await db.run_sync(formulario_cache.get_json, formulario_id, version)
+
+async def get_formularios(db: AsyncSession, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None) -> List[FormularioOut]:
+    def _get(session):
+        return [
+            FormularioOut.model_validate(f)
+            for f in formulario_crud.get_formularios(session, skip=skip, limit=limit, despues_de_id=despues_de_id)
+        ]
+    return await db.run_sync(_get)
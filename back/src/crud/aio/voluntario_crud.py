@@ -0,0 +1,89 @@
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, Any, Tuple
+
+from src.crud import voluntario_crud
+from src.schemas.VoluntarioSchema import VoluntarioOut, VoluntarioInscripcion
+from src.services.busqueda_service import busqueda_service
+from src.services.notificacion_service import notificacion_service
+
+# Versión asíncrona de src/crud/voluntario_crud.py (ver src/crud/aio/evento_crud.py)
+
+def _columnas(objeto) -> Dict[str, Any]:
+    # Mismos campos que FastAPI serializa al devolver el objeto ORM directamente
+    return {atributo.key: getattr(objeto, atributo.key) for atributo in inspect(objeto).mapper.column_attrs}
+
+async def get_voluntario(db: AsyncSession, voluntario_id: int) -> Optional[VoluntarioOut]:
+    def _get(session):
+        db_voluntario = voluntario_crud.get_voluntario(session, voluntario_id)
+        return VoluntarioOut.model_validate(db_voluntario) if db_voluntario else None
+    return await db.run_sync(_get)
+
+async def get_voluntarios(db: AsyncSession, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None) -> List[VoluntarioOut]:
+    def _get(session):
+        return [
+            VoluntarioOut.model_validate(v)
+            for v in voluntario_crud.get_voluntarios(session, skip=skip, limit=limit, despues_de_id=despues_de_id)
+        ]
+    return await db.run_sync(_get)
+
+async def inscribir_voluntario(db: AsyncSession, inscripcion: VoluntarioInscripcion):
+    def _inscribir(session):
+        result = voluntario_crud.inscribir_voluntario(session, inscripcion)
+        # Los errores se devuelven como tupla (mensaje, código), igual que en la versión síncrona
+        return result if isinstance(result, tuple) else _columnas(result)
+    return await db.run_sync(_inscribir)
+
+async def get_inscripciones_by_evento(
+    db: AsyncSession, evento_id: int, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    def _get(session):
+        return [
+            _columnas(i)
+            for i in voluntario_crud.get_inscripciones_by_evento(
+                session, evento_id=evento_id, skip=skip, limit=limit, despues_de_id=despues_de_id
+            )
+        ]
+    return await db.run_sync(_get)
+
+async def get_inscripciones_detalladas_by_evento(
+    db: AsyncSession, evento_id: int, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    return await db.run_sync(
+        voluntario_crud.get_inscripciones_detalladas_by_evento,
+        evento_id=evento_id, skip=skip, limit=limit, despues_de_id=despues_de_id
+    )
+
+async def actualizar_estado_inscripcion(
+    db: AsyncSession, inscripcion_id: int, aceptado: bool
+) -> Optional[Tuple[Dict[str, Any], bool]]:
+    def _actualizar(session):
+        resultado = voluntario_crud.actualizar_estado_inscripcion(session, inscripcion_id=inscripcion_id, aceptado=aceptado)
+        if resultado is None:
+            return None
+        db_inscripcion, recien_aceptada = resultado
+        return _columnas(db_inscripcion), recien_aceptada
+    return await db.run_sync(_actualizar)
+
+async def actualizar_estados_inscripciones(db: AsyncSession, aceptado: bool, **filtros: Any) -> Dict[str, Any]:
+    return await db.run_sync(voluntario_crud.actualizar_estados_inscripciones, aceptado, **filtros)
+
+async def aceptar_inscripciones(db: AsyncSession, inscripcion_ids: List[int]) -> Dict[str, Any]:
+    return await db.run_sync(voluntario_crud.aceptar_inscripciones, inscripcion_ids)
+
+async def notificar_aceptaciones(db: AsyncSession, inscripcion_ids: List[int]) -> int:
+    return await db.run_sync(notificacion_service.notificar_aceptaciones, inscripcion_ids)
+
+async def guardar_respuestas_formulario(db: AsyncSession, inscripcion_id: int, tipo_formulario: str, respuestas: Dict[str, Any]):
+    return await db.run_sync(
+        voluntario_crud.guardar_respuestas_formulario,
+        inscripcion_id=inscripcion_id, tipo_formulario=tipo_formulario, respuestas=respuestas
+    )
+
+async def buscar_voluntarios(db: AsyncSession, busqueda: str, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
+    return await db.run_sync(busqueda_service.buscar_voluntarios, busqueda, skip=skip, limit=limit)
+
+async def buscar_respuestas(
+    db: AsyncSession, busqueda: str, evento_id: Optional[int] = None, skip: int = 0, limit: int = 20
+) -> List[Dict[str, Any]]:
+    return await db.run_sync(busqueda_service.buscar_respuestas, busqueda, evento_id=evento_id, skip=skip, limit=limit)
@@ -1,11 +1,16 @@
-from src.db.db_connection import Database
-from datetime import datetime
+from datetime import date
+from typing import Iterable, Optional, Tuple
 
+from src.db.db_connection import Database, database as database_principal
 
-def create_event(name: str, date: datetime, locate: str):
-    conn = Database().get_connection()
-    if not conn:
-        raise ValueError
-    cursor = conn.cursor()
-    sql = f"INSERT INTO eventos (nombre, fecha_evento, lugar) VALUES ({name}, {date}, {locate})"
-    cursor.execute(sql)
+SQL_INSERT = "INSERT INTO eventos (nombre, fecha_evento, lugar, descripcion) VALUES (?, ?, ?, ?)"
+
+
+def create_event(name: str, date: Optional[date], locate: str, description: Optional[str] = None, database: Optional[Database] = None) -> int:
+    _, evento_id = (database or database_principal).ejecutar(SQL_INSERT, (name, date, locate, description))
+    return evento_id
+
+
+def create_events(events: Iterable[Tuple[str, Optional[date], str, Optional[str]]], database: Optional[Database] = None) -> int:
+    # Una sola sentencia preparada para todo el lote (executemany)
+    return (database or database_principal).ejecutar_lote(SQL_INSERT, list(events))
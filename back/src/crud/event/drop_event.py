@@ -1,10 +1,14 @@
-from src.db.db_connection import Database
+from typing import Iterable, Optional
 
+from src.db.db_connection import Database, database as database_principal
 
-def drop_event(id: int):
-    conn = Database().get_connection()
-    if not conn:
-        raise ValueError
-    cursor = conn.cursor()
-    sql = f"DROP FROM eventos WHERE id = {id}"
-    cursor.execute(sql)
+SQL_DELETE = "DELETE FROM eventos WHERE id = ?"
+
+
+def drop_event(id: int, database: Optional[Database] = None) -> bool:
+    filas, _ = (database or database_principal).ejecutar(SQL_DELETE, (id,))
+    return filas > 0
+
+
+def drop_events(ids: Iterable[int], database: Optional[Database] = None) -> int:
+    return (database or database_principal).ejecutar_lote(SQL_DELETE, [(evento_id,) for evento_id in ids])
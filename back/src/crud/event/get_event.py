@@ -1,13 +1,39 @@
-from src.db.db_connection import Database
-
-
-def get_all_events():
-    conn = Database().get_connection()
-    if not conn:
-        raise ValueError
-    cursor = conn.cursor()
-    sql = f"SELECT id, nombre FROM eventos"
-    cursor.execute(sql)
-    result = cursor.fetchone()
-    cursor.close()
-    return result
+from typing import Iterator, List, Optional, Tuple
+
+from src.db.db_connection import Database, database as database_principal
+from src.schemas.EventoSchema import EventoEstadisticasOut
+
+SQL_ESTADISTICAS = (
+    "SELECT id, nombre, fecha_evento, lugar, descripcion, formulario_pre_evento, formulario_post_evento, "
+    "total_voluntarios, voluntarios_aceptados, completados_pre, completados_post "
+    "FROM eventos ORDER BY id LIMIT ? OFFSET ?"
+)
+
+
+def get_all_events(database: Optional[Database] = None) -> List[Tuple[int, str]]:
+    return (database or database_principal).consultar("SELECT id, nombre FROM eventos ORDER BY id")
+
+
+def iter_events(tamano: int = 500, database: Optional[Database] = None) -> Iterator[Tuple[int, str]]:
+    return (database or database_principal).iterar("SELECT id, nombre FROM eventos ORDER BY id", tamano=tamano)
+
+
+def get_events_with_stats(skip: int = 0, limit: int = 100, database: Optional[Database] = None) -> List[EventoEstadisticasOut]:
+    # Equivalente a evento_crud.get_eventos_with_stats sin pasar por el ORM
+    filas = (database or database_principal).consultar(SQL_ESTADISTICAS, (limit, skip))
+    return [
+        EventoEstadisticasOut(
+            id=fila[0],
+            nombre=fila[1],
+            fecha_evento=fila[2],
+            lugar=fila[3],
+            descripcion=fila[4],
+            formulario_pre=fila[5],
+            formulario_post=fila[6],
+            total_voluntarios=fila[7] or 0,
+            voluntarios_aceptados=fila[8] or 0,
+            completados_pre=fila[9] or 0,
+            completados_post=fila[10] or 0
+        )
+        for fila in filas
+    ]
@@ -1,11 +1,18 @@
-from src.db.db_connection import Database
 from datetime import date
+from typing import Iterable, Optional, Tuple
 
+from src.db.db_connection import Database, database as database_principal
 
-def update_event(record_id: int, name: str, date: date, state: str):
-    conn = Database().get_connection()
-    if not conn:
-        raise ValueError
-    cursor = conn.cursor()
-    sql = f"UPDATE eventos SET nombre={name}, fecha_evento={date}, description={state} WHERE id = {record_id}"
-    cursor.execute(sql)
+SQL_UPDATE = "UPDATE eventos SET nombre = ?, fecha_evento = ?, descripcion = ?, version = version + 1 WHERE id = ?"
+
+
+def update_event(record_id: int, name: str, date: Optional[date], state: Optional[str], database: Optional[Database] = None) -> bool:
+    filas, _ = (database or database_principal).ejecutar(SQL_UPDATE, (name, date, state, record_id))
+    return filas > 0
+
+
+def update_events(events: Iterable[Tuple[int, str, Optional[date], Optional[str]]], database: Optional[Database] = None) -> int:
+    # Cada tupla es (id, nombre, fecha, descripcion), como en update_event
+    return (database or database_principal).ejecutar_lote(
+        SQL_UPDATE, [(name, fecha, state, record_id) for record_id, name, fecha, state in events]
+    )
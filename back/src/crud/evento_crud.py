@@ -1,43 +1,115 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from src.db.database import Evento, InscripcionEvento
-from src.schemas.EventoSchema import EventoCreate, EventoUpdate
-from typing import List, Optional
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, case, update
+from src.db.database import Evento, Formulario, InscripcionEvento, CONTADORES_EVENTO
+from src.core.paginacion import paginar
+from src.schemas.EventoSchema import EventoCreate, EventoUpdate, EventoEstadisticasOut
+from typing import List, Optional, Dict
 
 def get_evento(db: Session, evento_id: int):
     return db.query(Evento).filter(Evento.id == evento_id).first()
 
-def get_eventos(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Evento).offset(skip).limit(limit).all()
+def get_eventos(db: Session, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None):
+    return paginar(db.query(Evento), Evento.id, skip, limit, despues_de_id).all()
 
-def get_eventos_with_stats(db: Session, skip: int = 0, limit: int = 100):
-    eventos = db.query(Evento).offset(skip).limit(limit).all()
+def _query_versiones(db: Session):
+    # Versión del evento y de los formularios que se incrustan en EventoOut,
+    # sin cargar preguntas ni opciones
+    formulario_pre = aliased(Formulario)
+    formulario_post = aliased(Formulario)
+    return db.query(
+        Evento.id, Evento.version, formulario_pre.version, formulario_post.version
+    ).outerjoin(
+        formulario_pre, Evento.formulario_pre_evento == formulario_pre.id
+    ).outerjoin(
+        formulario_post, Evento.formulario_post_evento == formulario_post.id
+    )
+
+def get_evento_version(db: Session, evento_id: int):
+    return _query_versiones(db).filter(Evento.id == evento_id).first()
+
+def get_eventos_versiones(db: Session, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None):
+    return paginar(_query_versiones(db), Evento.id, skip, limit, despues_de_id).all()
+
+def get_eventos_with_stats(db: Session, skip: int = 0, limit: int = 100) -> List[EventoEstadisticasOut]:
+    # Las estadísticas se leen de los contadores materializados en eventos;
+    # se consultan sólo las columnas necesarias, sin pasar por el identity map
+    eventos = db.query(
+        Evento.id,
+        Evento.nombre,
+        Evento.fecha_evento,
+        Evento.lugar,
+        Evento.descripcion,
+        Evento.formulario_pre_evento,
+        Evento.formulario_post_evento,
+        Evento.total_voluntarios,
+        Evento.voluntarios_aceptados,
+        Evento.completados_pre,
+        Evento.completados_post
+    ).order_by(Evento.id).offset(skip).limit(limit).all()
+    
+    return [
+        EventoEstadisticasOut(
+            id=evento.id,
+            nombre=evento.nombre,
+            fecha_evento=evento.fecha_evento,
+            lugar=evento.lugar,
+            descripcion=evento.descripcion,
+            formulario_pre=evento.formulario_pre_evento,
+            formulario_post=evento.formulario_post_evento,
+            total_voluntarios=evento.total_voluntarios or 0,
+            voluntarios_aceptados=evento.voluntarios_aceptados or 0,
+            completados_pre=evento.completados_pre or 0,
+            completados_post=evento.completados_post or 0
+        )
+        for evento in eventos
+    ]
+
+def incrementar_contadores(db: Session, evento_id: int, **deltas: int):
+    # Actualiza los contadores del evento dentro de la transacción del llamador
+    valores = {
+        getattr(Evento, contador): getattr(Evento, contador) + delta
+        for contador, delta in deltas.items()
+        if delta
+    }
+    if valores:
+        db.query(Evento).filter(Evento.id == evento_id).update(valores, synchronize_session=False)
+
+def contar_inscripciones(db: Session, evento_ids: Optional[List[int]] = None) -> Dict[int, Dict[str, int]]:
+    # Recalcula las estadísticas desde inscripciones_eventos en una sola consulta agregada
+    query = db.query(
+        InscripcionEvento.evento_id,
+        func.count(InscripcionEvento.id),
+        func.sum(case((InscripcionEvento.aceptado == True, 1), else_=0)),
+        func.sum(case((InscripcionEvento.completado_pre == True, 1), else_=0)),
+        func.sum(case((InscripcionEvento.completado_post == True, 1), else_=0))
+    )
+    if evento_ids is not None:
+        query = query.filter(InscripcionEvento.evento_id.in_(evento_ids))
     
-    result = []
-    for evento in eventos:
-        total_voluntarios = db.query(func.count(InscripcionEvento.id)).filter(
-            InscripcionEvento.evento_id == evento.id
-        ).scalar()
-        
-        voluntarios_aceptados = db.query(func.count(InscripcionEvento.id)).filter(
-            InscripcionEvento.evento_id == evento.id,
-            InscripcionEvento.aceptado == True
-        ).scalar()
-        
-        evento_dict = {
-            "id": evento.id,
-            "nombre": evento.nombre,
-            "fecha_evento": evento.fecha_evento,
-            "lugar": evento.lugar,
-            "descripcion": evento.descripcion,
-            "formulario_pre": evento.formulario_pre_evento,
-            "formulario_post": evento.formulario_post_evento,
-            "total_voluntarios": total_voluntarios,
-            "voluntarios_aceptados": voluntarios_aceptados
+    return {
+        evento_id: {
+            "total_voluntarios": total,
+            "voluntarios_aceptados": aceptados or 0,
+            "completados_pre": completados_pre or 0,
+            "completados_post": completados_post or 0
         }
-        result.append(evento_dict)
+        for evento_id, total, aceptados, completados_pre, completados_post
+        in query.group_by(InscripcionEvento.evento_id).all()
+    }
+
+def recalcular_contadores(db: Session) -> int:
+    # Reconstruye los contadores de todos los eventos desde las tablas de origen
+    conteos = contar_inscripciones(db)
+    evento_ids = [evento_id for (evento_id,) in db.query(Evento.id).all()]
+    vacio = {contador: 0 for contador in CONTADORES_EVENTO}
     
-    return result
+    if evento_ids:
+        db.execute(
+            update(Evento),
+            [{"id": evento_id, **conteos.get(evento_id, vacio)} for evento_id in evento_ids]
+        )
+    db.commit()
+    return len(evento_ids)
 
 def create_evento(db: Session, evento: EventoCreate):
     db_evento = Evento(
@@ -71,6 +143,8 @@ def update_evento(db: Session, evento_id: int, evento: EventoUpdate):
     if evento.formulario_post_evento is not None:
         db_evento.formulario_post_evento = evento.formulario_post_evento
     
+    # Se incrementa en SQL: dos ediciones simultáneas no pueden publicar la misma versión
+    db_evento.version = Evento.version + 1
     db.commit()
     db.refresh(db_evento)
     return db_evento
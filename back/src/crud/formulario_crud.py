@@ -1,7 +1,12 @@
-from sqlalchemy.orm import Session
-from src.db.database import Formulario, Pregunta, Opcion
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, selectinload
+from src.db.database import Formulario, FormularioVersion, Pregunta, Opcion, DetalleRespuesta
+from src.core.paginacion import paginar
 from src.schemas.FormularioSchema import FormularioCreate, FormularioUpdate
-from typing import List, Optional
+from src.schemas.PreguntaSchema import PreguntaUpdate
+from src.services.formulario_cache import formulario_cache
+from src.services.formulario_versiones import formulario_versiones
+from typing import Dict, List, Optional, Set
 from fastapi import HTTPException, status
 import logging
 
@@ -9,78 +14,92 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+TIPOS_CON_OPCIONES = ("seleccion_multiple", "seleccion_unica")
+
 def get_formulario(db: Session, formulario_id: int):
     return db.query(Formulario).filter(Formulario.id == formulario_id).first()
 
-def get_formularios(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Formulario).offset(skip).limit(limit).all()
+def get_formulario_version(db: Session, formulario_id: int) -> Optional[int]:
+    return db.query(Formulario.version).filter(Formulario.id == formulario_id).scalar()
+
+def get_formularios(db: Session, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None):
+    return paginar(db.query(Formulario), Formulario.id, skip, limit, despues_de_id).all()
+
+def _opciones_nuevas(numero: int, tipo: str, pregunta) -> List[str]:
+    if tipo not in TIPOS_CON_OPCIONES:
+        return []
+    if not pregunta.opciones:
+        logger.warning("Pregunta %s de tipo %s no tiene opciones", numero, tipo)
+        # Agregar una opción por defecto para evitar problemas
+        return ["Opción 1"]
+
+    textos = []
+    for j, opcion in enumerate(pregunta.opciones):
+        texto_opcion = getattr(opcion, "texto_opcion", None)
+        if not texto_opcion:
+            logger.warning("Opción sin texto_opcion en la pregunta %s: %r", numero, opcion)
+            texto_opcion = f"Opción {j+1}"
+        textos.append(texto_opcion)
+    return textos
+
+def _insertar_preguntas(db: Session, formulario_id: int, filas: List[Dict]) -> Dict[int, int]:
+    """Inserta las preguntas en una sentencia y devuelve {orden: id}"""
+    tabla = Pregunta.__table__
+    if db.get_bind().dialect.insert_returning:
+        # Un único INSERT ... VALUES (...), (...) RETURNING; el orden de las filas
+        # devueltas no está garantizado, por eso se emparejan por `orden`
+        resultado = db.execute(insert(tabla).values(filas).returning(tabla.c.orden, tabla.c.id))
+    else:
+        db.execute(insert(tabla), filas)
+        resultado = db.execute(select(tabla.c.orden, tabla.c.id).where(tabla.c.formulario_id == formulario_id))
+    return dict(resultado.all())
 
 def create_formulario(db: Session, formulario: FormularioCreate):
     try:
-        logger.info(f"Creando formulario: {formulario.nombre}")
-        logger.info(f"Preguntas recibidas: {len(formulario.preguntas)}")
+        logger.info("Creando formulario %r con %s preguntas", formulario.nombre, len(formulario.preguntas))
+        debug = logger.isEnabledFor(logging.DEBUG)
         
         # Crear el formulario principal
         db_formulario = Formulario(nombre=formulario.nombre)
         db.add(db_formulario)
         db.flush()
+        formulario_id = db_formulario.id
         
-        # Crear las preguntas asociadas
+        preguntas, opciones = [], []
         for i, pregunta in enumerate(formulario.preguntas):
-            logger.info(f"Procesando pregunta {i+1}: {pregunta.texto[:30]}... (tipo: {pregunta.tipo})")
+            if debug:
+                logger.debug("Pregunta %s: %.30s... (tipo: %s)", i + 1, pregunta.texto, pregunta.tipo)
             
             # Validar el tipo de pregunta
             if pregunta.tipo not in ["textual", "seleccion_multiple", "seleccion_unica"]:
-                logger.warning(f"Tipo de pregunta inválido: {pregunta.tipo}. Usando 'textual' por defecto.")
+                logger.warning("Tipo de pregunta inválido: %s. Usando 'textual' por defecto.", pregunta.tipo)
                 pregunta_tipo = "textual"
             else:
                 pregunta_tipo = pregunta.tipo
-                
-            db_pregunta = Pregunta(
-                formulario_id=db_formulario.id,
-                texto=pregunta.texto,
-                tipo=pregunta_tipo
-            )
-            db.add(db_pregunta)
-            db.flush()
             
-            # Crear opciones para preguntas de selección
-            if pregunta_tipo in ["seleccion_multiple", "seleccion_unica"]:
-                if not pregunta.opciones:
-                    logger.warning(f"Pregunta {i+1} de tipo {pregunta_tipo} no tiene opciones")
-                    # Agregar una opción por defecto para evitar problemas
-                    db_opcion = Opcion(
-                        pregunta_id=db_pregunta.id,
-                        texto_opcion="Opción 1"
-                    )
-                    db.add(db_opcion)
-                    continue
-                    
-                logger.info(f"Procesando {len(pregunta.opciones)} opciones para pregunta {i+1}")
-                
-                for j, opcion in enumerate(pregunta.opciones):
-                    # Verificar que la opción tiene el campo texto_opcion
-                    texto_opcion = getattr(opcion, 'texto_opcion', None)
-                    if not texto_opcion:
-                        if hasattr(opcion, '__dict__'):
-                            logger.warning(f"Opción sin texto_opcion. Datos recibidos: {opcion.__dict__}")
-                        else:
-                            logger.warning(f"Opción sin texto_opcion. Tipo: {type(opcion)}")
-                        texto_opcion = f"Opción {j+1}"
-                    else:
-                        logger.info(f"Opción {j+1}: {texto_opcion[:20]}...")
-                    
-                    db_opcion = Opcion(
-                        pregunta_id=db_pregunta.id,
-                        texto_opcion=texto_opcion
-                    )
-                    db.add(db_opcion)
+            preguntas.append({"formulario_id": formulario_id, "texto": pregunta.texto, "tipo": pregunta_tipo, "orden": i})
+            opciones.append(_opciones_nuevas(i + 1, pregunta_tipo, pregunta))
+        
+        # Preguntas en un INSERT y todas las opciones en otro, en lugar de un
+        # flush por pregunta para conocer su id
+        ids = _insertar_preguntas(db, formulario_id, preguntas)
+        filas_opciones = [
+            {"pregunta_id": ids[i], "texto_opcion": texto, "orden": j}
+            for i, textos in enumerate(opciones)
+            for j, texto in enumerate(textos)
+        ]
+        if filas_opciones:
+            db.execute(insert(Opcion.__table__), filas_opciones)
+        if debug:
+            logger.debug("Formulario %s: %s preguntas y %s opciones insertadas", formulario_id, len(ids), len(filas_opciones))
+        formulario_versiones.registrar(db, formulario_id, db_formulario.version)
         
-        # Confirmar cambios en la base de datos
         db.commit()
-        db.refresh(db_formulario)
-        logger.info(f"Formulario creado exitosamente con ID: {db_formulario.id}")
-        return db_formulario
+        logger.info("Formulario creado exitosamente con ID: %s", formulario_id)
+        # Se devuelve con preguntas y opciones precargadas para serializarlo sin N+1
+        return db.query(Formulario).options(
+            selectinload(Formulario.preguntas).selectinload(Pregunta.opciones)
+        ).filter(Formulario.id == formulario_id).one()
     
     except Exception as e:
         db.rollback()
@@ -99,15 +118,110 @@ def create_formulario(db: Session, formulario: FormularioCreate):
                 detail=f"Error al crear el formulario: {error_msg}"
             )
 
+def _ids_con_respuestas(db: Session, columna, ids: List[int]) -> Set[int]:
+    if not ids:
+        return set()
+    return {valor for (valor,) in db.query(columna).filter(columna.in_(ids)).distinct()}
+
+def _sincronizar_preguntas(db: Session, db_formulario: Formulario, preguntas: List[PreguntaUpdate]) -> Dict[str, int]:
+    """Aplica al formulario sólo las diferencias con las preguntas recibidas.
+
+    Preguntas y opciones se emparejan por id. Las altas y modificaciones se
+    envían en lote con el flush de la sesión; las bajas, con un DELETE por
+    tabla. Lo que ya tiene respuestas no se borra ni se reescribe: se retira
+    (activa = False) y, si cambió su texto o tipo, se crea una versión nueva,
+    de modo que los detalles de respuesta existentes sigan apuntando a la
+    pregunta y opción que el voluntario vio.
+    """
+    existentes = {p.id: p for p in db_formulario.preguntas if p.activa}
+    opciones_existentes = [o.id for p in existentes.values() for o in p.opciones if o.activa]
+    preguntas_respondidas = _ids_con_respuestas(db, DetalleRespuesta.pregunta_id, list(existentes))
+    opciones_respondidas = _ids_con_respuestas(db, DetalleRespuesta.opcion_id, opciones_existentes)
+
+    resumen = {"creadas": 0, "actualizadas": 0, "retiradas": 0, "eliminadas": 0}
+    retirar_preguntas, borrar_preguntas = set(), set()
+    retirar_opciones, borrar_opciones = set(), set()
+
+    def quitar_opcion(opcion_id: int):
+        (retirar_opciones if opcion_id in opciones_respondidas else borrar_opciones).add(opcion_id)
+
+    for orden, pregunta in enumerate(preguntas):
+        db_pregunta = existentes.pop(pregunta.id, None) if pregunta.id is not None else None
+        if db_pregunta is not None and (db_pregunta.texto, db_pregunta.tipo) != (pregunta.texto, pregunta.tipo):
+            if db_pregunta.id in preguntas_respondidas:
+                retirar_preguntas.add(db_pregunta.id)
+                db_pregunta = None
+            else:
+                db_pregunta.texto = pregunta.texto
+                db_pregunta.tipo = pregunta.tipo
+                resumen["actualizadas"] += 1
+
+        if db_pregunta is None:
+            db_pregunta = Pregunta(formulario_id=db_formulario.id, texto=pregunta.texto, tipo=pregunta.tipo, orden=orden)
+            db.add(db_pregunta)
+            resumen["creadas"] += 1
+            actuales = {}
+        else:
+            if db_pregunta.orden != orden:
+                db_pregunta.orden = orden
+            actuales = {o.id: o for o in db_pregunta.opciones if o.activa}
+
+        opciones = (pregunta.opciones or []) if pregunta.tipo in TIPOS_CON_OPCIONES else []
+        for orden_opcion, opcion in enumerate(opciones):
+            db_opcion = actuales.pop(opcion.id, None) if opcion.id is not None else None
+            if db_opcion is not None and db_opcion.texto_opcion != opcion.texto_opcion:
+                if db_opcion.id in opciones_respondidas:
+                    retirar_opciones.add(db_opcion.id)
+                    db_opcion = None
+                else:
+                    db_opcion.texto_opcion = opcion.texto_opcion
+            if db_opcion is None:
+                db_pregunta.opciones.append(Opcion(texto_opcion=opcion.texto_opcion, orden=orden_opcion))
+            elif db_opcion.orden != orden_opcion:
+                db_opcion.orden = orden_opcion
+        for opcion_id in actuales:
+            quitar_opcion(opcion_id)
+
+    # Preguntas que ya no vienen en la actualización
+    for pregunta_id, db_pregunta in existentes.items():
+        if pregunta_id in preguntas_respondidas:
+            retirar_preguntas.add(pregunta_id)
+        else:
+            borrar_preguntas.add(pregunta_id)
+            borrar_opciones.update(o.id for o in db_pregunta.opciones)
+
+    # INSERT y UPDATE agrupados por el unit of work
+    db.flush()
+    if retirar_opciones:
+        db.query(Opcion).filter(Opcion.id.in_(retirar_opciones)).update({Opcion.activa: False}, synchronize_session=False)
+    if retirar_preguntas:
+        db.query(Pregunta).filter(Pregunta.id.in_(retirar_preguntas)).update({Pregunta.activa: False}, synchronize_session=False)
+    if borrar_opciones:
+        db.query(Opcion).filter(Opcion.id.in_(borrar_opciones)).delete(synchronize_session=False)
+    if borrar_preguntas:
+        db.query(Pregunta).filter(Pregunta.id.in_(borrar_preguntas)).delete(synchronize_session=False)
+
+    resumen["retiradas"] = len(retirar_preguntas)
+    resumen["eliminadas"] = len(borrar_preguntas)
+    return resumen
+
 def update_formulario(db: Session, formulario_id: int, formulario: FormularioUpdate):
     try:
         logger.info(f"Actualizando formulario ID: {formulario_id}")
         
-        db_formulario = get_formulario(db, formulario_id)
+        # FOR UPDATE serializa las ediciones simultáneas del mismo formulario (MySQL);
+        # populate_existing descarta lo que la sesión tuviera en memoria
+        db_formulario = db.query(Formulario).options(
+            selectinload(Formulario.preguntas).selectinload(Pregunta.opciones)
+        ).filter(Formulario.id == formulario_id).with_for_update().populate_existing().first()
         if not db_formulario:
             logger.warning(f"Formulario ID {formulario_id} no encontrado")
             return None
         
+        # Nueva versión del formulario: invalida las copias cacheadas. Se incrementa
+        # en SQL sobre la fila actual y se relee tras el flush
+        db_formulario.version = Formulario.version + 1
+        
         # Actualizar campos del formulario
         if formulario.nombre:
             logger.info(f"Actualizando nombre a: {formulario.nombre}")
@@ -115,45 +229,16 @@ def update_formulario(db: Session, formulario_id: int, formulario: FormularioUpd
         
         # Actualizar preguntas si se proporcionaron
         if formulario.preguntas is not None:
-            logger.info(f"Actualizando {len(formulario.preguntas)} preguntas")
-            
-            # Obtener IDs de preguntas existentes para eliminarlas
-            pregunta_ids = [p.id for p in db_formulario.preguntas]
-            
-            # Eliminar opciones existentes de las preguntas
-            if pregunta_ids:
-                logger.info(f"Eliminando opciones de preguntas existentes: {pregunta_ids}")
-                db.query(Opcion).filter(Opcion.pregunta_id.in_(pregunta_ids)).delete(synchronize_session=False)
-                
-            # Eliminar preguntas existentes
-            logger.info(f"Eliminando preguntas existentes del formulario ID: {formulario_id}")
-            db.query(Pregunta).filter(Pregunta.formulario_id == db_formulario.id).delete(synchronize_session=False)
-            
-            # Crear nuevas preguntas
-            for i, pregunta in enumerate(formulario.preguntas):
-                logger.info(f"Creando pregunta {i+1}: {pregunta.texto[:30]}...")
-                
-                db_pregunta = Pregunta(
-                    formulario_id=db_formulario.id,
-                    texto=pregunta.texto,
-                    tipo=pregunta.tipo
-                )
-                db.add(db_pregunta)
-                db.flush()
-                
-                # Crear opciones para preguntas de selección
-                if pregunta.tipo in ["seleccion_multiple", "seleccion_unica"] and pregunta.opciones:
-                    logger.info(f"Creando {len(pregunta.opciones)} opciones para pregunta {i+1}")
-                    
-                    for j, opcion in enumerate(pregunta.opciones):
-                        db_opcion = Opcion(
-                            pregunta_id=db_pregunta.id,
-                            texto_opcion=opcion.texto_opcion
-                        )
-                        db.add(db_opcion)
+            resumen = _sincronizar_preguntas(db, db_formulario, formulario.preguntas)
+            logger.info(f"Preguntas del formulario ID {formulario_id}: {resumen}")
+        
+        # Revisión inmutable de la nueva versión, para las respuestas que se reciban con ella
+        db.flush()
+        formulario_versiones.registrar(db, formulario_id, db_formulario.version)
         
         # Confirmar cambios en la base de datos
         db.commit()
+        formulario_cache.invalidar(formulario_id)
         db.refresh(db_formulario)
         logger.info(f"Formulario ID {formulario_id} actualizado exitosamente")
         return db_formulario
@@ -185,6 +270,11 @@ def delete_formulario(db: Session, formulario_id: int):
             logger.warning(f"Formulario ID {formulario_id} no encontrado")
             raise HTTPException(status_code=404, detail="Formulario no encontrado")
         
+        # Las revisiones guardadas del formulario
+        version_ids = [i for (i,) in db.query(FormularioVersion.id).filter(FormularioVersion.formulario_id == formulario_id)]
+        if version_ids:
+            db.query(FormularioVersion).filter(FormularioVersion.id.in_(version_ids)).delete(synchronize_session=False)
+        
         # Eliminar las opciones de las preguntas primero
         for pregunta in db_formulario.preguntas:
             db.query(Opcion).filter(Opcion.pregunta_id == pregunta.id).delete(synchronize_session=False)
@@ -195,6 +285,8 @@ def delete_formulario(db: Session, formulario_id: int):
         # Finalmente eliminar el formulario
         db.delete(db_formulario)
         db.commit()
+        formulario_cache.invalidar(formulario_id)
+        formulario_versiones.descartar(version_ids)
         logger.info(f"Formulario ID {formulario_id} eliminado exitosamente")
         return True
     
@@ -1,8 +1,16 @@
-from sqlalchemy.orm import Session
-from src.db.database import Voluntario, InscripcionEvento, Respuesta, DetalleRespuesta, Pregunta, Opcion
-from src.schemas.VoluntarioSchema import VoluntarioCreate, VoluntarioInscripcion
-from typing import List, Optional, Dict, Any
+from sqlalchemy import func, insert, or_, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+from src.db.database import Voluntario, Evento, InscripcionEvento, Respuesta, DetalleRespuesta, Pregunta, Opcion
+from src.schemas.VoluntarioSchema import VoluntarioCreate, VoluntarioInscripcion, RespuestasInscripcion
+from src.crud import evento_crud
+from src.core.paginacion import paginar
+from src.services.formulario_versiones import formulario_versiones
+from typing import List, Optional, Dict, Any, Tuple, Union
 import uuid
+from collections import Counter
 
 def get_voluntario(db: Session, voluntario_id: int):
     return db.query(Voluntario).filter(Voluntario.id == voluntario_id).first()
@@ -10,8 +18,8 @@ def get_voluntario(db: Session, voluntario_id: int):
 def get_voluntario_by_email(db: Session, email: str):
     return db.query(Voluntario).filter(Voluntario.correo == email).first()
 
-def get_voluntarios(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Voluntario).offset(skip).limit(limit).all()
+def get_voluntarios(db: Session, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None):
+    return paginar(db.query(Voluntario), Voluntario.id, skip, limit, despues_de_id).all()
 
 def create_voluntario(db: Session, voluntario: VoluntarioCreate):
     db_voluntario = Voluntario(
@@ -25,180 +33,375 @@ def create_voluntario(db: Session, voluntario: VoluntarioCreate):
     db.refresh(db_voluntario)
     return db_voluntario
 
-def inscribir_voluntario(db: Session, inscripcion: VoluntarioInscripcion):
-    # Verificar si el voluntario ya existe
-    db_voluntario = get_voluntario_by_email(db, inscripcion.correo)
-    
-    # Si no existe, crearlo
-    if not db_voluntario:
-        db_voluntario = Voluntario(
-            nombre=inscripcion.nombre,
-            correo=inscripcion.correo,
-            confirmacion_correo=inscripcion.confirmacion_correo,
-            numero_identificacion=inscripcion.numero_identificacion
+def _upsert_voluntario(db: Session, inscripcion: VoluntarioInscripcion) -> int:
+    """Crea el voluntario o devuelve el id del existente con ese correo, en una sola sentencia"""
+    valores = {
+        "nombre": inscripcion.nombre,
+        "correo": inscripcion.correo,
+        "confirmacion_correo": inscripcion.confirmacion_correo,
+        "numero_identificacion": inscripcion.numero_identificacion
+    }
+    if db.get_bind().dialect.name in ("mysql", "mariadb"):
+        # LAST_INSERT_ID(id) hace que lastrowid apunte a la fila existente
+        stmt = mysql_insert(Voluntario).values(**valores).on_duplicate_key_update(
+            id=func.last_insert_id(Voluntario.id)
         )
-        db.add(db_voluntario)
-        db.flush()
-    
-    # Verificar si ya está inscrito en este evento
-    existing_inscripcion = db.query(InscripcionEvento).filter(
-        InscripcionEvento.voluntario_id == db_voluntario.id,
-        InscripcionEvento.evento_id == inscripcion.evento_id
-    ).first()
-    
-    if existing_inscripcion:
-        return {"message": "Ya está inscrito en este evento"}, 400
-    
-    # Crear inscripción
-    db_inscripcion = InscripcionEvento(
-        voluntario_id=db_voluntario.id,
-        evento_id=inscripcion.evento_id,
-        aceptacion_terminos=inscripcion.aceptacion_terminos
-    )
-    db.add(db_inscripcion)
+        return db.execute(stmt).lastrowid
+    
+    stmt = sqlite_insert(Voluntario).values(**valores)
+    # Los datos del voluntario existente no se modifican
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Voluntario.correo], set_={"correo": stmt.excluded.correo}
+    ).returning(Voluntario.id)
+    return db.execute(stmt).scalar_one()
+
+def _es_duplicado(error: IntegrityError) -> bool:
+    # MySQL: error 1062 (ER_DUP_ENTRY); SQLite: UNIQUE constraint failed
+    codigo = error.orig.args[0] if error.orig.args else None
+    return codigo == 1062 or "UNIQUE constraint failed" in str(error.orig)
+
+def _crear_inscripcion(db: Session, inscripcion: VoluntarioInscripcion) -> Union[int, Tuple[Dict[str, str], int]]:
+    # La unicidad de voluntarios.correo y de (voluntario_id, evento_id) la garantiza
+    # la base de datos: no hay consultas previas que puedan quedar obsoletas
+    voluntario_id = _upsert_voluntario(db, inscripcion)
+    
+    # Inserción directa (sin flush del ORM): si la clave única la rechaza, la
+    # sesión sigue utilizable y los objetos del llamador no se expiran
+    try:
+        resultado = db.execute(insert(InscripcionEvento.__table__).values(
+            voluntario_id=voluntario_id,
+            evento_id=inscripcion.evento_id,
+            aceptacion_terminos=inscripcion.aceptacion_terminos
+        ))
+    except IntegrityError as e:
+        if _es_duplicado(e):
+            return {"message": "Ya está inscrito en este evento"}, 409
+        raise
+    return resultado.inserted_primary_key[0]
+
+def inscribir_voluntario(db: Session, inscripcion: VoluntarioInscripcion):
+    inscripcion_id = _crear_inscripcion(db, inscripcion)
+    if isinstance(inscripcion_id, tuple):
+        return inscripcion_id
+    
+    evento_crud.incrementar_contadores(db, inscripcion.evento_id, total_voluntarios=1)
     db.commit()
-    db.refresh(db_inscripcion)
     
-    return db_inscripcion
+    return db.get(InscripcionEvento, inscripcion_id)
+
+def inscribir_voluntarios_lote(db: Session, inscripciones: List[VoluntarioInscripcion]) -> List[Union[int, Tuple[Dict[str, str], int]]]:
+    """Registra varias inscripciones en una sola transacción.
+    
+    Devuelve, en el mismo orden, el id de cada inscripción creada o la tupla
+    (mensaje, código) de las rechazadas.
+    """
+    resultados = [_crear_inscripcion(db, inscripcion) for inscripcion in inscripciones]
+    
+    # Un único UPDATE de contadores por evento
+    nuevas_por_evento: Dict[int, int] = {}
+    for inscripcion, resultado in zip(inscripciones, resultados):
+        if not isinstance(resultado, tuple):
+            nuevas_por_evento[inscripcion.evento_id] = nuevas_por_evento.get(inscripcion.evento_id, 0) + 1
+    for evento_id, nuevas in nuevas_por_evento.items():
+        evento_crud.incrementar_contadores(db, evento_id, total_voluntarios=nuevas)
+    
+    db.commit()
+    return resultados
 
-def get_inscripciones_by_evento(db: Session, evento_id: int, skip: int = 0, limit: int = 100):
-    return db.query(InscripcionEvento).filter(
+def get_inscripciones_by_evento(db: Session, evento_id: int, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None):
+    query = db.query(InscripcionEvento).filter(
         InscripcionEvento.evento_id == evento_id
-    ).offset(skip).limit(limit).all()
+    )
+    return paginar(query, InscripcionEvento.id, skip, limit, despues_de_id).all()
 
-def get_inscripciones_detalladas_by_evento(db: Session, evento_id: int, skip: int = 0, limit: int = 100):
-    # Obtener inscripciones con voluntarios
-    inscripciones = db.query(InscripcionEvento).filter(
+def get_inscripciones_detalladas_by_evento(db: Session, evento_id: int, skip: int = 0, limit: int = 100, despues_de_id: Optional[int] = None):
+    # Obtener inscripciones con voluntarios en una sola consulta
+    query = db.query(InscripcionEvento).options(
+        joinedload(InscripcionEvento.voluntario)
+    ).filter(
         InscripcionEvento.evento_id == evento_id
-    ).offset(skip).limit(limit).all()
-    
-    result = []
-    for inscripcion in inscripciones:
-        # Construir datos básicos de la inscripción
-        inscripcion_data = {
-            "id": inscripcion.id,
-            "voluntario_id": inscripcion.voluntario_id,
-            "evento_id": inscripcion.evento_id,
-            "fecha_inscripcion": inscripcion.fecha_inscripcion.isoformat(),
-            "aceptado": inscripcion.aceptado,
-            "completado_pre": inscripcion.completado_pre,
-            "completado_post": inscripcion.completado_post,
-            "aceptacion_terminos": inscripcion.aceptacion_terminos,
-            "voluntario": {
-                "id": inscripcion.voluntario.id,
-                "nombre": inscripcion.voluntario.nombre,
-                "correo": inscripcion.voluntario.correo,
-                "numero_identificacion": inscripcion.voluntario.numero_identificacion
-            }
+    )
+    inscripciones = paginar(query, InscripcionEvento.id, skip, limit, despues_de_id).all()
+    
+    if not inscripciones:
+        return []
+    
+    # Detalles de todas las respuestas pre-evento de la página en una consulta;
+    # los textos de preguntas y opciones salen del snapshot de la revisión
+    # respondida, no de las tablas vivas
+    detalles = db.query(
+        Respuesta.inscripcion_id,
+        Respuesta.formulario_version_id,
+        DetalleRespuesta.pregunta_id,
+        DetalleRespuesta.opcion_id,
+        DetalleRespuesta.texto_respuesta
+    ).join(
+        DetalleRespuesta, DetalleRespuesta.respuesta_id == Respuesta.id
+    ).filter(
+        Respuesta.inscripcion_id.in_([inscripcion.id for inscripcion in inscripciones]),
+        Respuesta.tipo_formulario == "pre"
+    ).order_by(Respuesta.id, DetalleRespuesta.id).all()
+    textos = formulario_versiones.resolver(
+        db, [(version_id, pregunta_id, opcion_id) for _, version_id, pregunta_id, opcion_id, _ in detalles]
+    )
+    
+    # Agrupar detalles por inscripción
+    respuestas_por_inscripcion: Dict[int, List[Tuple]] = {}
+    for detalle, (pregunta, opcion) in zip(detalles, textos):
+        respuestas_por_inscripcion.setdefault(detalle[0], []).append((detalle[2], pregunta, opcion, detalle[4]))
+    
+    return [
+        _serializar_inscripcion_detallada(inscripcion, respuestas_por_inscripcion.get(inscripcion.id, []))
+        for inscripcion in inscripciones
+    ]
+
+def _serializar_inscripcion_detallada(inscripcion: InscripcionEvento, detalles: List[Tuple]) -> Dict[str, Any]:
+    # Construir datos básicos de la inscripción
+    inscripcion_data = {
+        "id": inscripcion.id,
+        "voluntario_id": inscripcion.voluntario_id,
+        "evento_id": inscripcion.evento_id,
+        "fecha_inscripcion": inscripcion.fecha_inscripcion.isoformat(),
+        "aceptado": inscripcion.aceptado,
+        "completado_pre": inscripcion.completado_pre,
+        "completado_post": inscripcion.completado_post,
+        "aceptacion_terminos": inscripcion.aceptacion_terminos,
+        "voluntario": {
+            "id": inscripcion.voluntario.id,
+            "nombre": inscripcion.voluntario.nombre,
+            "correo": inscripcion.voluntario.correo,
+            "numero_identificacion": inscripcion.voluntario.numero_identificacion
         }
+    }
+    
+    # Respuestas agrupadas por pregunta, evitando duplicados; cada detalle es
+    # (pregunta_id, (texto, tipo) de la pregunta, texto de la opción, texto de la respuesta)
+    respuestas_pre: Dict[int, Dict[str, Any]] = {}
+    for pregunta_id, pregunta, opcion, texto_respuesta in detalles:
+        if not pregunta:
+            continue
+        pregunta_texto, tipo = pregunta
         
-        # Obtener respuestas pre-evento
-        respuestas_pre = []
-        respuestas = db.query(Respuesta).filter(
-            Respuesta.inscripcion_id == inscripcion.id,
-            Respuesta.tipo_formulario == "pre"
-        ).all()
-        
-        for respuesta in respuestas:
-            for detalle in respuesta.detalles:
-                # Obtener información de la pregunta
-                pregunta = db.query(Pregunta).filter(Pregunta.id == detalle.pregunta_id).first()
-                if pregunta:
-                    respuesta_item = {
-                        "pregunta_id": pregunta.id,
-                        "pregunta_texto": pregunta.texto,
-                        "tipo_pregunta": pregunta.tipo
-                    }
-                    
-                    if pregunta.tipo == "textual":
-                        respuesta_item["respuesta_texto"] = detalle.texto_respuesta
-                    else:
-                        # Para selección única o múltiple, obtener texto de la opción
-                        if detalle.opcion_id:
-                            opcion = db.query(Opcion).filter(Opcion.id == detalle.opcion_id).first()
-                            if opcion:
-                                if "opciones_seleccionadas" not in respuesta_item:
-                                    respuesta_item["opciones_seleccionadas"] = []
-                                respuesta_item["opciones_seleccionadas"].append(opcion.texto_opcion)
-                    
-                    # Evitar duplicados para la misma pregunta
-                    pregunta_existente = None
-                    for r in respuestas_pre:
-                        if r["pregunta_id"] == pregunta.id:
-                            pregunta_existente = r
-                            break
-                    
-                    if pregunta_existente:
-                        # Si ya existe y es selección múltiple, agregar la opción
-                        if pregunta.tipo == "seleccion_multiple" and detalle.opcion_id:
-                            opcion = db.query(Opcion).filter(Opcion.id == detalle.opcion_id).first()
-                            if opcion and opcion.texto_opcion not in pregunta_existente.get("opciones_seleccionadas", []):
-                                pregunta_existente["opciones_seleccionadas"].append(opcion.texto_opcion)
-                    else:
-                        respuestas_pre.append(respuesta_item)
-        
-        inscripcion_data["respuestas_pre"] = respuestas_pre
-        result.append(inscripcion_data)
+        respuesta_item = respuestas_pre.get(pregunta_id)
+        if respuesta_item is None:
+            respuesta_item = {
+                "pregunta_id": pregunta_id,
+                "pregunta_texto": pregunta_texto,
+                "tipo_pregunta": tipo
+            }
+            if tipo == "textual":
+                respuesta_item["respuesta_texto"] = texto_respuesta
+            elif opcion is not None:
+                # Para selección única o múltiple, usar el texto de la opción
+                respuesta_item["opciones_seleccionadas"] = [opcion]
+            respuestas_pre[pregunta_id] = respuesta_item
+        elif tipo == "seleccion_multiple" and opcion is not None:
+            # Si ya existe y es selección múltiple, agregar la opción
+            seleccionadas = respuesta_item.setdefault("opciones_seleccionadas", [])
+            if opcion not in seleccionadas:
+                seleccionadas.append(opcion)
     
-    return result
+    inscripcion_data["respuestas_pre"] = list(respuestas_pre.values())
+    return inscripcion_data
 
-def actualizar_estado_inscripcion(db: Session, inscripcion_id: int, aceptado: bool):
+def actualizar_estado_inscripcion(db: Session, inscripcion_id: int, aceptado: bool) -> Optional[Tuple[InscripcionEvento, bool]]:
+    """Devuelve (inscripción, si quedó recién aceptada), o None si no existe"""
     db_inscripcion = db.query(InscripcionEvento).filter(InscripcionEvento.id == inscripcion_id).first()
     if not db_inscripcion:
         return None
     
+    cambio = bool(db_inscripcion.aceptado) != aceptado
+    if cambio:
+        evento_crud.incrementar_contadores(
+            db, db_inscripcion.evento_id, voluntarios_aceptados=1 if aceptado else -1
+        )
     db_inscripcion.aceptado = aceptado
     db.commit()
     db.refresh(db_inscripcion)
-    return db_inscripcion
+    return db_inscripcion, cambio and aceptado
+
+def actualizar_estados_inscripciones(
+    db: Session,
+    aceptado: bool,
+    inscripcion_ids: Optional[List[int]] = None,
+    evento_id: Optional[int] = None,
+    completado_pre: Optional[bool] = None
+) -> Dict[str, Any]:
+    """Acepta o rechaza en bloque las inscripciones que cumplen el filtro.
+
+    Sólo se tocan las que cambian de estado, con un único UPDATE; los
+    contadores de cada evento se ajustan con esas filas en la misma
+    transacción. `aceptadas_ids` son las recién aceptadas, a las que el
+    llamador envía el correo.
+    """
+    if aceptado:
+        cambia = or_(InscripcionEvento.aceptado == False, InscripcionEvento.aceptado.is_(None))
+    else:
+        cambia = InscripcionEvento.aceptado == True
+    filtros = [cambia]
+    if inscripcion_ids is not None:
+        filtros.append(InscripcionEvento.id.in_(inscripcion_ids))
+    if evento_id is not None:
+        filtros.append(InscripcionEvento.evento_id == evento_id)
+    if completado_pre is not None:
+        filtros.append(InscripcionEvento.completado_pre == completado_pre)
+
+    # FOR UPDATE bloquea las filas en MySQL hasta el commit; SQLite ya serializa las escrituras
+    cambios = db.query(InscripcionEvento.id, InscripcionEvento.evento_id).filter(*filtros).with_for_update().all()
+    if not cambios:
+        return {"actualizadas": 0, "por_evento": {}, "aceptadas_ids": []}
+
+    ids = [inscripcion_id for inscripcion_id, _ in cambios]
+    por_evento = Counter(evento for _, evento in cambios)
+    sentencia = update(InscripcionEvento).where(
+        InscripcionEvento.id.in_(ids), cambia
+    ).values(aceptado=aceptado).execution_options(synchronize_session=False)
+    if db.get_bind().dialect.update_returning:
+        # El UPDATE devuelve exactamente las filas que movió, aunque otra transacción haya tocado alguna
+        movidas = db.execute(sentencia.returning(InscripcionEvento.id, InscripcionEvento.evento_id)).all()
+        ids = [inscripcion_id for inscripcion_id, _ in movidas]
+        por_evento = Counter(evento for _, evento in movidas)
+        actualizadas = len(movidas)
+    else:
+        actualizadas = db.execute(sentencia).rowcount
+
+    if actualizadas == len(ids):
+        for evento, cantidad in por_evento.items():
+            evento_crud.incrementar_contadores(db, evento, voluntarios_aceptados=cantidad if aceptado else -cantidad)
+    else:
+        # Otra transacción cambió parte de las filas entre la lectura y el UPDATE: se recuentan los eventos afectados
+        conteos = evento_crud.contar_inscripciones(db, list(por_evento))
+        for evento in por_evento:
+            db.query(Evento).filter(Evento.id == evento).update(
+                {Evento.voluntarios_aceptados: conteos.get(evento, {}).get("voluntarios_aceptados", 0)},
+                synchronize_session=False
+            )
+        # Sin RETURNING (MySQL/MariaDB) sólo quedan las bloqueadas que terminaron en el estado pedido
+        ids = [inscripcion_id for inscripcion_id, in db.query(InscripcionEvento.id).filter(
+            InscripcionEvento.id.in_(ids), InscripcionEvento.aceptado == aceptado
+        )]
+    db.commit()
+
+    return {"actualizadas": actualizadas, "por_evento": dict(por_evento), "aceptadas_ids": ids if aceptado else []}
+
+def aceptar_inscripciones(db: Session, inscripcion_ids: List[int]) -> Dict[str, Any]:
+    resultado = actualizar_estados_inscripciones(db, aceptado=True, inscripcion_ids=inscripcion_ids)
+    return {"aceptadas": resultado["actualizadas"], "aceptadas_ids": resultado["aceptadas_ids"]}
 
 def guardar_respuestas_formulario(db: Session, inscripcion_id: int, tipo_formulario: str, respuestas: Dict[str, Any]):
     db_inscripcion = db.query(InscripcionEvento).filter(InscripcionEvento.id == inscripcion_id).first()
     if not db_inscripcion:
         return None
     
-    # Crear código único para la respuesta
-    codigo_respuesta = str(uuid.uuid4())[:8]
+    resultado = _registrar_respuestas(db, [(db_inscripcion, tipo_formulario, respuestas)])
+    db.commit()
+    return {"codigo_respuesta": resultado[0]["codigo_respuesta"]}
+
+def guardar_respuestas_lote(db: Session, lote: List[RespuestasInscripcion]):
+    # Todas las inscripciones del lote se cargan en una sola consulta
+    inscripcion_ids = {item.inscripcion_id for item in lote}
+    inscripciones = {
+        inscripcion.id: inscripcion
+        for inscripcion in db.query(InscripcionEvento).filter(InscripcionEvento.id.in_(inscripcion_ids)).all()
+    }
     
-    # Crear registro de respuesta
-    db_respuesta = Respuesta(
-        inscripcion_id=inscripcion_id,
-        tipo_formulario=tipo_formulario,
-        codigo_respuesta=codigo_respuesta
-    )
-    db.add(db_respuesta)
-    db.flush()
+    faltantes = sorted(inscripcion_ids - inscripciones.keys())
+    if faltantes:
+        return {"message": f"Inscripciones no encontradas: {faltantes}"}, 404
     
-    # Guardar detalles de respuestas
+    resultado = _registrar_respuestas(
+        db, [(inscripciones[item.inscripcion_id], item.tipo_formulario, item.respuestas) for item in lote]
+    )
+    db.commit()
+    return resultado
+
+def _construir_detalles(respuesta_id: int, respuestas: Dict[str, Any]) -> List[Dict[str, Any]]:
+    detalles = []
     for pregunta_id, respuesta in respuestas.items():
         if isinstance(respuesta, list):  # Selección múltiple
             for opcion_id in respuesta:
-                db_detalle = DetalleRespuesta(
-                    respuesta_id=db_respuesta.id,
-                    pregunta_id=int(pregunta_id),
-                    opcion_id=int(opcion_id)
-                )
-                db.add(db_detalle)
+                detalles.append({
+                    "respuesta_id": respuesta_id,
+                    "pregunta_id": int(pregunta_id),
+                    "opcion_id": int(opcion_id),
+                    "texto_respuesta": None
+                })
         elif isinstance(respuesta, dict) and "opcion_id" in respuesta:  # Selección única
-            db_detalle = DetalleRespuesta(
-                respuesta_id=db_respuesta.id,
-                pregunta_id=int(pregunta_id),
-                opcion_id=int(respuesta["opcion_id"])
-            )
-            db.add(db_detalle)
+            detalles.append({
+                "respuesta_id": respuesta_id,
+                "pregunta_id": int(pregunta_id),
+                "opcion_id": int(respuesta["opcion_id"]),
+                "texto_respuesta": None
+            })
         else:  # Respuesta textual
-            db_detalle = DetalleRespuesta(
-                respuesta_id=db_respuesta.id,
-                pregunta_id=int(pregunta_id),
-                texto_respuesta=str(respuesta)
-            )
-            db.add(db_detalle)
+            detalles.append({
+                "respuesta_id": respuesta_id,
+                "pregunta_id": int(pregunta_id),
+                "opcion_id": None,
+                "texto_respuesta": str(respuesta)
+            })
+    return detalles
+
+def _versiones_respondidas(db: Session, items: List[Tuple[InscripcionEvento, str, Dict[str, Any]]]) -> Dict[Tuple[int, str], Optional[int]]:
+    # Revisión vigente del formulario pre/post de cada evento del lote
+    evento_ids = {db_inscripcion.evento_id for db_inscripcion, _, _ in items}
+    formularios = {
+        evento_id: {"pre": pre, "post": post}
+        for evento_id, pre, post in db.query(
+            Evento.id, Evento.formulario_pre_evento, Evento.formulario_post_evento
+        ).filter(Evento.id.in_(evento_ids))
+    }
+    versiones = formulario_versiones.versiones_actuales(
+        db, {f for tipos in formularios.values() for f in tipos.values() if f}
+    )
+    return {
+        (evento_id, tipo): versiones.get(formulario_id)
+        for evento_id, tipos in formularios.items()
+        for tipo, formulario_id in tipos.items()
+    }
+
+def _registrar_respuestas(db: Session, items: List[Tuple[InscripcionEvento, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    # Crear los registros de respuesta con un código único cada uno;
+    # un único flush los inserta en lote y asigna sus ids
+    versiones = _versiones_respondidas(db, items)
+    db_respuestas = [
+        Respuesta(
+            inscripcion_id=db_inscripcion.id,
+            tipo_formulario=tipo_formulario,
+            codigo_respuesta=str(uuid.uuid4())[:8],
+            formulario_version_id=versiones.get((db_inscripcion.evento_id, tipo_formulario))
+        )
+        for db_inscripcion, tipo_formulario, _ in items
+    ]
+    db.add_all(db_respuestas)
+    db.flush()
     
-    # Actualizar estado de la inscripción
-    if tipo_formulario == "pre":
-        db_inscripcion.completado_pre = True
-    else:
-        db_inscripcion.completado_post = True
+    # Guardar todos los detalles con un único INSERT multi-fila (executemany)
+    detalles = []
+    for db_respuesta, (_, _, respuestas) in zip(db_respuestas, items):
+        detalles.extend(_construir_detalles(db_respuesta.id, respuestas))
+    if detalles:
+        db.execute(insert(DetalleRespuesta.__table__), detalles)
     
-    db.commit()
-    return {"codigo_respuesta": codigo_respuesta} 
\ No newline at end of file
+    # Actualizar estado de las inscripciones y los contadores de cada evento
+    deltas: Dict[int, Dict[str, int]] = {}
+    for db_inscripcion, tipo_formulario, _ in items:
+        contadores = deltas.setdefault(db_inscripcion.evento_id, {})
+        recibidas = "respuestas_pre" if tipo_formulario == "pre" else "respuestas_post"
+        contadores[recibidas] = contadores.get(recibidas, 0) + 1
+        completado = "completado_pre" if tipo_formulario == "pre" else "completado_post"
+        if not getattr(db_inscripcion, completado):
+            contador = "completados_pre" if tipo_formulario == "pre" else "completados_post"
+            contadores[contador] = contadores.get(contador, 0) + 1
+            setattr(db_inscripcion, completado, True)
+    for evento_id, contadores in deltas.items():
+        evento_crud.incrementar_contadores(db, evento_id, **contadores)
+    
+    return [
+        {
+            "inscripcion_id": db_inscripcion.id,
+            "tipo_formulario": tipo_formulario,
+            "codigo_respuesta": db_respuesta.codigo_respuesta
+        }
+        for db_respuesta, (db_inscripcion, tipo_formulario, _) in zip(db_respuestas, items)
+    ]
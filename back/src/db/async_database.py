@@ -0,0 +1,54 @@
+import os
+from functools import lru_cache
+from typing import AsyncIterator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src.db.database import DATABASE_URL, get_engine_options, configurar_sqlite, env_bool
+
+# Modo asíncrono: los routers de src/endpoints/aio reemplazan a los síncronos
+DB_ASYNC = env_bool("DB_ASYNC", False)
+
+# Drivers asíncronos equivalentes a los síncronos configurados en DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+    "mariadb": "mariadb+aiomysql",
+}
+
+def get_async_url(database_url: str) -> str:
+    """Traduce la URL síncrona de la base de datos a su driver asíncrono"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No hay driver asíncrono configurado para '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or get_async_url(DATABASE_URL)
+
+@lru_cache(maxsize=None)
+def get_async_engine(database_url: str = ASYNC_DATABASE_URL) -> AsyncEngine:
+    # Se crea bajo demanda para no exigir los drivers asíncronos en modo síncrono
+    opciones = get_engine_options(database_url)
+    if "pool_size" in opciones:
+        # aiosqlite usa NullPool por defecto; se usa el mismo pool configurable
+        opciones["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(database_url, **opciones)
+    configurar_sqlite(engine.sync_engine)
+    return engine
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker(database_url: str = ASYNC_DATABASE_URL) -> async_sessionmaker:
+    # expire_on_commit=False: los objetos siguen legibles tras el commit sin E/S implícita
+    return async_sessionmaker(
+        bind=get_async_engine(database_url),
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_sessionmaker()() as db:
+        yield db
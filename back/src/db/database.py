@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, Enum, Boolean, create_engine
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, Enum, Boolean, Index, UniqueConstraint, DDL, create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 import os
@@ -7,7 +8,57 @@ from datetime import datetime
 # Use SQLite for testing
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./go_baby_go.db")
 
-engine = create_engine(DATABASE_URL)
+def env_bool(nombre: str, por_defecto: bool) -> bool:
+    valor = os.getenv(nombre)
+    if valor is None:
+        return por_defecto
+    return valor.strip().lower() in ("1", "true", "yes", "si", "on")
+
+def env_int(nombre: str, por_defecto: int) -> int:
+    valor = os.getenv(nombre)
+    return int(valor) if valor else por_defecto
+
+def get_engine_options(database_url: str) -> dict:
+    """Opciones del pool de conexiones según el dialecto, configurables por variables de entorno"""
+    url = make_url(database_url)
+    opciones = {"pool_pre_ping": env_bool("DB_POOL_PRE_PING", True)}
+    
+    if url.get_backend_name() == "sqlite":
+        # La sesión puede usarse desde distintos hilos del threadpool de FastAPI
+        opciones["connect_args"] = {"check_same_thread": False}
+        if not url.database or url.database == ":memory:":
+            # SQLite en memoria usa su propio pool de un único hilo
+            return opciones
+        # Recycle desactivado por defecto: SQLite no cierra conexiones inactivas
+        por_defecto = {"pool_size": 5, "max_overflow": 10, "pool_recycle": -1, "pool_timeout": 30}
+    else:
+        # MariaDB/MySQL cierran conexiones inactivas tras wait_timeout;
+        # se reciclan antes para no entregar conexiones muertas
+        por_defecto = {"pool_size": 10, "max_overflow": 20, "pool_recycle": 280, "pool_timeout": 30}
+    
+    opciones.update(
+        pool_size=env_int("DB_POOL_SIZE", por_defecto["pool_size"]),
+        max_overflow=env_int("DB_MAX_OVERFLOW", por_defecto["max_overflow"]),
+        pool_recycle=env_int("DB_POOL_RECYCLE", por_defecto["pool_recycle"]),
+        pool_timeout=env_int("DB_POOL_TIMEOUT", por_defecto["pool_timeout"]),
+    )
+    return opciones
+
+def configurar_sqlite(engine) -> None:
+    """Activa el modo WAL en SQLite para permitir lecturas concurrentes con una escritura"""
+    if engine.dialect.name != "sqlite" or not env_bool("SQLITE_WAL", True):
+        return
+    
+    @event.listens_for(engine, "connect")
+    def _activar_wal(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={env_int('SQLITE_BUSY_TIMEOUT', 5000)}")
+        cursor.close()
+
+engine = create_engine(DATABASE_URL, **get_engine_options(DATABASE_URL))
+configurar_sqlite(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -25,17 +76,23 @@ class Administrador(Base):
     nombre = Column(String(255), nullable=False)
     correo = Column(String(255), nullable=False, unique=True)
     contrasena_hash = Column(String(255), nullable=False)
+    # Se incrementa al cambiar la contraseña; revoca los tokens emitidos antes
+    token_version = Column(Integer, nullable=False, default=1, server_default="1")
     
     # Relationships
     password_reset_tokens = relationship("PasswordResetToken", back_populates="admin")
 
 class PasswordResetToken(Base):
     __tablename__ = "password_reset_tokens"
+    __table_args__ = (
+        # Validación de tokens: token vigente y no usado
+        Index("idx_token_valid", "token", "expires_at", "used"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    admin_id = Column(Integer, ForeignKey("administradores.id"), nullable=False)
+    admin_id = Column(Integer, ForeignKey("administradores.id"), nullable=False, index=True)
     token = Column(String(255), nullable=False, unique=True)
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
     used = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.now)
     
@@ -48,31 +105,57 @@ class Formulario(Base):
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String(255), nullable=False)
     fecha_creacion = Column(DateTime, default=datetime.now)
+    # Se incrementa con cada modificación; identifica la versión cacheada
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     # Relationships
-    preguntas = relationship("Pregunta", back_populates="formulario", cascade="all, delete-orphan")
+    preguntas = relationship(
+        "Pregunta", back_populates="formulario", cascade="all, delete-orphan",
+        order_by="(Pregunta.orden, Pregunta.id)"
+    )
     eventos_pre = relationship("Evento", foreign_keys="Evento.formulario_pre_evento", back_populates="formulario_pre")
     eventos_post = relationship("Evento", foreign_keys="Evento.formulario_post_evento", back_populates="formulario_post")
 
+class FormularioVersion(Base):
+    __tablename__ = "formulario_versiones"
+    __table_args__ = (
+        UniqueConstraint("formulario_id", "version", name="uq_formulario_version"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    formulario_id = Column(Integer, ForeignKey("formularios.id"), nullable=False)
+    version = Column(Integer, nullable=False)
+    # Preguntas y opciones de esa revisión en JSON compacto; no se modifica nunca
+    contenido = Column(Text, nullable=False)
+    fecha_creacion = Column(DateTime, default=datetime.now)
+
 class Pregunta(Base):
     __tablename__ = "preguntas"
     
     id = Column(Integer, primary_key=True, index=True)
-    formulario_id = Column(Integer, ForeignKey("formularios.id"), nullable=False)
+    formulario_id = Column(Integer, ForeignKey("formularios.id"), nullable=False, index=True)
     texto = Column(Text, nullable=False)
     tipo = Column(Enum("textual", "seleccion_multiple", "seleccion_unica"), nullable=False)
+    orden = Column(Integer, nullable=False, default=0, server_default="0")
+    # Las preguntas con respuestas no se borran al editar el formulario: se retiran
+    activa = Column(Boolean, nullable=False, default=True, server_default="1")
     
     # Relationships
     formulario = relationship("Formulario", back_populates="preguntas")
-    opciones = relationship("Opcion", back_populates="pregunta", cascade="all, delete-orphan")
+    opciones = relationship(
+        "Opcion", back_populates="pregunta", cascade="all, delete-orphan",
+        order_by="(Opcion.orden, Opcion.id)"
+    )
     detalles_respuestas = relationship("DetalleRespuesta", back_populates="pregunta")
 
 class Opcion(Base):
     __tablename__ = "opciones"
     
     id = Column(Integer, primary_key=True, index=True)
-    pregunta_id = Column(Integer, ForeignKey("preguntas.id"), nullable=False)
+    pregunta_id = Column(Integer, ForeignKey("preguntas.id"), nullable=False, index=True)
     texto_opcion = Column(String(255), nullable=False)
+    orden = Column(Integer, nullable=False, default=0, server_default="0")
+    activa = Column(Boolean, nullable=False, default=True, server_default="1")
     
     # Relationships
     pregunta = relationship("Pregunta", back_populates="opciones")
@@ -89,18 +172,32 @@ class Evento(Base):
     descripcion = Column(Text)
     formulario_pre_evento = Column(Integer, ForeignKey("formularios.id"))
     formulario_post_evento = Column(Integer, ForeignKey("formularios.id"))
+    # Se incrementa con cada modificación; forma parte del ETag de los eventos
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
+    # Contadores materializados, actualizados con cada inscripción
+    total_voluntarios = Column(Integer, nullable=False, default=0, server_default="0")
+    voluntarios_aceptados = Column(Integer, nullable=False, default=0, server_default="0")
+    completados_pre = Column(Integer, nullable=False, default=0, server_default="0")
+    completados_post = Column(Integer, nullable=False, default=0, server_default="0")
+    # Respuestas recibidas por formulario (incluye reenvíos); invalidan la caché de analítica
+    respuestas_pre = Column(Integer, nullable=False, default=0, server_default="0")
+    respuestas_post = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     formulario_pre = relationship("Formulario", foreign_keys=[formulario_pre_evento], back_populates="eventos_pre")
     formulario_post = relationship("Formulario", foreign_keys=[formulario_post_evento], back_populates="eventos_post")
     inscripciones = relationship("InscripcionEvento", back_populates="evento")
 
+CONTADORES_EVENTO = ("total_voluntarios", "voluntarios_aceptados", "completados_pre", "completados_post")
+
 class Voluntario(Base):
     __tablename__ = "voluntarios"
     
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String(255), nullable=False)
-    correo = Column(String(255), nullable=False)
+    # Un voluntario por correo; la inscripción lo busca en cada registro
+    correo = Column(String(255), nullable=False, unique=True)
     confirmacion_correo = Column(String(255), nullable=False)
     numero_identificacion = Column(String(100), nullable=False)
     
@@ -109,6 +206,12 @@ class Voluntario(Base):
 
 class InscripcionEvento(Base):
     __tablename__ = "inscripciones_eventos"
+    __table_args__ = (
+        # Una inscripción por voluntario y evento, garantizado por la base de datos
+        UniqueConstraint("voluntario_id", "evento_id", name="uq_inscripcion_voluntario_evento"),
+        # Listados y paginación por cursor de las inscripciones de un evento
+        Index("idx_inscripciones_evento", "evento_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     voluntario_id = Column(Integer, ForeignKey("voluntarios.id"), nullable=False)
@@ -126,12 +229,17 @@ class InscripcionEvento(Base):
 
 class Respuesta(Base):
     __tablename__ = "respuestas"
+    __table_args__ = (
+        Index("idx_respuestas_inscripcion_tipo", "inscripcion_id", "tipo_formulario"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     inscripcion_id = Column(Integer, ForeignKey("inscripciones_eventos.id"), nullable=False)
     fecha_respuesta = Column(DateTime, default=datetime.now)
     tipo_formulario = Column(Enum("pre", "post"), nullable=False)
     codigo_respuesta = Column(String(25))
+    # Revisión del formulario que se respondió; NULL en respuestas anteriores a las versiones
+    formulario_version_id = Column(Integer, ForeignKey("formulario_versiones.id"), index=True)
     
     # Relationships
     inscripcion = relationship("InscripcionEvento", back_populates="respuestas")
@@ -141,7 +249,7 @@ class DetalleRespuesta(Base):
     __tablename__ = "detalle_respuestas"
     
     id = Column(Integer, primary_key=True, index=True)
-    respuesta_id = Column(Integer, ForeignKey("respuestas.id"), nullable=False)
+    respuesta_id = Column(Integer, ForeignKey("respuestas.id"), nullable=False, index=True)
     pregunta_id = Column(Integer, ForeignKey("preguntas.id"), nullable=False)
     texto_respuesta = Column(Text)
     opcion_id = Column(Integer, ForeignKey("opciones.id"))
@@ -157,4 +265,78 @@ class TerminosCondiciones(Base):
     id = Column(Integer, primary_key=True, index=True)
     version = Column(String(50))
     texto = Column(Text)
-    fecha_creacion = Column(DateTime, default=datetime.now) 
\ No newline at end of file
+    fecha_creacion = Column(DateTime, default=datetime.now)
+
+# Búsqueda de texto completo: FTS5 en SQLite y FULLTEXT en MariaDB/MySQL.
+# Las tablas FTS5 son de contenido externo (sólo guardan el índice) y se
+# mantienen con triggers, así que cualquier escritura (ORM, executemany o SQL
+# directo) queda indexada en la misma transacción. InnoDB mantiene los índices
+# FULLTEXT por su cuenta.
+TABLAS_FTS = {"voluntarios": "voluntarios_fts", "detalle_respuestas": "detalle_respuestas_fts"}
+
+DDL_BUSQUEDA_SQLITE = {
+    "voluntarios": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS voluntarios_fts USING fts5("
+        "nombre, correo, numero_identificacion, content='voluntarios', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER IF NOT EXISTS voluntarios_fts_ai AFTER INSERT ON voluntarios BEGIN "
+        "INSERT INTO voluntarios_fts(rowid, nombre, correo, numero_identificacion) "
+        "VALUES (new.id, new.nombre, new.correo, new.numero_identificacion); END",
+        "CREATE TRIGGER IF NOT EXISTS voluntarios_fts_ad AFTER DELETE ON voluntarios BEGIN "
+        "INSERT INTO voluntarios_fts(voluntarios_fts, rowid, nombre, correo, numero_identificacion) "
+        "VALUES ('delete', old.id, old.nombre, old.correo, old.numero_identificacion); END",
+        "CREATE TRIGGER IF NOT EXISTS voluntarios_fts_au AFTER UPDATE OF nombre, correo, numero_identificacion "
+        "ON voluntarios BEGIN "
+        "INSERT INTO voluntarios_fts(voluntarios_fts, rowid, nombre, correo, numero_identificacion) "
+        "VALUES ('delete', old.id, old.nombre, old.correo, old.numero_identificacion); "
+        "INSERT INTO voluntarios_fts(rowid, nombre, correo, numero_identificacion) "
+        "VALUES (new.id, new.nombre, new.correo, new.numero_identificacion); END",
+    ],
+    # Sólo las respuestas textuales entran al índice
+    "detalle_respuestas": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS detalle_respuestas_fts USING fts5("
+        "texto_respuesta, content='detalle_respuestas', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS detalle_respuestas_fts_ai AFTER INSERT ON detalle_respuestas "
+        "WHEN new.texto_respuesta IS NOT NULL BEGIN "
+        "INSERT INTO detalle_respuestas_fts(rowid, texto_respuesta) VALUES (new.id, new.texto_respuesta); END",
+        "CREATE TRIGGER IF NOT EXISTS detalle_respuestas_fts_ad AFTER DELETE ON detalle_respuestas "
+        "WHEN old.texto_respuesta IS NOT NULL BEGIN "
+        "INSERT INTO detalle_respuestas_fts(detalle_respuestas_fts, rowid, texto_respuesta) "
+        "VALUES ('delete', old.id, old.texto_respuesta); END",
+        "CREATE TRIGGER IF NOT EXISTS detalle_respuestas_fts_au AFTER UPDATE OF texto_respuesta "
+        "ON detalle_respuestas BEGIN "
+        "INSERT INTO detalle_respuestas_fts(detalle_respuestas_fts, rowid, texto_respuesta) "
+        "SELECT 'delete', old.id, old.texto_respuesta WHERE old.texto_respuesta IS NOT NULL; "
+        "INSERT INTO detalle_respuestas_fts(rowid, texto_respuesta) "
+        "SELECT new.id, new.texto_respuesta WHERE new.texto_respuesta IS NOT NULL; END",
+    ],
+}
+
+DDL_BUSQUEDA_MYSQL = {
+    "voluntarios": ["ALTER TABLE voluntarios ADD FULLTEXT INDEX ft_voluntarios (nombre, correo, numero_identificacion)"],
+    "detalle_respuestas": ["ALTER TABLE detalle_respuestas ADD FULLTEXT INDEX ft_detalle_respuestas (texto_respuesta)"],
+}
+
+for _tabla in (Voluntario.__table__, DetalleRespuesta.__table__):
+    for _sentencia in DDL_BUSQUEDA_SQLITE[_tabla.name]:
+        event.listen(_tabla, "after_create", DDL(_sentencia).execute_if(dialect="sqlite"))
+    event.listen(_tabla, "before_drop", DDL(f"DROP TABLE IF EXISTS {TABLAS_FTS[_tabla.name]}").execute_if(dialect="sqlite"))
+    for _sentencia in DDL_BUSQUEDA_MYSQL[_tabla.name]:
+        event.listen(_tabla, "after_create", DDL(_sentencia).execute_if(dialect=("mysql", "mariadb")))
+
+def crear_indices_busqueda(engine) -> None:
+    """Crea los índices FTS5 que falten en una base SQLite existente y los llena con los datos actuales"""
+    # En MariaDB/MySQL los índices FULLTEXT se agregan con busqueda_migration.sql
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conexion:
+        existentes = {
+            nombre for (nombre,) in conexion.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        for tabla, fts in TABLAS_FTS.items():
+            if tabla not in existentes or fts in existentes:
+                continue
+            for sentencia in DDL_BUSQUEDA_SQLITE[tabla]:
+                conexion.exec_driver_sql(sentencia)
+            conexion.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
@@ -1,19 +1,111 @@
-import mysql.connector
-from src.db.db_config import DB_CONFIG
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Iterator, Optional, Sequence
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.db.database import engine as engine_principal
 
 
 class Database:
-    def __init__(self) -> None:
-        self.conn = None
+    """Acceso SQL directo para las rutas donde el costo del ORM importa.
+
+    Las conexiones salen del pool del engine de SQLAlchemy (el mismo que usan
+    las sesiones), así que no se abre una conexión por llamada ni se mantiene
+    un segundo pool contra el servidor. Las consultas se escriben con `?` y se
+    adaptan al estilo de parámetros del driver; nunca se interpolan valores.
+    Creado con `de_sesion`, trabaja sobre la conexión de la sesión y dentro de
+    su transacción, que confirma o revierte la propia sesión.
+    Con mysql-connector (mysql+mysqlconnector://) los cursores son preparados
+    en el servidor; sqlite3 guarda en caché las sentencias ya compiladas.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, conexion: Optional[Any] = None) -> None:
+        self.engine = engine or engine_principal
+        self._conexion = conexion
+        self._formato = self.engine.dialect.paramstyle != "qmark"
+        self._preparadas = self.engine.dialect.driver == "mysqlconnector"
+        self._sqlite = self.engine.dialect.name == "sqlite"
+
+    @classmethod
+    def de_sesion(cls, db: Session) -> "Database":
+        # La conexión que ya tiene la sesión (p. ej. la del engine de pruebas): no se toma otra del pool
+        conexion = db.connection()
+        return cls(conexion.engine, conexion=conexion.connection)
+
+    def sql(self, consulta: str) -> str:
+        return consulta.replace("?", "%s") if self._formato else consulta
+
+    def _adaptar(self, parametros: Sequence[Any]) -> Sequence[Any]:
+        # sqlite3 ya no adapta fechas por defecto; se guardan como texto ISO, igual que el tipo Date del ORM
+        if not self._sqlite:
+            return parametros
+        return tuple(valor.isoformat() if isinstance(valor, date) else valor for valor in parametros)
+
+    def _abrir_cursor(self, conexion: Any, streaming: bool) -> Any:
+        if self._preparadas:
+            return conexion.cursor(prepared=True)
+        if streaming and self.engine.dialect.driver == "pymysql":
+            # El cursor por defecto de PyMySQL descarga todo el resultado al ejecutar
+            from pymysql.cursors import SSCursor
+            return conexion.cursor(SSCursor)
+        return conexion.cursor()
+
+    @contextmanager
+    def cursor(self, streaming: bool = False) -> Iterator[Any]:
+        """Cursor sobre una conexión del pool; confirma al salir o revierte si hubo error"""
+        if self._conexion is not None:
+            cursor = self._abrir_cursor(self._conexion, streaming)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+        conexion = self.engine.raw_connection()
+        try:
+            cursor = self._abrir_cursor(conexion, streaming)
+            try:
+                yield cursor
+                conexion.commit()
+            except Exception:
+                conexion.rollback()
+                raise
+            finally:
+                cursor.close()
+        finally:
+            # Devuelve la conexión al pool
+            conexion.close()
+
+    def ejecutar(self, consulta: str, parametros: Sequence[Any] = ()) -> Any:
+        """Ejecuta una sentencia y devuelve (filas afectadas, último id insertado)"""
+        with self.cursor() as cursor:
+            cursor.execute(self.sql(consulta), self._adaptar(parametros))
+            return cursor.rowcount, cursor.lastrowid
+
+    def ejecutar_lote(self, consulta: str, parametros: Sequence[Sequence[Any]]) -> int:
+        """Ejecuta la misma sentencia para cada juego de parámetros con executemany"""
+        if not parametros:
+            return 0
+        with self.cursor() as cursor:
+            cursor.executemany(self.sql(consulta), [self._adaptar(fila) for fila in parametros])
+            return cursor.rowcount
+
+    def consultar(self, consulta: str, parametros: Sequence[Any] = ()) -> list:
+        with self.cursor() as cursor:
+            cursor.execute(self.sql(consulta), self._adaptar(parametros))
+            return cursor.fetchall()
 
-    def connect(self):
-        self.conn = mysql.connector.connect(**DB_CONFIG)
+    def iterar(self, consulta: str, parametros: Sequence[Any] = (), tamano: int = 500) -> Iterator[tuple]:
+        """Recorre el resultado por bloques de `tamano` filas sin cargarlo completo"""
+        with self.cursor(streaming=True) as cursor:
+            cursor.execute(self.sql(consulta), self._adaptar(parametros))
+            while True:
+                filas = cursor.fetchmany(tamano)
+                if not filas:
+                    return
+                yield from filas
 
-    def get_connection(self):
-        if not self.conn or not self.conn.is_connected():
-            self.connect()
-        return self.conn
 
-    def close(self):
-        if self.conn and self.conn.is_connected():
-                self.conn.close()
+# Instancia compartida sobre el engine principal
+database = Database()
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Union
+
+from src.db.async_database import get_async_db
+from src.schemas.EventoSchema import EventoOut, EventoEstadisticasOut, AnaliticaFormularioOut
+from src.crud.aio import evento_crud
+from src.core.paginacion import leer_cursor, pagina
+from src.schemas.PaginacionSchema import Pagina
+from src.core.http_cache import calcular_etag, respuesta_condicional, aplicar_cabeceras
+
+# Lecturas de eventos sobre AsyncSession. Se registran antes que
+# src/endpoints/evento_router.py cuando DB_ASYNC está activo; las escrituras
+# siguen atendidas por el router síncrono.
+router = APIRouter(
+    prefix="/api/eventos",
+    tags=["eventos"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.get("/", response_model=Union[List[EventoOut], Pagina[EventoOut]])
+async def obtener_eventos(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    despues_de_id = leer_cursor(cursor) if cursor is not None else None
+    etag = calcular_etag(cursor, await evento_crud.get_eventos_versiones(
+        db, skip=skip, limit=limit, despues_de_id=despues_de_id
+    ))
+    no_modificado = respuesta_condicional(request, etag, "eventos")
+    if no_modificado:
+        return no_modificado
+    
+    aplicar_cabeceras(response, etag, "eventos")
+    eventos = await evento_crud.get_eventos(db, skip=skip, limit=limit, despues_de_id=despues_de_id)
+    if cursor is not None:
+        return pagina(eventos, limit)
+    return eventos
+
+@router.get("/stats", response_model=List[EventoEstadisticasOut])
+async def obtener_eventos_con_estadisticas(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    return await evento_crud.get_eventos_with_stats(db, skip=skip, limit=limit)
+
+@router.get("/{evento_id}", response_model=EventoOut)
+async def obtener_evento(evento_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    version = await evento_crud.get_evento_version(db, evento_id=evento_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Evento no encontrado")
+    etag = calcular_etag(version)
+    no_modificado = respuesta_condicional(request, etag, "eventos")
+    if no_modificado:
+        return no_modificado
+    
+    aplicar_cabeceras(response, etag, "eventos")
+    db_evento = await evento_crud.get_evento(db, evento_id=evento_id)
+    if db_evento is None:
+        raise HTTPException(status_code=404, detail="Evento no encontrado")
+    return db_evento
+
+@router.get("/{evento_id}/analitica/{tipo_formulario}", response_model=AnaliticaFormularioOut)
+async def obtener_analitica_formulario(
+    evento_id: int,
+    tipo_formulario: Literal["pre", "post"],
+    db: AsyncSession = Depends(get_async_db)
+):
+    analitica = await evento_crud.get_analitica_formulario(db, evento_id=evento_id, tipo_formulario=tipo_formulario)
+    if analitica is None:
+        raise HTTPException(status_code=404, detail=f"Evento no encontrado o sin formulario {tipo_formulario}")
+    return analitica
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from src.db.async_database import get_async_db
+from src.schemas.FormularioSchema import FormularioOut
+from src.crud.aio import formulario_crud
+from src.core.paginacion import leer_cursor, pagina
+from src.schemas.PaginacionSchema import Pagina
+from src.core.http_cache import calcular_etag, respuesta_condicional, aplicar_cabeceras
+
+# Lecturas de formularios sobre AsyncSession (ver src/endpoints/aio/evento_router.py)
+router = APIRouter(
+    prefix="/api/formularios",
+    tags=["formularios"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.get("/", response_model=Union[List[FormularioOut], Pagina[FormularioOut]])
+async def obtener_formularios(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    despues_de_id = leer_cursor(cursor) if cursor is not None else None
+    formularios = await formulario_crud.get_formularios(db, skip=skip, limit=limit, despues_de_id=despues_de_id)
+    if cursor is not None:
+        return pagina(formularios, limit)
+    return formularios
+
+@router.get("/{formulario_id}", response_model=FormularioOut)
+async def obtener_formulario(formulario_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    version = await formulario_crud.get_formulario_version(db, formulario_id=formulario_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Formulario no encontrado")
+    etag = calcular_etag("formulario", formulario_id, version)
+    no_modificado = respuesta_condicional(request, etag, "formularios")
+    if no_modificado:
+        return no_modificado
+    
+    contenido = await formulario_crud.get_formulario_json(db, formulario_id=formulario_id, version=version)
+    if contenido is None:
+        raise HTTPException(status_code=404, detail="Formulario no encontrado")
+    response = Response(content=contenido, media_type="application/json")
+    aplicar_cabeceras(response, etag, "formularios")
+    return response
@@ -0,0 +1,158 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Any, Optional, Union
+
+from src.db.async_database import get_async_db
+from src.schemas.VoluntarioSchema import VoluntarioOut, VoluntarioInscripcion, VoluntarioBusquedaOut, RespuestaBusquedaOut
+from src.crud.aio import voluntario_crud
+from src.core.paginacion import leer_cursor, pagina
+from src.services.cola_inscripciones import cola_inscripciones, PENDIENTE
+from src.schemas.PaginacionSchema import Pagina
+from src.endpoints.voluntario_router import ActualizarEstadoInscripcion, ActualizarEstadoInscripciones, AceptarInscripcionesLote
+
+# Voluntarios e inscripciones sobre AsyncSession (ver src/endpoints/aio/evento_router.py)
+router = APIRouter(
+    prefix="/api/voluntarios",
+    tags=["voluntarios"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.get("/", response_model=Union[List[VoluntarioOut], Pagina[VoluntarioOut]])
+async def obtener_voluntarios(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    despues_de_id = leer_cursor(cursor) if cursor is not None else None
+    voluntarios = await voluntario_crud.get_voluntarios(db, skip=skip, limit=limit, despues_de_id=despues_de_id)
+    if cursor is not None:
+        return pagina(voluntarios, limit)
+    return voluntarios
+
+@router.get("/buscar", response_model=List[VoluntarioBusquedaOut])
+async def buscar_voluntarios(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await voluntario_crud.buscar_voluntarios(db, q, skip=skip, limit=limit)
+
+@router.get("/respuestas/buscar", response_model=List[RespuestaBusquedaOut])
+async def buscar_respuestas(
+    q: str = Query(..., min_length=1, max_length=200),
+    evento_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await voluntario_crud.buscar_respuestas(db, q, evento_id=evento_id, skip=skip, limit=limit)
+
+@router.get("/{voluntario_id}", response_model=VoluntarioOut)
+async def obtener_voluntario(voluntario_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_voluntario = await voluntario_crud.get_voluntario(db, voluntario_id=voluntario_id)
+    if db_voluntario is None:
+        raise HTTPException(status_code=404, detail="Voluntario no encontrado")
+    return db_voluntario
+
+@router.post("/inscripcion/", status_code=status.HTTP_201_CREATED)
+async def inscribir_voluntario(inscripcion: VoluntarioInscripcion, db: AsyncSession = Depends(get_async_db)):
+    if cola_inscripciones.activa:
+        # Modo diferido: la inscripción se guarda en el diario local y se
+        # registra en lote; el cliente consulta el resultado con el id de seguimiento
+        id_seguimiento = await run_in_threadpool(cola_inscripciones.encolar, inscripcion)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"id_seguimiento": id_seguimiento, "estado": PENDIENTE}
+        )
+    
+    result = await voluntario_crud.inscribir_voluntario(db=db, inscripcion=inscripcion)
+    
+    # Si hay un error, devolver el mensaje
+    if isinstance(result, tuple) and len(result) == 2:
+        message, status_code = result
+        raise HTTPException(status_code=status_code, detail=message["message"])
+        
+    return result
+
+@router.get("/inscripciones/evento/{evento_id}")
+async def obtener_inscripciones_por_evento(
+    evento_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    despues_de_id = leer_cursor(cursor) if cursor is not None else None
+    inscripciones = await voluntario_crud.get_inscripciones_by_evento(
+        db, evento_id=evento_id, skip=skip, limit=limit, despues_de_id=despues_de_id
+    )
+    if cursor is not None:
+        return pagina(inscripciones, limit, get_id=lambda inscripcion: inscripcion["id"])
+    return inscripciones
+
+@router.get("/inscripciones/evento/{evento_id}/detalladas")
+async def obtener_inscripciones_detalladas(
+    evento_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    despues_de_id = leer_cursor(cursor) if cursor is not None else None
+    inscripciones = await voluntario_crud.get_inscripciones_detalladas_by_evento(
+        db, evento_id=evento_id, skip=skip, limit=limit, despues_de_id=despues_de_id
+    )
+    if cursor is not None:
+        return pagina(inscripciones, limit, get_id=lambda inscripcion: inscripcion["id"])
+    return inscripciones
+
+@router.put("/inscripciones/{inscripcion_id}/aceptar")
+async def aceptar_inscripcion(
+    inscripcion_id: int, 
+    datos: ActualizarEstadoInscripcion, 
+    db: AsyncSession = Depends(get_async_db)
+):
+    resultado = await voluntario_crud.actualizar_estado_inscripcion(
+        db, inscripcion_id=inscripcion_id, aceptado=datos.aceptado
+    )
+    if resultado is None:
+        raise HTTPException(status_code=404, detail="Inscripción no encontrada")
+    db_inscripcion, recien_aceptada = resultado
+    if recien_aceptada:
+        await voluntario_crud.notificar_aceptaciones(db, [inscripcion_id])
+    return db_inscripcion
+
+async def _notificar_aceptadas(db: AsyncSession, resultado: Dict[str, Any]) -> Dict[str, Any]:
+    resultado["notificaciones"] = await voluntario_crud.notificar_aceptaciones(db, resultado.pop("aceptadas_ids"))
+    return resultado
+
+@router.put("/inscripciones/aceptar")
+async def aceptar_inscripciones(datos: AceptarInscripcionesLote, db: AsyncSession = Depends(get_async_db)):
+    return await _notificar_aceptadas(db, await voluntario_crud.aceptar_inscripciones(db, inscripcion_ids=datos.inscripcion_ids))
+
+@router.put("/inscripciones/estado")
+async def actualizar_estados_inscripciones(datos: ActualizarEstadoInscripciones, db: AsyncSession = Depends(get_async_db)):
+    return await _notificar_aceptadas(
+        db, await voluntario_crud.actualizar_estados_inscripciones(db, aceptado=datos.aceptado, **datos.filtros())
+    )
+
+@router.post("/inscripciones/{inscripcion_id}/respuestas/{tipo_formulario}")
+async def guardar_respuestas(
+    inscripcion_id: int, 
+    tipo_formulario: str,
+    respuestas: Dict[str, Any],
+    db: AsyncSession = Depends(get_async_db)
+):
+    if tipo_formulario not in ["pre", "post"]:
+        raise HTTPException(
+            status_code=400, 
+            detail="El tipo de formulario debe ser 'pre' o 'post'"
+        )
+        
+    result = await voluntario_crud.guardar_respuestas_formulario(
+        db, inscripcion_id=inscripcion_id, tipo_formulario=tipo_formulario, respuestas=respuestas
+    )
+    
+    if result is None:
+        raise HTTPException(status_code=404, detail="Inscripción no encontrada")
+        
+    return result
@@ -12,7 +12,8 @@ from src.schemas.PasswordResetSchema import (
     TokenValidationResponse
 )
 from src.crud import administrador_crud
-from src.core.auth import create_access_token
+from src.core.auth import create_access_token, claims_administrador
+from src.core.tareas import gestor_tareas
 from src.services.password_reset_service import password_reset_service
 
 router = APIRouter(
@@ -32,8 +33,8 @@ def register(admin: AdministradorCreate, db: Session = Depends(get_db)):
     return administrador_crud.create_administrador(db=db, administrador=admin)
 
 @router.post("/login", response_model=AdministradorWithToken)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    admin = administrador_crud.authenticate_administrador(
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    admin = await administrador_crud.authenticate_administrador_async(
         db, email=form_data.username, password=form_data.password
     )
     if not admin:
@@ -44,7 +45,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
         )
     
     # Create access token
-    access_token = create_access_token(data={"sub": admin.correo})
+    access_token = create_access_token(data=claims_administrador(admin))
     
     return {
         "id": admin.id,
@@ -64,14 +65,13 @@ def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db
             # Generar token de recuperación
             reset_token = password_reset_service.create_reset_token(db, admin)
             
-            # Enviar correo
-            email_sent = password_reset_service.send_reset_email(admin, reset_token.token)
-            
-            if not email_sent:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Error al enviar el correo de recuperación"
-                )
+            # El correo se envía en segundo plano, con reintentos
+            gestor_tareas.encolar(
+                "correo_recuperacion",
+                password_reset_service.enviar_correo_recuperacion,
+                admin.correo, admin.nombre, reset_token.token,
+                max_intentos=5
+            )
         
         # Por seguridad, siempre devolvemos el mismo mensaje
         return ForgotPasswordResponse(
@@ -125,9 +125,7 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
                 detail="Token inválido, expirado o ya utilizado"
             )
         
-        # Limpiar tokens expirados
-        password_reset_service.cleanup_expired_tokens(db)
-        
+        # Los tokens expirados se limpian periódicamente (ver src/main.py)
         return ResetPasswordResponse(
             message="Contraseña restablecida exitosamente",
             success=True
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Literal, Optional, Union
 
 from src.db.database import get_db
-from src.schemas.EventoSchema import EventoCreate, EventoOut, EventoUpdate, EventoWithVoluntariosOut
+from src.schemas.EventoSchema import EventoCreate, EventoOut, EventoUpdate, EventoWithVoluntariosOut, EventoEstadisticasOut, AnaliticaFormularioOut
 from src.crud import evento_crud
+from src.crud.event import get_event
+from src.db.db_connection import Database
+from src.core.paginacion import leer_cursor, pagina
+from src.schemas.PaginacionSchema import Pagina
+from src.core.http_cache import calcular_etag, respuesta_condicional, aplicar_cabeceras
+from src.services.analitica_service import analitica_service
 
 router = APIRouter(
     prefix="/api/eventos",
@@ -16,22 +22,61 @@ router = APIRouter(
 def crear_evento(evento: EventoCreate, db: Session = Depends(get_db)):
     return evento_crud.create_evento(db=db, evento=evento)
 
-@router.get("/", response_model=List[EventoOut])
-def obtener_eventos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    eventos = evento_crud.get_eventos(db, skip=skip, limit=limit)
+@router.get("/", response_model=Union[List[EventoOut], Pagina[EventoOut]])
+def obtener_eventos(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    # Con cursor (vacío para la primera página) se pagina por clave y se
+    # responde {items, next_cursor}; sin cursor se mantiene el offset
+    despues_de_id = leer_cursor(cursor) if cursor is not None else None
+    
+    # El ETag se calcula con las versiones de la página antes de cargar los formularios
+    etag = calcular_etag(cursor, evento_crud.get_eventos_versiones(
+        db, skip=skip, limit=limit, despues_de_id=despues_de_id
+    ))
+    no_modificado = respuesta_condicional(request, etag, "eventos")
+    if no_modificado:
+        return no_modificado
+    
+    aplicar_cabeceras(response, etag, "eventos")
+    eventos = evento_crud.get_eventos(db, skip=skip, limit=limit, despues_de_id=despues_de_id)
+    if cursor is not None:
+        return pagina(eventos, limit)
     return eventos
 
-@router.get("/stats", response_model=List[Dict[str, Any]])
+@router.get("/stats", response_model=List[EventoEstadisticasOut])
 def obtener_eventos_con_estadisticas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return evento_crud.get_eventos_with_stats(db, skip=skip, limit=limit)
+    # Ruta de lectura frecuente: SQL directo sobre la conexión de la sesión, sin el ORM
+    return get_event.get_events_with_stats(skip=skip, limit=limit, database=Database.de_sesion(db))
 
 @router.get("/{evento_id}", response_model=EventoOut)
-def obtener_evento(evento_id: int, db: Session = Depends(get_db)):
+def obtener_evento(evento_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    version = evento_crud.get_evento_version(db, evento_id=evento_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Evento no encontrado")
+    etag = calcular_etag(version)
+    no_modificado = respuesta_condicional(request, etag, "eventos")
+    if no_modificado:
+        return no_modificado
+    
+    aplicar_cabeceras(response, etag, "eventos")
     db_evento = evento_crud.get_evento(db, evento_id=evento_id)
     if db_evento is None:
         raise HTTPException(status_code=404, detail="Evento no encontrado")
     return db_evento
 
+@router.get("/{evento_id}/analitica/{tipo_formulario}", response_model=AnaliticaFormularioOut)
+def obtener_analitica_formulario(evento_id: int, tipo_formulario: Literal["pre", "post"], db: Session = Depends(get_db)):
+    analitica = analitica_service.obtener(db, evento_id=evento_id, tipo_formulario=tipo_formulario)
+    if analitica is None:
+        raise HTTPException(status_code=404, detail=f"Evento no encontrado o sin formulario {tipo_formulario}")
+    return analitica
+
 @router.put("/{evento_id}", response_model=EventoOut)
 def actualizar_evento(evento_id: int, evento: EventoUpdate, db: Session = Depends(get_db)):
     db_evento = evento_crud.update_evento(db, evento_id=evento_id, evento=evento)
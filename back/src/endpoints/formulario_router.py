@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 import logging
 
 from src.db.database import get_db
 from src.schemas.FormularioSchema import FormularioCreate, FormularioOut, FormularioUpdate
 from src.crud import formulario_crud
+from src.services.formulario_cache import formulario_cache
+from src.core.paginacion import leer_cursor, pagina
+from src.schemas.PaginacionSchema import Pagina
+from src.core.http_cache import calcular_etag, respuesta_condicional, aplicar_cabeceras
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -72,17 +76,31 @@ def crear_formulario(formulario: FormularioCreate, db: Session = Depends(get_db)
             detail=f"Error al crear el formulario: {str(e)}"
         )
 
-@router.get("/", response_model=List[FormularioOut])
-def obtener_formularios(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    formularios = formulario_crud.get_formularios(db, skip=skip, limit=limit)
+@router.get("/", response_model=Union[List[FormularioOut], Pagina[FormularioOut]])
+def obtener_formularios(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    despues_de_id = leer_cursor(cursor) if cursor is not None else None
+    formularios = formulario_crud.get_formularios(db, skip=skip, limit=limit, despues_de_id=despues_de_id)
+    if cursor is not None:
+        return pagina(formularios, limit)
     return formularios
 
 @router.get("/{formulario_id}", response_model=FormularioOut)
-def obtener_formulario(formulario_id: int, db: Session = Depends(get_db)):
-    db_formulario = formulario_crud.get_formulario(db, formulario_id=formulario_id)
-    if db_formulario is None:
+def obtener_formulario(formulario_id: int, request: Request, db: Session = Depends(get_db)):
+    version = formulario_crud.get_formulario_version(db, formulario_id=formulario_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Formulario no encontrado")
-    return db_formulario
+    etag = calcular_etag("formulario", formulario_id, version)
+    no_modificado = respuesta_condicional(request, etag, "formularios")
+    if no_modificado:
+        return no_modificado
+    
+    # Se sirve el JSON ya serializado desde la caché de formularios
+    contenido = formulario_cache.get_json(db, formulario_id=formulario_id, version=version)
+    if contenido is None:
+        raise HTTPException(status_code=404, detail="Formulario no encontrado")
+    response = Response(content=contenido, media_type="application/json")
+    aplicar_cabeceras(response, etag, "formularios")
+    return response
 
 @router.put("/{formulario_id}", response_model=FormularioOut)
 def actualizar_formulario(formulario_id: int, formulario: FormularioUpdate, db: Session = Depends(get_db)):
@@ -1,16 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-from pydantic import BaseModel
+from typing import List, Dict, Any, Literal, Optional, Union
+from pydantic import BaseModel, Field, model_validator
 
 from src.db.database import get_db
-from src.schemas.VoluntarioSchema import VoluntarioCreate, VoluntarioOut, VoluntarioInscripcion
-from src.crud import voluntario_crud
+from src.schemas.VoluntarioSchema import (
+    VoluntarioCreate, VoluntarioOut, VoluntarioInscripcion, RespuestasInscripcion, VoluntarioBusquedaOut, RespuestaBusquedaOut
+)
+from src.crud import voluntario_crud, evento_crud
+from src.services.exportacion_service import exportacion_service
+from src.services.busqueda_service import busqueda_service
+from src.services.notificacion_service import notificacion_service
+from src.services.cola_inscripciones import cola_inscripciones, PENDIENTE
+from src.core.paginacion import leer_cursor, pagina
+from src.schemas.PaginacionSchema import Pagina
 
 # Esquema para actualizar estado de inscripción
 class ActualizarEstadoInscripcion(BaseModel):
     aceptado: bool
 
+class AceptarInscripcionesLote(BaseModel):
+    inscripcion_ids: List[int] = Field(..., min_length=1, max_length=5000)
+
+# Cambio de estado en bloque: por ids, por evento (opcionalmente sólo las que completaron el pre) o ambos
+class ActualizarEstadoInscripciones(BaseModel):
+    aceptado: bool
+    inscripcion_ids: Optional[List[int]] = Field(None, min_length=1, max_length=5000)
+    evento_id: Optional[int] = None
+    completado_pre: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def requiere_ids_o_evento(self):
+        if self.inscripcion_ids is None and self.evento_id is None:
+            raise ValueError("Debe indicar inscripcion_ids o evento_id")
+        return self
+
+    def filtros(self) -> Dict[str, Any]:
+        return self.model_dump(exclude={"aceptado"}, exclude_none=True)
+
 router = APIRouter(
     prefix="/api/voluntarios",
     tags=["voluntarios"],
@@ -21,11 +49,34 @@ router = APIRouter(
 def crear_voluntario(voluntario: VoluntarioCreate, db: Session = Depends(get_db)):
     return voluntario_crud.create_voluntario(db=db, voluntario=voluntario)
 
-@router.get("/", response_model=List[VoluntarioOut])
-def obtener_voluntarios(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    voluntarios = voluntario_crud.get_voluntarios(db, skip=skip, limit=limit)
+@router.get("/", response_model=Union[List[VoluntarioOut], Pagina[VoluntarioOut]])
+def obtener_voluntarios(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    despues_de_id = leer_cursor(cursor) if cursor is not None else None
+    voluntarios = voluntario_crud.get_voluntarios(db, skip=skip, limit=limit, despues_de_id=despues_de_id)
+    if cursor is not None:
+        return pagina(voluntarios, limit)
     return voluntarios
 
+# Registradas antes de /{voluntario_id} para que "buscar" no se lea como un id
+@router.get("/buscar", response_model=List[VoluntarioBusquedaOut])
+def buscar_voluntarios(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    return busqueda_service.buscar_voluntarios(db, q, skip=skip, limit=limit)
+
+@router.get("/respuestas/buscar", response_model=List[RespuestaBusquedaOut])
+def buscar_respuestas(
+    q: str = Query(..., min_length=1, max_length=200),
+    evento_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    return busqueda_service.buscar_respuestas(db, q, evento_id=evento_id, skip=skip, limit=limit)
+
 @router.get("/{voluntario_id}", response_model=VoluntarioOut)
 def obtener_voluntario(voluntario_id: int, db: Session = Depends(get_db)):
     db_voluntario = voluntario_crud.get_voluntario(db, voluntario_id=voluntario_id)
@@ -35,6 +86,15 @@ def obtener_voluntario(voluntario_id: int, db: Session = Depends(get_db)):
 
 @router.post("/inscripcion/", status_code=status.HTTP_201_CREATED)
 def inscribir_voluntario(inscripcion: VoluntarioInscripcion, db: Session = Depends(get_db)):
+    if cola_inscripciones.activa:
+        # Modo diferido: la inscripción se guarda en el diario local y se
+        # registra en lote; el cliente consulta el resultado con el id de seguimiento
+        id_seguimiento = cola_inscripciones.encolar(inscripcion)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"id_seguimiento": id_seguimiento, "estado": PENDIENTE}
+        )
+    
     result = voluntario_crud.inscribir_voluntario(db=db, inscripcion=inscripcion)
     
     # Si hay un error, devolver el mensaje
@@ -44,33 +104,100 @@ def inscribir_voluntario(inscripcion: VoluntarioInscripcion, db: Session = Depen
         
     return result
 
+@router.get("/inscripcion/estado/{id_seguimiento}")
+def obtener_estado_inscripcion(id_seguimiento: str):
+    estado = cola_inscripciones.estado(id_seguimiento)
+    if estado is None:
+        raise HTTPException(status_code=404, detail="Inscripción no encontrada")
+    return estado
+
 @router.get("/inscripciones/evento/{evento_id}")
-def obtener_inscripciones_por_evento(evento_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def obtener_inscripciones_por_evento(
+    evento_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    despues_de_id = leer_cursor(cursor) if cursor is not None else None
     inscripciones = voluntario_crud.get_inscripciones_by_evento(
-        db, evento_id=evento_id, skip=skip, limit=limit
+        db, evento_id=evento_id, skip=skip, limit=limit, despues_de_id=despues_de_id
     )
+    if cursor is not None:
+        return pagina(inscripciones, limit)
     return inscripciones
 
 @router.get("/inscripciones/evento/{evento_id}/detalladas")
-def obtener_inscripciones_detalladas(evento_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def obtener_inscripciones_detalladas(
+    evento_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    despues_de_id = leer_cursor(cursor) if cursor is not None else None
     inscripciones = voluntario_crud.get_inscripciones_detalladas_by_evento(
-        db, evento_id=evento_id, skip=skip, limit=limit
+        db, evento_id=evento_id, skip=skip, limit=limit, despues_de_id=despues_de_id
     )
+    if cursor is not None:
+        return pagina(inscripciones, limit, get_id=lambda inscripcion: inscripcion["id"])
     return inscripciones
 
+@router.get("/inscripciones/evento/{evento_id}/exportar")
+def exportar_inscripciones(
+    evento_id: int,
+    formato: Literal["csv", "ndjson"] = "csv",
+    db: Session = Depends(get_db)
+):
+    db_evento = evento_crud.get_evento(db, evento_id=evento_id)
+    if db_evento is None:
+        raise HTTPException(status_code=404, detail="Evento no encontrado")
+    
+    # El contenido se genera mientras se envía; la sesión se cierra al terminar
+    if formato == "csv":
+        contenido = exportacion_service.generar_csv(db, db_evento)
+        media_type = "text/csv; charset=utf-8"
+    else:
+        contenido = exportacion_service.generar_ndjson(db, db_evento)
+        media_type = "application/x-ndjson"
+    
+    return StreamingResponse(
+        contenido,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="inscripciones_evento_{evento_id}.{formato}"'}
+    )
+
 @router.put("/inscripciones/{inscripcion_id}/aceptar")
 def aceptar_inscripcion(
     inscripcion_id: int, 
     datos: ActualizarEstadoInscripcion, 
     db: Session = Depends(get_db)
 ):
-    db_inscripcion = voluntario_crud.actualizar_estado_inscripcion(
+    resultado = voluntario_crud.actualizar_estado_inscripcion(
         db, inscripcion_id=inscripcion_id, aceptado=datos.aceptado
     )
-    if db_inscripcion is None:
+    if resultado is None:
         raise HTTPException(status_code=404, detail="Inscripción no encontrada")
+    db_inscripcion, recien_aceptada = resultado
+    if recien_aceptada:
+        notificacion_service.notificar_aceptaciones(db, [inscripcion_id])
     return db_inscripcion
 
+def _notificar_aceptadas(db: Session, resultado: Dict[str, Any]) -> Dict[str, Any]:
+    # El correo sale después del commit y sólo a las recién aceptadas
+    resultado["notificaciones"] = notificacion_service.notificar_aceptaciones(db, resultado.pop("aceptadas_ids"))
+    return resultado
+
+@router.put("/inscripciones/aceptar")
+def aceptar_inscripciones(datos: AceptarInscripcionesLote, db: Session = Depends(get_db)):
+    return _notificar_aceptadas(db, voluntario_crud.aceptar_inscripciones(db, inscripcion_ids=datos.inscripcion_ids))
+
+@router.put("/inscripciones/estado")
+def actualizar_estados_inscripciones(datos: ActualizarEstadoInscripciones, db: Session = Depends(get_db)):
+    return _notificar_aceptadas(
+        db, voluntario_crud.actualizar_estados_inscripciones(db, aceptado=datos.aceptado, **datos.filtros())
+    )
+
 @router.post("/inscripciones/{inscripcion_id}/respuestas/{tipo_formulario}")
 def guardar_respuestas(
     inscripcion_id: int, 
@@ -91,4 +218,18 @@ def guardar_respuestas(
     if result is None:
         raise HTTPException(status_code=404, detail="Inscripción no encontrada")
         
-    return result 
\ No newline at end of file
+    return result 
+
+@router.post("/inscripciones/respuestas/lote", status_code=status.HTTP_201_CREATED)
+def guardar_respuestas_lote(lote: List[RespuestasInscripcion], db: Session = Depends(get_db)):
+    # Importación de formularios en papel: todas las respuestas en una sola transacción
+    if not lote:
+        raise HTTPException(status_code=400, detail="El lote de respuestas está vacío")
+    
+    result = voluntario_crud.guardar_respuestas_lote(db, lote=lote)
+    
+    if isinstance(result, tuple) and len(result) == 2:
+        message, status_code = result
+        raise HTTPException(status_code=status_code, detail=message["message"])
+    
+    return result
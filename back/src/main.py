@@ -1,14 +1,44 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from src.db.database import Base, engine
+from src.db.database import Base, engine, crear_indices_busqueda, env_bool, env_int
+from src.db.async_database import DB_ASYNC, get_async_engine
+from src.core.metrics import instrumentar_pool
+from src.core.rate_limit import RateLimitMiddleware
+from src.core.tareas import gestor_tareas
+from src.services.cola_inscripciones import cola_inscripciones
+from src.services.correo_service import correo_service
+from src.services.notificacion_service import notificacion_service
+from src.services.password_reset_service import password_reset_service
 from src.endpoints import formulario_router, evento_router, voluntario_router, auth_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # En modo diferido (INSCRIPCIONES_BUFFER) un hilo drena la cola de inscripciones
+    if cola_inscripciones.activa:
+        cola_inscripciones.iniciar()
+    # Tareas en segundo plano: correos y limpieza periódica de tokens expirados
+    await gestor_tareas.iniciar()
+    gestor_tareas.programar(
+        "limpieza_tokens",
+        password_reset_service.limpiar_tokens_expirados,
+        env_int("TOKEN_CLEANUP_INTERVAL", 3600)
+    )
+    yield
+    await gestor_tareas.detener()
+    correo_service.cerrar()
+    notificacion_service.pool.cerrar()
+    if cola_inscripciones.activa:
+        cola_inscripciones.detener()
+
 app = FastAPI(
     title="Go Baby Go API",
     description="API para gestión de eventos y formularios de Go Baby Go",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -26,6 +56,11 @@ origins = [
     "http://127.0.0.1:5177",
 ]
 
+# Límites por IP y por cuenta en login, recuperación de contraseña e inscripción;
+# se registra antes que CORS para que las respuestas 429 lleven sus cabeceras
+if env_bool("RATE_LIMIT_ENABLED", True):
+    app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -36,14 +71,26 @@ app.add_middleware(
 
 # Create database tables if they don't exist
 Base.metadata.create_all(bind=engine)
+crear_indices_busqueda(engine)
 
 # Include routers
+if DB_ASYNC:
+    # En modo asíncrono estos routers atienden primero las rutas que comparten
+    # con los síncronos; el resto sigue en los routers síncronos
+    from src.endpoints.aio import formulario_router as aio_formulario_router
+    from src.endpoints.aio import evento_router as aio_evento_router
+    from src.endpoints.aio import voluntario_router as aio_voluntario_router
+    app.include_router(aio_formulario_router.router)
+    app.include_router(aio_evento_router.router)
+    app.include_router(aio_voluntario_router.router)
+
 app.include_router(auth_router.router)
 app.include_router(formulario_router.router)
 app.include_router(evento_router.router)
 app.include_router(voluntario_router.router)
 
 # Prometheus Metrics
+instrumentar_pool(get_async_engine().sync_engine if DB_ASYNC else engine)
 Instrumentator().instrument(app).expose(app)
 
 @app.get("/")
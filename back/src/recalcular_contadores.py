@@ -0,0 +1,20 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db.database import SessionLocal
+from src.crud.evento_crud import recalcular_contadores
+
+def main():
+    db = SessionLocal()
+    try:
+        total_eventos = recalcular_contadores(db)
+        print(f"Contadores recalculados para {total_eventos} eventos.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error al recalcular contadores: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
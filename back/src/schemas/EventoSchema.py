@@ -1,6 +1,6 @@
 from pydantic import BaseModel, validator, Field
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from .FormularioSchema import FormularioOut
 
 class EventoBase(BaseModel):
@@ -45,3 +45,48 @@ class EventoOut(EventoBase):
 class EventoWithVoluntariosOut(EventoOut):
     total_voluntarios: int = 0
     voluntarios_aceptados: int = 0
+
+
+class EventoEstadisticasOut(BaseModel):
+    id: int
+    nombre: Optional[str] = None
+    fecha_evento: Optional[date] = None
+    lugar: Optional[str] = None
+    descripcion: Optional[str] = None
+    formulario_pre: Optional[int] = None
+    formulario_post: Optional[int] = None
+    total_voluntarios: int = 0
+    voluntarios_aceptados: int = 0
+    completados_pre: int = 0
+    completados_post: int = 0
+
+
+class OpcionDistribucionOut(BaseModel):
+    opcion_id: int
+    texto: str
+    conteo: int = 0
+    # Sobre las respuestas que contestaron la pregunta
+    porcentaje: float = 0.0
+
+
+class PreguntaDistribucionOut(BaseModel):
+    pregunta_id: int
+    texto: str
+    tipo: str
+    activa: bool = True
+    respondidas: int = 0
+    # Sobre el total de respuestas del formulario
+    tasa_respuesta: float = 0.0
+    respuestas_textuales: int = 0
+    opciones: List[OpcionDistribucionOut] = []
+
+
+class AnaliticaFormularioOut(BaseModel):
+    evento_id: int
+    tipo_formulario: str
+    formulario_id: int
+    total_voluntarios: int = 0
+    completados: int = 0
+    tasa_completado: float = 0.0
+    total_respuestas: int = 0
+    preguntas: List[PreguntaDistribucionOut] = []
@@ -1,7 +1,7 @@
-from pydantic import BaseModel, validator, model_validator
+from pydantic import BaseModel, field_validator, validator, model_validator
 from typing import List, Optional
 from datetime import datetime
-from .PreguntaSchema import PreguntaBase, PreguntaOut, PreguntaCreate
+from .PreguntaSchema import PreguntaBase, PreguntaOut, PreguntaCreate, PreguntaUpdate
 
 class FormularioBase(BaseModel):
     nombre: str
@@ -23,12 +23,20 @@ class FormularioCreate(FormularioBase):
         return self
     
 class FormularioUpdate(FormularioBase):
-    preguntas: Optional[List[PreguntaCreate]] = None
+    # Las preguntas y opciones con id se comparan con las existentes; las que
+    # falten se eliminan (o se retiran si ya tienen respuestas)
+    preguntas: Optional[List[PreguntaUpdate]] = None
     
 class FormularioOut(FormularioBase):
     id: int
     fecha_creacion: datetime
     preguntas: List[PreguntaOut] = []
 
+    @field_validator("preguntas", mode="before")
+    @classmethod
+    def solo_activas(cls, v):
+        # Las preguntas retiradas se conservan para las respuestas antiguas, pero no se muestran
+        return [pregunta for pregunta in v if getattr(pregunta, "activa", True) is not False]
+
     class Config:
         from_attributes = True
\ No newline at end of file
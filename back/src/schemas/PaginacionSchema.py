@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class Pagina(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, field_validator, validator
 from typing import List, Optional, Literal
 
 class OpcionBase(BaseModel):
@@ -13,6 +13,10 @@ class OpcionBase(BaseModel):
 class OpcionCreate(OpcionBase):
     pass
 
+class OpcionUpdate(OpcionBase):
+    # Con id se edita la opción existente; sin id se crea una nueva
+    id: Optional[int] = None
+
 class OpcionOut(OpcionBase):
     id: int
 
@@ -32,9 +36,18 @@ class PreguntaBase(BaseModel):
 class PreguntaCreate(PreguntaBase):
     opciones: Optional[List[OpcionBase]] = []
 
+class PreguntaUpdate(PreguntaBase):
+    id: Optional[int] = None
+    opciones: Optional[List[OpcionUpdate]] = []
+
 class PreguntaOut(PreguntaBase):
     id: int
     opciones: List[OpcionOut] = []
 
+    @field_validator("opciones", mode="before")
+    @classmethod
+    def solo_activas(cls, v):
+        return [opcion for opcion in v if getattr(opcion, "activa", True) is not False]
+
     class Config:
         from_attributes = True
\ No newline at end of file
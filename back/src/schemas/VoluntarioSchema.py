@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, validator, Field
-from typing import Optional
+from typing import Optional, Dict, Any, Literal
 
 class VoluntarioBase(BaseModel):
     nombre: str
@@ -42,4 +42,28 @@ class VoluntarioOut(VoluntarioBase):
     id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class RespuestasInscripcion(BaseModel):
+    inscripcion_id: int
+    tipo_formulario: Literal["pre", "post"]
+    respuestas: Dict[str, Any]
+
+class VoluntarioBusquedaOut(BaseModel):
+    id: int
+    nombre: str
+    correo: str
+    numero_identificacion: str
+    relevancia: float
+
+class RespuestaBusquedaOut(BaseModel):
+    detalle_id: int
+    respuesta_id: int
+    inscripcion_id: int
+    evento_id: int
+    voluntario_id: int
+    nombre: str
+    tipo_formulario: str
+    pregunta_id: int
+    texto_respuesta: str
+    relevancia: float
@@ -0,0 +1,143 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, distinct, func, or_
+from sqlalchemy.orm import Session
+
+from src.core.cache import CacheLRU
+from src.core.metrics import ANALITICA_CALCULOS
+from src.db.database import DetalleRespuesta, Evento, Formulario, InscripcionEvento, Opcion, Pregunta, Respuesta
+from src.schemas.EventoSchema import AnaliticaFormularioOut, OpcionDistribucionOut, PreguntaDistribucionOut
+
+
+def _tasa(parte: int, total: int) -> float:
+    return round(parte / total, 4) if total else 0.0
+
+
+class AnaliticaService:
+    """Distribución de las respuestas a los formularios pre/post de un evento.
+
+    Los conteos se calculan en la base con consultas agregadas (GROUP BY) sobre
+    detalle_respuestas, sin traer las respuestas a memoria. El resultado se
+    guarda en caché bajo una clave que incluye el contador de respuestas
+    recibidas del evento y la versión del formulario: una respuesta nueva o
+    una edición cambian la clave, también en las demás réplicas.
+    """
+
+    def __init__(self):
+        self.cache = CacheLRU(
+            max_entradas=int(os.getenv("ANALITICA_CACHE_SIZE", "256")),
+            ttl=float(os.getenv("ANALITICA_CACHE_TTL", "3600"))
+        )
+
+    @staticmethod
+    def _columnas(tipo_formulario: str):
+        if tipo_formulario == "pre":
+            return Evento.formulario_pre_evento, Evento.respuestas_pre, Evento.completados_pre
+        return Evento.formulario_post_evento, Evento.respuestas_post, Evento.completados_post
+
+    @staticmethod
+    def _detalles(db: Session, evento_id: int, tipo_formulario: str, *columnas):
+        return db.query(*columnas).select_from(DetalleRespuesta).join(
+            Respuesta, DetalleRespuesta.respuesta_id == Respuesta.id
+        ).join(
+            InscripcionEvento, Respuesta.inscripcion_id == InscripcionEvento.id
+        ).filter(
+            InscripcionEvento.evento_id == evento_id, Respuesta.tipo_formulario == tipo_formulario
+        )
+
+    def calcular(
+        self, db: Session, evento_id: int, tipo_formulario: str, formulario_id: int
+    ) -> Tuple[int, List[PreguntaDistribucionOut]]:
+        """(total de respuestas, distribución por pregunta) del formulario en el evento"""
+        ANALITICA_CALCULOS.inc()
+        total_respuestas = db.query(func.count(Respuesta.id)).join(
+            InscripcionEvento, Respuesta.inscripcion_id == InscripcionEvento.id
+        ).filter(
+            InscripcionEvento.evento_id == evento_id, Respuesta.tipo_formulario == tipo_formulario
+        ).scalar()
+
+        # Un detalle cuenta como contestado si eligió una opción o escribió algo
+        textual = and_(DetalleRespuesta.opcion_id.is_(None), DetalleRespuesta.texto_respuesta != "")
+        contestado = or_(DetalleRespuesta.opcion_id.isnot(None), textual)
+        por_pregunta = {
+            pregunta_id: (respondidas, textuales or 0)
+            for pregunta_id, respondidas, textuales in self._detalles(
+                db, evento_id, tipo_formulario,
+                DetalleRespuesta.pregunta_id,
+                func.count(distinct(case((contestado, DetalleRespuesta.respuesta_id)))),
+                func.sum(case((textual, 1), else_=0))
+            ).group_by(DetalleRespuesta.pregunta_id)
+        }
+        por_opcion: Dict[int, int] = dict(self._detalles(
+            db, evento_id, tipo_formulario, DetalleRespuesta.opcion_id, func.count()
+        ).filter(DetalleRespuesta.opcion_id.isnot(None)).group_by(DetalleRespuesta.opcion_id).all())
+
+        # Textos actuales del formulario; las preguntas y opciones retiradas
+        # sólo aparecen si tienen respuestas
+        opciones: Dict[int, list] = {}
+        for opcion_id, pregunta_id, texto, activa in db.query(
+            Opcion.id, Opcion.pregunta_id, Opcion.texto_opcion, Opcion.activa
+        ).join(Pregunta).filter(Pregunta.formulario_id == formulario_id).order_by(Opcion.orden, Opcion.id):
+            if activa or opcion_id in por_opcion:
+                opciones.setdefault(pregunta_id, []).append((opcion_id, texto))
+
+        preguntas = []
+        for pregunta_id, texto, tipo, activa in db.query(
+            Pregunta.id, Pregunta.texto, Pregunta.tipo, Pregunta.activa
+        ).filter(Pregunta.formulario_id == formulario_id).order_by(Pregunta.orden, Pregunta.id):
+            if not activa and pregunta_id not in por_pregunta:
+                continue
+            respondidas, textuales = por_pregunta.get(pregunta_id, (0, 0))
+            preguntas.append(PreguntaDistribucionOut(
+                pregunta_id=pregunta_id,
+                texto=texto,
+                tipo=tipo,
+                activa=activa,
+                respondidas=respondidas,
+                tasa_respuesta=_tasa(respondidas, total_respuestas),
+                respuestas_textuales=textuales,
+                opciones=[
+                    OpcionDistribucionOut(
+                        opcion_id=opcion_id,
+                        texto=texto_opcion,
+                        conteo=por_opcion.get(opcion_id, 0),
+                        porcentaje=_tasa(por_opcion.get(opcion_id, 0), respondidas)
+                    )
+                    for opcion_id, texto_opcion in opciones.get(pregunta_id, [])
+                ]
+            ))
+        return total_respuestas, preguntas
+
+    def obtener(self, db: Session, evento_id: int, tipo_formulario: str) -> Optional[AnaliticaFormularioOut]:
+        """Analítica del formulario pre/post del evento, o None si el evento no existe o no lo tiene"""
+        columna_formulario, recibidas, completados = self._columnas(tipo_formulario)
+        fila = db.query(
+            columna_formulario, Formulario.version, recibidas, Evento.total_voluntarios, completados
+        ).join(Formulario, Formulario.id == columna_formulario).filter(Evento.id == evento_id).first()
+        if fila is None:
+            return None
+        formulario_id, version, respuestas_recibidas, total_voluntarios, completados = fila
+
+        clave = (evento_id, tipo_formulario, formulario_id, version, respuestas_recibidas)
+        calculado = self.cache.get(clave)
+        if calculado is None:
+            calculado = self.calcular(db, evento_id, tipo_formulario, formulario_id)
+            self.cache.set(clave, calculado)
+        total_respuestas, preguntas = calculado
+
+        # Los contadores de inscripciones se leen en cada petición; no forman parte de la clave
+        return AnaliticaFormularioOut(
+            evento_id=evento_id,
+            tipo_formulario=tipo_formulario,
+            formulario_id=formulario_id,
+            total_voluntarios=total_voluntarios,
+            completados=completados,
+            tasa_completado=_tasa(completados, total_voluntarios),
+            total_respuestas=total_respuestas,
+            preguntas=preguntas
+        )
+
+
+# Instancia global del servicio
+analitica_service = AnaliticaService()
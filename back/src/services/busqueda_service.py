@@ -0,0 +1,125 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.db.database import Voluntario
+
+# Términos de más se descartan: cada uno es un filtro adicional en el índice
+MAX_TERMINOS = 8
+
+# InnoDB no indexa su lista de stopwords por defecto ni las palabras más cortas que
+# innodb_ft_min_token_size (3): exigirlas con "+" dejaría la búsqueda sin resultados
+STOPWORDS_INNODB = frozenset((
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for", "from", "how", "i", "in",
+    "is", "it", "la", "of", "on", "or", "that", "the", "this", "to", "was", "what", "when", "where", "who",
+    "will", "with", "und", "www",
+))
+MIN_TOKEN_INNODB = 3
+
+# La página se ordena dentro de FTS5 (rank con BM25, el nombre pesa el doble)
+# y sólo sus filas se unen con voluntarios
+_VOLUNTARIOS_SQLITE = text(
+    "SELECT v.id, v.nombre, v.correo, v.numero_identificacion, -f.rank AS relevancia "
+    "FROM (SELECT rowid, rank FROM voluntarios_fts "
+    "WHERE voluntarios_fts MATCH :consulta AND rank MATCH 'bm25(10.0, 5.0, 5.0)' "
+    "ORDER BY rank LIMIT :limit OFFSET :skip) f "
+    "JOIN voluntarios v ON v.id = f.rowid ORDER BY f.rank"
+)
+_VOLUNTARIOS_MYSQL = text(
+    "SELECT id, nombre, correo, numero_identificacion, "
+    "MATCH (nombre, correo, numero_identificacion) AGAINST (:consulta IN BOOLEAN MODE) AS relevancia "
+    "FROM voluntarios "
+    "WHERE MATCH (nombre, correo, numero_identificacion) AGAINST (:consulta IN BOOLEAN MODE) "
+    "ORDER BY relevancia DESC, id LIMIT :limit OFFSET :skip"
+)
+
+_COLUMNAS_RESPUESTA = (
+    "d.id AS detalle_id, r.id AS respuesta_id, i.id AS inscripcion_id, i.evento_id, "
+    "v.id AS voluntario_id, v.nombre, r.tipo_formulario, d.pregunta_id, d.texto_respuesta"
+)
+_JOIN_RESPUESTA = (
+    "JOIN respuestas r ON r.id = d.respuesta_id "
+    "JOIN inscripciones_eventos i ON i.id = r.inscripcion_id "
+    "JOIN voluntarios v ON v.id = i.voluntario_id"
+)
+_RESPUESTAS_SQLITE = (
+    f"SELECT {_COLUMNAS_RESPUESTA}, -bm25(detalle_respuestas_fts) AS relevancia "
+    f"FROM detalle_respuestas_fts JOIN detalle_respuestas d ON d.id = detalle_respuestas_fts.rowid {_JOIN_RESPUESTA} "
+    "WHERE detalle_respuestas_fts MATCH :consulta{filtro} "
+    "ORDER BY relevancia DESC, d.id LIMIT :limit OFFSET :skip"
+)
+_RESPUESTAS_MYSQL = (
+    f"SELECT {_COLUMNAS_RESPUESTA}, MATCH (d.texto_respuesta) AGAINST (:consulta IN BOOLEAN MODE) AS relevancia "
+    f"FROM detalle_respuestas d {_JOIN_RESPUESTA} "
+    "WHERE MATCH (d.texto_respuesta) AGAINST (:consulta IN BOOLEAN MODE){filtro} "
+    "ORDER BY relevancia DESC, d.id LIMIT :limit OFFSET :skip"
+)
+
+
+class BusquedaService:
+    """Búsqueda de texto completo sobre voluntarios y respuestas textuales.
+
+    Usa los índices FTS5 (SQLite) o FULLTEXT (MariaDB/MySQL) definidos en
+    src/db/database.py, que se actualizan con cada escritura. Cada palabra de
+    la búsqueda se exige como prefijo, así que "ana gar" encuentra a
+    "Ana García"; los resultados se ordenan por relevancia (BM25 en SQLite).
+    En MySQL las palabras que InnoDB no indexa ("de", "la", ...) son opcionales.
+    """
+
+    @staticmethod
+    def terminos(busqueda: str) -> List[str]:
+        # Sólo letras y dígitos: los operadores de FTS5 y del modo booleano no llegan al motor
+        return re.findall(r"\w+", busqueda.lower())[:MAX_TERMINOS]
+
+    @staticmethod
+    def _mysql(db: Session) -> bool:
+        return db.get_bind().dialect.name in ("mysql", "mariadb")
+
+    def _consulta(self, db: Session, busqueda: str) -> Optional[str]:
+        terminos = self.terminos(busqueda)
+        if not terminos:
+            return None
+        if self._mysql(db):
+            return " ".join(
+                f"+{termino}*" if len(termino) >= MIN_TOKEN_INNODB and termino not in STOPWORDS_INNODB else f"{termino}*"
+                for termino in terminos
+            )
+        return " ".join(f'"{termino}"*' for termino in terminos)
+
+    def buscar_voluntarios(self, db: Session, busqueda: str, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
+        busqueda = busqueda.strip()
+        if "@" in busqueda and " " not in busqueda:
+            # Un correo completo se resuelve con el índice único; partido en palabras,
+            # "example" y "com" coincidirían con casi todos los voluntarios
+            voluntario = db.query(
+                Voluntario.id, Voluntario.nombre, Voluntario.correo, Voluntario.numero_identificacion
+            ).filter(Voluntario.correo == busqueda).first()
+            if voluntario is not None:
+                return [{**voluntario._asdict(), "relevancia": 1.0}] if skip == 0 else []
+        consulta = self._consulta(db, busqueda)
+        if consulta is None:
+            return []
+        sentencia = _VOLUNTARIOS_MYSQL if self._mysql(db) else _VOLUNTARIOS_SQLITE
+        return [
+            dict(fila) for fila in db.execute(sentencia, {"consulta": consulta, "skip": skip, "limit": limit}).mappings()
+        ]
+
+    def buscar_respuestas(
+        self, db: Session, busqueda: str, evento_id: Optional[int] = None, skip: int = 0, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        consulta = self._consulta(db, busqueda)
+        if consulta is None:
+            return []
+        parametros = {"consulta": consulta, "skip": skip, "limit": limit}
+        filtro = ""
+        if evento_id is not None:
+            filtro = " AND i.evento_id = :evento_id"
+            parametros["evento_id"] = evento_id
+        sentencia = (_RESPUESTAS_MYSQL if self._mysql(db) else _RESPUESTAS_SQLITE).format(filtro=filtro)
+        return [dict(fila) for fila in db.execute(text(sentencia), parametros).mappings()]
+
+
+# Instancia global del servicio
+busqueda_service = BusquedaService()
@@ -0,0 +1,219 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.crud import voluntario_crud
+from src.db.database import SessionLocal, env_bool, env_int
+from src.schemas.VoluntarioSchema import VoluntarioInscripcion
+
+logger = logging.getLogger(__name__)
+
+PENDIENTE = "pendiente"
+CONFIRMADA = "confirmada"
+RECHAZADA = "rechazada"
+
+
+class ColaInscripciones:
+    """Diario local (SQLite) de inscripciones aceptadas con 202 y aún no registradas.
+
+    Un hilo de fondo drena el diario en lotes, cada uno en una sola transacción
+    contra la base de datos principal. La entrega es al menos una vez: si el
+    proceso cae entre el commit del lote y la marca en el diario, el lote se
+    reprocesa y las inscripciones repetidas quedan rechazadas como duplicadas.
+    Las entradas procesadas se conservan `retencion` segundos para consultar
+    su estado y luego se eliminan al marcar cada lote.
+    """
+
+    def __init__(
+        self,
+        ruta: str,
+        session_factory: Callable[[], Session] = SessionLocal,
+        tamano_lote: int = 100,
+        intervalo: float = 0.2,
+        activa: bool = False,
+        retencion: float = 3600.0
+    ):
+        self.ruta = ruta
+        self.session_factory = session_factory
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self.activa = activa
+        self.retencion = retencion
+        self._local = threading.local()
+        self._hay_trabajo = threading.Event()
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def _conexion(self) -> sqlite3.Connection:
+        # Una conexión por hilo; el archivo se crea en el primer uso
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta, isolation_level=None, timeout=30)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            # FULL: una inscripción respondida con 202 sobrevive a un corte de energía
+            conexion.execute("PRAGMA synchronous=FULL")
+            conexion.execute("""
+                CREATE TABLE IF NOT EXISTS cola_inscripciones (
+                    secuencia INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id_seguimiento TEXT NOT NULL UNIQUE,
+                    datos TEXT NOT NULL,
+                    estado TEXT NOT NULL,
+                    inscripcion_id INTEGER,
+                    codigo INTEGER,
+                    detalle TEXT,
+                    creada_en REAL NOT NULL,
+                    procesada_en REAL
+                )
+            """)
+            conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cola_estado ON cola_inscripciones (estado, secuencia)"
+            )
+            conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cola_procesada ON cola_inscripciones (procesada_en)"
+            )
+            self._local.conexion = conexion
+        return conexion
+
+    def encolar(self, inscripcion: VoluntarioInscripcion) -> str:
+        id_seguimiento = uuid.uuid4().hex
+        self._conexion().execute(
+            "INSERT INTO cola_inscripciones (id_seguimiento, datos, estado, creada_en) VALUES (?, ?, ?, ?)",
+            (id_seguimiento, inscripcion.model_dump_json(), PENDIENTE, time.time())
+        )
+        self._hay_trabajo.set()
+        return id_seguimiento
+
+    def _sin_diario(self) -> bool:
+        # Con la cola inactiva las consultas no deben crear el archivo del diario
+        return not self.activa and getattr(self._local, "conexion", None) is None and not os.path.exists(self.ruta)
+
+    def estado(self, id_seguimiento: str) -> Optional[Dict[str, Any]]:
+        if self._sin_diario():
+            return None
+        fila = self._conexion().execute(
+            "SELECT estado, inscripcion_id, codigo, detalle FROM cola_inscripciones WHERE id_seguimiento = ?",
+            (id_seguimiento,)
+        ).fetchone()
+        if fila is None:
+            return None
+        estado, inscripcion_id, codigo, detalle = fila
+        return {
+            "id_seguimiento": id_seguimiento,
+            "estado": estado,
+            "inscripcion_id": inscripcion_id,
+            "codigo": codigo,
+            "detalle": detalle
+        }
+
+    def pendientes(self) -> int:
+        if self._sin_diario():
+            return 0
+        return self._conexion().execute(
+            "SELECT COUNT(*) FROM cola_inscripciones WHERE estado = ?", (PENDIENTE,)
+        ).fetchone()[0]
+
+    def procesar_lote(self) -> int:
+        """Registra el siguiente lote de inscripciones pendientes; devuelve cuántas procesó"""
+        filas = self._conexion().execute(
+            "SELECT id_seguimiento, datos FROM cola_inscripciones WHERE estado = ? ORDER BY secuencia LIMIT ?",
+            (PENDIENTE, self.tamano_lote)
+        ).fetchall()
+        if not filas:
+            return 0
+
+        ids = [id_seguimiento for id_seguimiento, _ in filas]
+        inscripciones = [VoluntarioInscripcion.model_validate_json(datos) for _, datos in filas]
+
+        db = self.session_factory()
+        try:
+            try:
+                resultados = voluntario_crud.inscribir_voluntarios_lote(db, inscripciones)
+            except Exception:
+                # Un error inesperado invalida el lote entero; se reintenta una a una
+                # para aislar la inscripción que lo provoca
+                db.rollback()
+                logger.exception("Error registrando un lote de %s inscripciones", len(filas))
+                resultados = [self._procesar_una(db, inscripcion) for inscripcion in inscripciones]
+        finally:
+            db.close()
+
+        self._marcar(ids, resultados)
+        return len(filas)
+
+    def _procesar_una(self, db: Session, inscripcion: VoluntarioInscripcion):
+        try:
+            return voluntario_crud.inscribir_voluntarios_lote(db, [inscripcion])[0]
+        except Exception:
+            db.rollback()
+            logger.exception("Inscripción rechazada para el evento %s", inscripcion.evento_id)
+            return {"message": "No se pudo registrar la inscripción"}, 500
+
+    def _marcar(self, ids: List[str], resultados: List[Any]) -> None:
+        ahora = time.time()
+        valores = []
+        for id_seguimiento, resultado in zip(ids, resultados):
+            if isinstance(resultado, tuple):
+                mensaje, codigo = resultado
+                valores.append((RECHAZADA, None, codigo, mensaje["message"], ahora, id_seguimiento))
+            else:
+                valores.append((CONFIRMADA, resultado, 201, None, ahora, id_seguimiento))
+
+        conexion = self._conexion()
+        conexion.execute("BEGIN")
+        try:
+            conexion.executemany(
+                "UPDATE cola_inscripciones SET estado = ?, inscripcion_id = ?, codigo = ?, detalle = ?, "
+                "procesada_en = ? WHERE id_seguimiento = ?",
+                valores
+            )
+            # Las pendientes tienen procesada_en NULL y nunca se purgan
+            conexion.execute(
+                "DELETE FROM cola_inscripciones WHERE procesada_en < ?", (ahora - self.retencion,)
+            )
+            conexion.execute("COMMIT")
+        except Exception:
+            conexion.execute("ROLLBACK")
+            raise
+
+    def _trabajar(self) -> None:
+        while not self._detener.is_set():
+            try:
+                procesadas = self.procesar_lote()
+            except Exception:
+                logger.exception("Error drenando la cola de inscripciones")
+                procesadas = 0
+            if procesadas < self.tamano_lote:
+                # Cola vacía o lote incompleto: esperar nuevas inscripciones
+                self._hay_trabajo.wait(self.intervalo)
+                self._hay_trabajo.clear()
+
+    def iniciar(self) -> None:
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._trabajar, name="cola-inscripciones", daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 10.0) -> None:
+        self._detener.set()
+        self._hay_trabajo.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+            self._hilo = None
+
+
+# Instancia global; el modo diferido se activa con INSCRIPCIONES_BUFFER
+cola_inscripciones = ColaInscripciones(
+    ruta=os.getenv("INSCRIPCIONES_COLA_PATH", "./cola_inscripciones.db"),
+    tamano_lote=env_int("INSCRIPCIONES_LOTE", 100),
+    intervalo=float(os.getenv("INSCRIPCIONES_INTERVALO", "0.2")),
+    activa=env_bool("INSCRIPCIONES_BUFFER", False),
+    retencion=float(os.getenv("INSCRIPCIONES_RETENCION", "3600"))
+)
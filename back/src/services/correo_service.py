@@ -0,0 +1,108 @@
+import logging
+import os
+import queue
+import smtplib
+import threading
+from email.message import EmailMessage
+from typing import Optional
+
+from src.db.database import env_bool
+
+logger = logging.getLogger(__name__)
+
+
+class CorreoService:
+    """Envío de correos reutilizando una única conexión SMTP.
+
+    Con EMAIL_BACKEND=consola (por defecto) los correos sólo se registran en la
+    consola, como en desarrollo. Con EMAIL_BACKEND=smtp la conexión se abre en
+    el primer envío y se mantiene; si el servidor la cerró por inactividad se
+    reconecta una vez antes de propagar el error.
+    """
+
+    def __init__(self):
+        self.backend = os.getenv("EMAIL_BACKEND", "consola").lower()
+        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
+        self.smtp_user = os.getenv("SMTP_USER", "")
+        self.smtp_password = os.getenv("SMTP_PASSWORD", "")
+        self.smtp_starttls = env_bool("SMTP_STARTTLS", True)
+        self.smtp_timeout = float(os.getenv("SMTP_TIMEOUT", "10"))
+        self.from_email = os.getenv("FROM_EMAIL", "noreply@gobabygo.com")
+        self._conexion: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+
+    def _conectar(self) -> smtplib.SMTP:
+        conexion = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.smtp_timeout)
+        if self.smtp_starttls:
+            conexion.starttls()
+        if self.smtp_user:
+            conexion.login(self.smtp_user, self.smtp_password)
+        return conexion
+
+    def enviar(self, destinatario: str, asunto: str, cuerpo: str) -> None:
+        """Envía un correo de texto; lanza una excepción si no se pudo enviar"""
+        if self.backend != "smtp":
+            print(f"📧 Correo simulado a {destinatario}: {asunto}\n{cuerpo}")
+            return
+
+        mensaje = EmailMessage()
+        mensaje["From"] = self.from_email
+        mensaje["To"] = destinatario
+        mensaje["Subject"] = asunto
+        mensaje.set_content(cuerpo)
+
+        with self._lock:
+            for intento in (1, 2):
+                if self._conexion is None:
+                    self._conexion = self._conectar()
+                try:
+                    self._conexion.send_message(mensaje)
+                    return
+                except smtplib.SMTPServerDisconnected:
+                    self._conexion = None
+                    if intento == 2:
+                        raise
+                    logger.info("Conexión SMTP cerrada por el servidor; reconectando")
+
+    def cerrar(self) -> None:
+        with self._lock:
+            if self._conexion is not None:
+                try:
+                    self._conexion.quit()
+                except smtplib.SMTPException:
+                    pass
+                self._conexion = None
+
+
+class PoolCorreo:
+    """Conjunto de conexiones SMTP persistentes para envíos masivos.
+
+    Cada envío toma una conexión libre y la devuelve al terminar, así que el
+    tamaño del pool es también el límite de envíos simultáneos al relay.
+    """
+
+    def __init__(self, conexiones: int = 4):
+        self._libres: "queue.Queue[CorreoService]" = queue.Queue()
+        self._todas = [CorreoService() for _ in range(conexiones)]
+        for correo in self._todas:
+            self._libres.put(correo)
+
+    @property
+    def tamano(self) -> int:
+        return len(self._todas)
+
+    def enviar(self, destinatario: str, asunto: str, cuerpo: str) -> None:
+        correo = self._libres.get()
+        try:
+            correo.enviar(destinatario, asunto, cuerpo)
+        finally:
+            self._libres.put(correo)
+
+    def cerrar(self) -> None:
+        for correo in self._todas:
+            correo.cerrar()
+
+
+# Instancia global del servicio
+correo_service = CorreoService()
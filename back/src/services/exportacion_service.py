@@ -0,0 +1,168 @@
+import csv
+import io
+import json
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.db.database import Evento, Pregunta, InscripcionEvento, Voluntario, Respuesta, DetalleRespuesta
+from src.services.formulario_versiones import SnapshotFormulario, formulario_versiones
+
+# Filas leídas por viaje al servidor con el cursor del lado del servidor
+FILAS_POR_LOTE = 1000
+
+COLUMNAS_INSCRIPCION = [
+    ("inscripcion_id", "ID inscripción"),
+    ("fecha_inscripcion", "Fecha inscripción"),
+    ("aceptado", "Aceptado"),
+    ("completado_pre", "Completó pre-evento"),
+    ("completado_post", "Completó post-evento"),
+    ("nombre", "Nombre"),
+    ("correo", "Correo"),
+    ("numero_identificacion", "Número de identificación"),
+]
+
+
+class ExportacionService:
+    def get_preguntas(self, db: Session, evento: Evento) -> List[Tuple[Tuple[str, int], str]]:
+        """((tipo de formulario, pregunta_id), texto) de cada pregunta de los formularios pre y post del evento"""
+        preguntas = []
+        for tipo, formulario_id in (("pre", evento.formulario_pre_evento), ("post", evento.formulario_post_evento)):
+            if not formulario_id:
+                continue
+            preguntas.extend(((tipo, pregunta_id), texto) for pregunta_id, texto in db.query(
+                Pregunta.id, Pregunta.texto
+            ).filter(Pregunta.formulario_id == formulario_id).order_by(Pregunta.orden, Pregunta.id))
+        return preguntas
+
+    def get_columnas_preguntas(self, db: Session, evento: Evento) -> List[Tuple[Tuple[str, int], str]]:
+        """Una columna por pregunta de los formularios pre y post del evento"""
+        return [((tipo, pregunta_id), f"{tipo}: {texto}") for (tipo, pregunta_id), texto in self.get_preguntas(db, evento)]
+
+    def _opciones(self, db: Session, evento: Evento) -> Tuple[Dict[int, SnapshotFormulario], SnapshotFormulario]:
+        # Se cargan antes de abrir el cursor del lado del servidor, que no admite
+        # otras consultas en la misma conexión mientras se recorre
+        version_ids = [
+            version_id for (version_id,) in db.query(Respuesta.formulario_version_id).join(
+                InscripcionEvento, Respuesta.inscripcion_id == InscripcionEvento.id
+            ).filter(
+                InscripcionEvento.evento_id == evento.id, Respuesta.formulario_version_id.isnot(None)
+            ).distinct()
+        ]
+        snapshots = formulario_versiones.obtener(db, version_ids)
+        # Respuestas sin revisión registrada: textos actuales de los formularios del evento
+        en_vivo = formulario_versiones.textos_de_formularios(
+            db, [f for f in (evento.formulario_pre_evento, evento.formulario_post_evento) if f]
+        )
+        return snapshots, en_vivo
+
+    def _filas(self, db: Session, evento: Evento, columnas_preguntas) -> Iterator[Dict[str, Any]]:
+        snapshots, en_vivo = self._opciones(db, evento)
+
+        def texto_opcion(version_id, opcion_id):
+            snapshot = snapshots.get(version_id)
+            texto = snapshot.opciones.get(opcion_id) if snapshot else None
+            return texto if texto is not None else en_vivo.opciones.get(opcion_id)
+
+        # Una sola consulta ordenada por inscripción, leída con un cursor del lado
+        # del servidor; las filas de cada inscripción se agrupan al vuelo
+        consulta = select(
+            InscripcionEvento.id,
+            InscripcionEvento.fecha_inscripcion,
+            InscripcionEvento.aceptado,
+            InscripcionEvento.completado_pre,
+            InscripcionEvento.completado_post,
+            Voluntario.nombre,
+            Voluntario.correo,
+            Voluntario.numero_identificacion,
+            Respuesta.tipo_formulario,
+            DetalleRespuesta.pregunta_id,
+            DetalleRespuesta.texto_respuesta,
+            Respuesta.formulario_version_id,
+            DetalleRespuesta.opcion_id,
+        ).join(
+            Voluntario, InscripcionEvento.voluntario_id == Voluntario.id
+        ).outerjoin(
+            Respuesta, Respuesta.inscripcion_id == InscripcionEvento.id
+        ).outerjoin(
+            DetalleRespuesta, DetalleRespuesta.respuesta_id == Respuesta.id
+        ).where(
+            InscripcionEvento.evento_id == evento.id
+        ).order_by(
+            InscripcionEvento.id, Respuesta.id, DetalleRespuesta.id
+        ).execution_options(yield_per=FILAS_POR_LOTE)
+
+        claves_preguntas = {clave for clave, _ in columnas_preguntas}
+        resultado = db.execute(consulta)
+        try:
+            for _, filas in groupby(resultado, key=lambda fila: fila[0]):
+                fila = next(filas)
+                registro = {
+                    "inscripcion_id": fila[0],
+                    "fecha_inscripcion": fila[1].isoformat() if fila[1] else None,
+                    "aceptado": bool(fila[2]),
+                    "completado_pre": bool(fila[3]),
+                    "completado_post": bool(fila[4]),
+                    "nombre": fila[5],
+                    "correo": fila[6],
+                    "numero_identificacion": fila[7],
+                }
+                respuestas: Dict[Tuple[str, int], List[str]] = {}
+                for detalle in (fila, *filas):
+                    clave = (detalle[8], detalle[9])
+                    if clave not in claves_preguntas:
+                        continue
+                    valor = texto_opcion(detalle[11], detalle[12]) if detalle[12] is not None else detalle[10]
+                    if valor is not None and valor not in respuestas.setdefault(clave, []):
+                        respuestas[clave].append(valor)
+                registro["respuestas"] = respuestas
+                yield registro
+        finally:
+            resultado.close()
+
+    def generar_csv(self, db: Session, evento: Evento) -> Iterator[str]:
+        try:
+            columnas_preguntas = self.get_columnas_preguntas(db, evento)
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow([titulo for _, titulo in COLUMNAS_INSCRIPCION] + [titulo for _, titulo in columnas_preguntas])
+
+            for i, registro in enumerate(self._filas(db, evento, columnas_preguntas), start=1):
+                writer.writerow(
+                    [registro[clave] for clave, _ in COLUMNAS_INSCRIPCION]
+                    + ["; ".join(registro["respuestas"].get(clave, [])) for clave, _ in columnas_preguntas]
+                )
+                if i % FILAS_POR_LOTE == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate(0)
+            yield buffer.getvalue()
+        finally:
+            db.close()
+
+    def generar_ndjson(self, db: Session, evento: Evento) -> Iterator[str]:
+        try:
+            preguntas = self.get_preguntas(db, evento)
+            lineas = []
+            for registro in self._filas(db, evento, preguntas):
+                respuestas = registro.pop("respuestas")
+                # Una entrada por pregunta: dos preguntas con el mismo texto no se pisan
+                registro["respuestas"] = [
+                    {"formulario": tipo, "pregunta_id": pregunta_id, "pregunta": texto,
+                     "respuestas": respuestas.get((tipo, pregunta_id), [])}
+                    for (tipo, pregunta_id), texto in preguntas
+                ]
+                lineas.append(json.dumps(registro, ensure_ascii=False))
+                if len(lineas) == FILAS_POR_LOTE:
+                    yield "\n".join(lineas) + "\n"
+                    lineas = []
+            if lineas:
+                yield "\n".join(lineas) + "\n"
+        finally:
+            db.close()
+
+
+# Instancia global del servicio
+exportacion_service = ExportacionService()
@@ -0,0 +1,67 @@
+import os
+from typing import Optional
+
+from sqlalchemy.orm import Session, selectinload
+
+from src.core.cache import CacheLRU, CacheCompartida, get_cache_compartida
+from src.core.metrics import FORM_CACHE_HITS, FORM_CACHE_MISSES
+from src.db.database import Formulario, Pregunta
+from src.schemas.FormularioSchema import FormularioOut
+
+
+class FormularioCacheService:
+    def __init__(self, compartida: Optional[CacheCompartida] = None):
+        self.ttl = float(os.getenv("FORM_CACHE_TTL", "300"))
+        self.local = CacheLRU(max_entradas=int(os.getenv("FORM_CACHE_SIZE", "256")), ttl=self.ttl)
+        self.compartida = compartida
+
+    @staticmethod
+    def _clave(formulario_id: int, version: int) -> str:
+        return f"formulario:{formulario_id}:v{version}"
+
+    def get_json(self, db: Session, formulario_id: int, version: Optional[int] = None) -> Optional[bytes]:
+        """Devuelve el formulario serializado como JSON, o None si no existe"""
+        # Sólo se consulta la versión; el árbol de preguntas se carga en los fallos
+        if version is None:
+            version = db.query(Formulario.version).filter(Formulario.id == formulario_id).scalar()
+        if version is None:
+            return None
+        clave = self._clave(formulario_id, version)
+
+        contenido = self.local.get(clave)
+        if contenido is not None:
+            FORM_CACHE_HITS.labels(nivel="local").inc()
+            return contenido
+
+        if self.compartida is not None:
+            contenido = self.compartida.get(clave)
+            if contenido is not None:
+                FORM_CACHE_HITS.labels(nivel="compartida").inc()
+                self.local.set(clave, contenido)
+                return contenido
+
+        FORM_CACHE_MISSES.inc()
+        db_formulario = db.query(Formulario).options(
+            selectinload(Formulario.preguntas).selectinload(Pregunta.opciones)
+        ).filter(Formulario.id == formulario_id).first()
+        if db_formulario is None:
+            return None
+
+        # La clave usa la versión leída al cargar el árbol, no la consultada antes
+        clave = self._clave(formulario_id, db_formulario.version)
+        contenido = FormularioOut.model_validate(db_formulario).model_dump_json().encode()
+        self.local.set(clave, contenido)
+        if self.compartida is not None:
+            self.compartida.set(clave, contenido, self.ttl)
+        return contenido
+
+    def invalidar(self, formulario_id: int) -> None:
+        """Descarta las versiones en memoria de un formulario modificado o eliminado"""
+        # Las entradas del backend compartido quedan inalcanzables al cambiar la
+        # versión y expiran por TTL
+        prefijo = f"formulario:{formulario_id}:"
+        self.local.delete_where(lambda clave: clave.startswith(prefijo))
+
+
+# Instancia global del servicio
+formulario_cache = FormularioCacheService(compartida=get_cache_compartida())
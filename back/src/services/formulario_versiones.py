@@ -0,0 +1,193 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.core.cache import CacheLRU
+from src.core.metrics import FORM_SNAPSHOT_CACHE_MISSES
+from src.db.database import Formulario, FormularioVersion, Opcion, Pregunta
+
+# Snapshots registrados en la transacción en curso de cada sesión
+_PENDIENTES = "formulario_snapshots_pendientes"
+
+
+class SnapshotFormulario:
+    """Textos de preguntas y opciones de una revisión de formulario"""
+
+    __slots__ = ("preguntas", "opciones")
+
+    def __init__(self, preguntas: Dict[int, Tuple[str, str]], opciones: Dict[int, str]):
+        self.preguntas = preguntas
+        self.opciones = opciones
+
+    def codificar(self) -> str:
+        return json.dumps(
+            {"p": {str(i): list(p) for i, p in self.preguntas.items()}, "o": {str(i): t for i, t in self.opciones.items()}},
+            ensure_ascii=False, separators=(",", ":")
+        )
+
+    @classmethod
+    def decodificar(cls, contenido: str) -> "SnapshotFormulario":
+        datos = json.loads(contenido)
+        return cls(
+            {int(i): (texto, tipo) for i, (texto, tipo) in datos["p"].items()},
+            {int(i): texto for i, texto in datos["o"].items()}
+        )
+
+
+class FormularioVersionesService:
+    """Revisiones inmutables de los formularios.
+
+    Cada cambio de versión de un formulario guarda un snapshot de sus
+    preguntas y opciones activas, y cada Respuesta apunta a la revisión que se
+    respondió. Los reportes resuelven los textos desde los snapshots
+    decodificados en memoria (inmutables, sin TTL) en lugar de unir cada
+    detalle con las tablas vivas, que pueden haber cambiado desde entonces.
+    """
+
+    def __init__(self):
+        self.cache = CacheLRU(max_entradas=int(os.getenv("FORM_SNAPSHOT_CACHE_SIZE", "1024")), ttl=float("inf"))
+
+    def _snapshot_actual(self, db: Session, formulario_id: int) -> SnapshotFormulario:
+        preguntas = db.query(Pregunta.id, Pregunta.texto, Pregunta.tipo).filter(
+            Pregunta.formulario_id == formulario_id, Pregunta.activa == True
+        ).order_by(Pregunta.orden, Pregunta.id).all()
+        opciones = db.query(Opcion.id, Opcion.texto_opcion).join(Pregunta).filter(
+            Pregunta.formulario_id == formulario_id, Pregunta.activa == True, Opcion.activa == True
+        ).order_by(Opcion.pregunta_id, Opcion.orden, Opcion.id).all()
+        return SnapshotFormulario({i: (texto, tipo) for i, texto, tipo in preguntas}, dict(opciones))
+
+    def registrar(self, db: Session, formulario_id: int, version: int) -> int:
+        """Guarda la revisión `version` del formulario tal como está en la transacción actual"""
+        snapshot = self._snapshot_actual(db, formulario_id)
+        db_version = FormularioVersion(formulario_id=formulario_id, version=version, contenido=snapshot.codificar())
+        db.add(db_version)
+        db.flush()
+        # Se cachea al confirmar: si la transacción se revierte, el id puede reutilizarse con otro contenido
+        db.info.setdefault(_PENDIENTES, []).append((self.cache, db_version.id, snapshot))
+        return db_version.id
+
+    def versiones_actuales(self, db: Session, formulario_ids: Iterable[int]) -> Dict[int, int]:
+        """{formulario_id: id de su revisión vigente}, creándola si todavía no existe"""
+        formulario_ids = set(formulario_ids)
+        if not formulario_ids:
+            return {}
+        filas = db.query(Formulario.id, Formulario.version, FormularioVersion.id).outerjoin(
+            FormularioVersion,
+            and_(FormularioVersion.formulario_id == Formulario.id, FormularioVersion.version == Formulario.version)
+        ).filter(Formulario.id.in_(formulario_ids)).all()
+
+        versiones = {}
+        for formulario_id, version, version_id in filas:
+            if version_id is None:
+                # Formularios creados antes de las revisiones: el snapshot se toma al primer uso
+                version_id = self._registrar_si_falta(db, formulario_id, version)
+            versiones[formulario_id] = version_id
+        return versiones
+
+    def _registrar_si_falta(self, db: Session, formulario_id: int, version: int) -> int:
+        try:
+            with db.begin_nested():
+                return self.registrar(db, formulario_id, version)
+        except IntegrityError:
+            # Otra petición la registró al mismo tiempo
+            return db.query(FormularioVersion.id).filter(
+                FormularioVersion.formulario_id == formulario_id, FormularioVersion.version == version
+            ).scalar()
+
+    def obtener(self, db: Session, version_ids: Iterable[int]) -> Dict[int, SnapshotFormulario]:
+        """Snapshots decodificados; los que no están en memoria se leen en una sola consulta"""
+        snapshots, faltantes = {}, []
+        for version_id in set(version_ids):
+            if version_id is None:
+                continue
+            snapshot = self.cache.get(version_id)
+            if snapshot is None:
+                faltantes.append(version_id)
+            else:
+                snapshots[version_id] = snapshot
+        if faltantes:
+            for version_id, contenido in db.query(FormularioVersion.id, FormularioVersion.contenido).filter(
+                FormularioVersion.id.in_(faltantes)
+            ):
+                FORM_SNAPSHOT_CACHE_MISSES.inc()
+                snapshot = SnapshotFormulario.decodificar(contenido)
+                self.cache.set(version_id, snapshot)
+                snapshots[version_id] = snapshot
+        return snapshots
+
+    def descartar(self, version_ids: Iterable[int]) -> None:
+        # Revisiones de un formulario eliminado (SQLite puede reutilizar sus ids)
+        for version_id in version_ids:
+            self.cache.delete(version_id)
+
+    @staticmethod
+    def _textos(db: Session, filtro_preguntas, filtro_opciones) -> SnapshotFormulario:
+        preguntas = db.query(Pregunta.id, Pregunta.texto, Pregunta.tipo).filter(filtro_preguntas).all() \
+            if filtro_preguntas is not None else []
+        opciones = db.query(Opcion.id, Opcion.texto_opcion).join(Pregunta).filter(filtro_opciones).all() \
+            if filtro_opciones is not None else []
+        return SnapshotFormulario({i: (texto, tipo) for i, texto, tipo in preguntas}, dict(opciones))
+
+    def textos_en_vivo(self, db: Session, pregunta_ids: Set[int], opcion_ids: Set[int]) -> SnapshotFormulario:
+        """Textos actuales (retirados incluidos), para respuestas sin revisión registrada"""
+        return self._textos(
+            db,
+            Pregunta.id.in_(pregunta_ids) if pregunta_ids else None,
+            Opcion.id.in_(opcion_ids) if opcion_ids else None
+        )
+
+    def textos_de_formularios(self, db: Session, formulario_ids: Iterable[int]) -> SnapshotFormulario:
+        formulario_ids = list(formulario_ids)
+        return self._textos(db, Pregunta.formulario_id.in_(formulario_ids), Pregunta.formulario_id.in_(formulario_ids))
+
+    def resolver(
+        self, db: Session, detalles: List[Tuple[Optional[int], int, Optional[int]]]
+    ) -> List[Tuple[Optional[Tuple[str, str]], Optional[str]]]:
+        """Resuelve cada (version_id, pregunta_id, opcion_id) a ((texto, tipo), texto_opcion).
+
+        Lo que no está en el snapshot de su revisión (respuestas anteriores a
+        las revisiones o enviadas con un formulario ya editado) se busca en las
+        tablas vivas, con una consulta por tabla para todo el lote.
+        """
+        snapshots = self.obtener(db, (version_id for version_id, _, _ in detalles))
+        resueltos = []
+        faltan_preguntas, faltan_opciones = set(), set()
+        for version_id, pregunta_id, opcion_id in detalles:
+            snapshot = snapshots.get(version_id)
+            pregunta = snapshot.preguntas.get(pregunta_id) if snapshot else None
+            opcion = snapshot.opciones.get(opcion_id) if snapshot and opcion_id is not None else None
+            if pregunta is None:
+                faltan_preguntas.add(pregunta_id)
+            if opcion is None and opcion_id is not None:
+                faltan_opciones.add(opcion_id)
+            resueltos.append((pregunta, opcion))
+
+        if not faltan_preguntas and not faltan_opciones:
+            return resueltos
+        en_vivo = self.textos_en_vivo(db, faltan_preguntas, faltan_opciones)
+        return [
+            (
+                pregunta or en_vivo.preguntas.get(pregunta_id),
+                opcion if opcion is not None or opcion_id is None else en_vivo.opciones.get(opcion_id)
+            )
+            for (pregunta, opcion), (_, pregunta_id, opcion_id) in zip(resueltos, detalles)
+        ]
+
+
+@event.listens_for(Session, "after_commit")
+def _cachear_pendientes(session: Session) -> None:
+    for cache, version_id, snapshot in session.info.pop(_PENDIENTES, ()):
+        cache.set(version_id, snapshot)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_pendientes(session: Session) -> None:
+    session.info.pop(_PENDIENTES, None)
+
+
+# Instancia global del servicio
+formulario_versiones = FormularioVersionesService()
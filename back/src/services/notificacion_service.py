@@ -0,0 +1,122 @@
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.core.metrics import NOTIFICACIONES_ENVIADAS
+from src.core.tareas import gestor_tareas
+from src.db.database import Evento, InscripcionEvento, Voluntario, env_bool, env_int
+from src.schemas.NotificacionSchema import Notificacion
+from src.services.correo_service import PoolCorreo
+
+logger = logging.getLogger(__name__)
+
+ASUNTO_ACEPTACION = Template("Tu inscripción a $evento fue aceptada")
+CUERPO_ACEPTACION = Template(
+    "Hola $nombre,\n\n"
+    "Tu inscripción al evento $evento fue aceptada.\n"
+    "Fecha: $fecha\n"
+    "Lugar: $lugar\n\n"
+    "¡Gracias por ser parte de Go Baby Go!"
+)
+
+
+class NotificacionService:
+    """Notificaciones por correo a voluntarios.
+
+    Los cambios de estado se agrupan por evento: el asunto y los valores del
+    evento se preparan una vez por evento y el cuerpo se sustituye en una sola
+    pasada por destinatario, así un "$" en los datos nunca se reinterpreta. El envío se
+    hace en segundo plano sobre un pool de conexiones SMTP persistentes, con
+    reintentos por destinatario.
+    """
+
+    def __init__(
+        self, pool: Optional[PoolCorreo] = None, reintentos: int = 3, espera_reintento: float = 2.0,
+        max_fallidas: int = 1000
+    ):
+        self.activo = env_bool("NOTIFICACIONES_ACEPTACION", True)
+        self.pool = pool if pool is not None else PoolCorreo(conexiones=env_int("NOTIFICACIONES_CONEXIONES", 4))
+        self.reintentos = reintentos
+        self.espera_reintento = espera_reintento
+        self.fallidas: Deque[Notificacion] = deque(maxlen=max_fallidas)
+
+    @staticmethod
+    def _plantilla_evento(evento: Tuple) -> Tuple[str, Dict[str, str]]:
+        _, nombre, fecha, lugar = evento
+        valores = {
+            "evento": nombre or "",
+            "fecha": fecha.strftime("%d/%m/%Y") if fecha else "Por definir",
+            "lugar": lugar or "Por definir",
+        }
+        return ASUNTO_ACEPTACION.safe_substitute(valores), valores
+
+    def construir_aceptaciones(self, db: Session, inscripcion_ids: List[int]) -> List[Notificacion]:
+        """Una notificación por inscripción aceptada, con una sola consulta"""
+        filas = db.query(
+            Voluntario.nombre, Voluntario.correo,
+            Evento.id, Evento.nombre, Evento.fecha_evento, Evento.lugar
+        ).join(
+            InscripcionEvento, InscripcionEvento.voluntario_id == Voluntario.id
+        ).join(
+            Evento, InscripcionEvento.evento_id == Evento.id
+        ).filter(
+            InscripcionEvento.id.in_(inscripcion_ids)
+        ).order_by(Evento.id).all()
+
+        plantillas: Dict[int, Tuple[str, Dict[str, str]]] = {}
+        notificaciones = []
+        for nombre, correo, *evento in filas:
+            if evento[0] not in plantillas:
+                plantillas[evento[0]] = self._plantilla_evento(tuple(evento))
+            asunto, valores = plantillas[evento[0]]
+            notificaciones.append(Notificacion(
+                titulo="inscripcion_aceptada",
+                destinatario=correo,
+                asunto=asunto,
+                descripcion=CUERPO_ACEPTACION.safe_substitute(valores, nombre=nombre or "")
+            ))
+        return notificaciones
+
+    def notificar_aceptaciones(self, db: Session, inscripcion_ids: List[int]) -> int:
+        """Encola los correos de aceptación; devuelve cuántos se encolaron"""
+        if not self.activo or not inscripcion_ids:
+            return 0
+        notificaciones = self.construir_aceptaciones(db, inscripcion_ids)
+        if notificaciones:
+            gestor_tareas.encolar("notificaciones_aceptacion", self.enviar_lote, notificaciones, max_intentos=1)
+        return len(notificaciones)
+
+    def _enviar_una(self, notificacion: Notificacion) -> bool:
+        for intento in range(1, self.reintentos + 1):
+            try:
+                self.pool.enviar(notificacion.destinatario, notificacion.asunto, notificacion.descripcion)
+                NOTIFICACIONES_ENVIADAS.labels(resultado="ok").inc()
+                return True
+            except Exception as e:
+                if intento == self.reintentos:
+                    logger.error("No se pudo notificar a %s: %r", notificacion.destinatario, e)
+                    NOTIFICACIONES_ENVIADAS.labels(resultado="fallida").inc()
+                    self.fallidas.append(notificacion)
+                    return False
+                NOTIFICACIONES_ENVIADAS.labels(resultado="reintento").inc()
+                time.sleep(self.espera_reintento * 2 ** (intento - 1))
+        return False
+
+    def enviar_lote(self, notificaciones: List[Notificacion]) -> int:
+        """Envía las notificaciones en paralelo sobre el pool; devuelve cuántas se entregaron"""
+        with ThreadPoolExecutor(max_workers=self.pool.tamano, thread_name_prefix="notificaciones") as executor:
+            return sum(executor.map(self._enviar_una, notificaciones))
+
+
+# Instancia global del servicio
+notificacion_service = NotificacionService(
+    reintentos=env_int("NOTIFICACIONES_REINTENTOS", 3),
+    espera_reintento=float(os.getenv("NOTIFICACIONES_ESPERA_REINTENTO", "2")),
+    max_fallidas=env_int("NOTIFICACIONES_MAX_FALLIDAS", 1000)
+)
@@ -1,26 +1,21 @@
 import secrets
-import smtplib
 from datetime import datetime, timedelta
-# from email.mime.text import MimeText
-# from email.mime.multipart import MimeMultipart
 from sqlalchemy.orm import Session
 from typing import Optional
 import os
 import hashlib
-import bcrypt
 
-from src.db.database import PasswordResetToken, Administrador
+from src.core.auth import invalidar_principal
+from src.core.hashing import hash_password
+from src.db.database import PasswordResetToken, Administrador, SessionLocal
 from src.crud import administrador_crud
+from src.services.correo_service import CorreoService, correo_service
 
 
 class PasswordResetService:
-    def __init__(self):
-        # Configuración de email (usar variables de entorno en producción)
-        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        self.smtp_user = os.getenv("SMTP_USER", "")
-        self.smtp_password = os.getenv("SMTP_PASSWORD", "")
-        self.from_email = os.getenv("FROM_EMAIL", "noreply@gobabygo.com")
+    def __init__(self, correo: CorreoService = correo_service):
+        # Configuración de email en src/services/correo_service.py
+        self.correo = correo
         self.app_url = os.getenv("APP_URL", "http://localhost:5173")
         
     def generate_secure_token(self) -> str:
@@ -86,30 +81,34 @@ class PasswordResetService:
             return False
         
         # Hash de la nueva contraseña
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(new_password.encode('utf-8'), salt)
-        admin.contrasena_hash = hashed_password.decode('utf-8')
+        admin.contrasena_hash = hash_password(new_password)
+        # Revocar los tokens de acceso emitidos con la contraseña anterior
+        admin.token_version = (admin.token_version or 1) + 1
         
         # Marcar token como usado
         reset_token.used = True
         
         db.commit()
+        invalidar_principal(admin.correo)
         return True
     
+    def enviar_correo_recuperacion(self, correo: str, nombre: str, token: str) -> None:
+        """Envía el correo con el enlace de recuperación; lanza una excepción si falla"""
+        reset_link = f"{self.app_url}/reset-password?token={token}"
+        self.correo.enviar(
+            correo,
+            "Recuperación de contraseña - Go Baby Go",
+            f"Hola {nombre},\n\n"
+            f"Para restablecer tu contraseña ingresa al siguiente enlace (válido por 30 minutos):\n"
+            f"{reset_link}\n\n"
+            f"Si no solicitaste el cambio, ignora este correo."
+        )
+    
     def send_reset_email(self, admin: Administrador, token: str) -> bool:
         """Envía el correo con el enlace de recuperación"""
         try:
-            # Crear enlace de recuperación
-            reset_link = f"{self.app_url}/reset-password?token={token}"
-            
-            # En desarrollo, solo registrar el enlace en consola
-            print(f"🔗 Enlace de recuperación para {admin.correo}: {reset_link}")
-            print(f"📧 Correo simulado enviado a: {admin.nombre} ({admin.correo})")
-            
-            # TODO: Implementar envío real de correo cuando esté en producción
-            # Por ahora solo simulamos el envío
+            self.enviar_correo_recuperacion(admin.correo, admin.nombre, token)
             return True
-                
         except Exception as e:
             print(f"Error enviando correo de recuperación: {str(e)}")
             return False
@@ -120,6 +119,14 @@ class PasswordResetService:
             PasswordResetToken.expires_at < datetime.now()
         ).delete()
         db.commit()
+    
+    def limpiar_tokens_expirados(self):
+        """Tarea periódica: limpia los tokens expirados con una sesión propia"""
+        db = SessionLocal()
+        try:
+            self.cleanup_expired_tokens(db)
+        finally:
+            db.close()
 
 
 # Instancia global del servicio
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from src.db.database import Base, Evento
+from src.db.async_database import get_async_engine, get_async_sessionmaker
+from src.crud.aio import evento_crud, voluntario_crud
+from src.schemas.VoluntarioSchema import VoluntarioInscripcion
+
+pytest.importorskip("aiosqlite")
+
+@pytest.fixture()
+def async_sessionmaker(tmp_path):
+    # Archivo temporal: el pool del motor abre varias conexiones y en memoria cada una tendría su propia base
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'async.db'}"
+    engine = get_async_engine(database_url)
+
+    async def preparar():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def limpiar():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+    asyncio.run(preparar())
+    yield get_async_sessionmaker(database_url)
+    asyncio.run(limpiar())
+
+def test_inscripcion_y_estadisticas_asincronas(async_sessionmaker):
+    async def escenario():
+        async with async_sessionmaker() as db:
+            evento = Evento(nombre="Taller", lugar="Bogotá", descripcion="Armado")
+            db.add(evento)
+            await db.commit()
+
+            inscripciones = [
+                VoluntarioInscripcion(
+                    nombre=f"Voluntario {i}",
+                    correo=f"v{i}@example.com",
+                    confirmacion_correo=f"v{i}@example.com",
+                    numero_identificacion=str(i),
+                    evento_id=evento.id,
+                    aceptacion_terminos=True
+                )
+                for i in range(3)
+            ]
+            creada = await voluntario_crud.inscribir_voluntario(db, inscripciones[0])
+            for inscripcion in inscripciones[1:]:
+                await voluntario_crud.inscribir_voluntario(db, inscripcion)
+            duplicada = await voluntario_crud.inscribir_voluntario(db, inscripciones[0])
+            aceptada, recien_aceptada = await voluntario_crud.actualizar_estado_inscripcion(db, creada["id"], aceptado=True)
+
+            estadisticas = await evento_crud.get_eventos_with_stats(db)
+            detalladas = await voluntario_crud.get_inscripciones_detalladas_by_evento(db, evento.id)
+            return creada, duplicada, aceptada, recien_aceptada, estadisticas, detalladas
+
+    creada, duplicada, aceptada, recien_aceptada, estadisticas, detalladas = asyncio.run(escenario())
+
+    assert creada["evento_id"] == estadisticas[0].id
+    assert isinstance(duplicada, tuple)
+    assert aceptada["aceptado"] is True and recien_aceptada
+    assert estadisticas[0].total_voluntarios == 3
+    assert estadisticas[0].voluntarios_aceptados == 1
+    assert len(detalladas) == 3
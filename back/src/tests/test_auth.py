@@ -1,10 +1,16 @@
+import threading
+
 import pytest
 from fastapi.testclient import TestClient
+from passlib.context import CryptContext
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.main import app
-from src.db.database import Base, get_db
+from src.core import auth, hashing
+from src.core.hashing import verificar_password
+from src.db.database import Administrador, Base, get_db
+from src.services.password_reset_service import password_reset_service
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test_temp.db"
 
@@ -63,4 +69,63 @@ def test_login_invalid_credentials(client):
     }
     response = client.post("/api/auth/login", data=login_data)
     assert response.status_code == 401
-    assert response.json()["detail"] == "Correo o contraseña incorrectos"
\ No newline at end of file
+    assert response.json()["detail"] == "Correo o contraseña incorrectos"
+
+def test_verifica_hashes_generados_con_passlib():
+    hash_passlib = CryptContext(schemes=["bcrypt"]).hash("admin1234")
+    assert verificar_password("admin1234", hash_passlib)
+    assert not verificar_password("otra", hash_passlib)
+    assert not verificar_password("admin1234", "no-es-un-hash")
+
+def test_login_responde_503_con_el_pool_de_hashing_saturado(client, monkeypatch):
+    client.post("/api/auth/register", json={
+        "nombre": "Admin Prueba",
+        "correo": "admin_test@gobabygofundacion.org",
+        "contrasena": "admin1234"
+    })
+    pool = hashing.PoolHashing(workers=1, max_pendientes=1)
+    monkeypatch.setattr(hashing, "pool_hashing", pool)
+    liberar = threading.Event()
+    ocupado = pool._enviar(liberar.wait)
+    try:
+        response = client.post("/api/auth/login", data={
+            "username": "admin_test@gobabygofundacion.org",
+            "password": "admin1234"
+        })
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+    finally:
+        liberar.set()
+        ocupado.result()
+    assert client.post("/api/auth/login", data={
+        "username": "admin_test@gobabygofundacion.org",
+        "password": "admin1234"
+    }).status_code == 200
+
+def test_get_current_admin_cachea_y_revoca_al_cambiar_la_contrasena(client):
+    client.post("/api/auth/register", json={
+        "nombre": "Admin Prueba",
+        "correo": "admin_test@gobabygofundacion.org",
+        "contrasena": "admin1234"
+    })
+    token = client.post("/api/auth/login", data={
+        "username": "admin_test@gobabygofundacion.org",
+        "password": "admin1234"
+    }).json()["token"]
+    auth.principales.clear()
+
+    db = TestingSessionLocal()
+    try:
+        assert auth.get_current_admin(token, db).correo == "admin_test@gobabygofundacion.org"
+        # Con el administrador en caché no se necesita la sesión
+        assert auth.get_current_admin(token, None).nombre == "Admin Prueba"
+
+        admin = db.query(Administrador).filter(Administrador.correo == "admin_test@gobabygofundacion.org").first()
+        reset_token = password_reset_service.create_reset_token(db, admin)
+        assert password_reset_service.use_token(db, reset_token.token, "nueva12345")
+
+        with pytest.raises(auth.HTTPException) as error:
+            auth.get_current_admin(token, db)
+        assert error.value.status_code == 401
+    finally:
+        db.close()
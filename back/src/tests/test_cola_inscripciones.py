@@ -0,0 +1,110 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.main import app
+from src.db.database import Base, Evento, InscripcionEvento
+from src.services.cola_inscripciones import ColaInscripciones, PENDIENTE, CONFIRMADA, RECHAZADA
+from src.schemas.VoluntarioSchema import VoluntarioInscripcion
+
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture()
+def evento():
+    Base.metadata.create_all(bind=engine)
+    with TestingSessionLocal() as db:
+        evento = Evento(nombre="Lanzamiento", lugar="Bogotá", descripcion="Apertura de inscripciones")
+        db.add(evento)
+        db.commit()
+        evento_id = evento.id
+    yield evento_id
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture()
+def cola(tmp_path):
+    return ColaInscripciones(
+        ruta=str(tmp_path / "cola.db"), session_factory=TestingSessionLocal, tamano_lote=10, intervalo=0.05
+    )
+
+def inscripcion(evento_id, correo):
+    return VoluntarioInscripcion(
+        nombre=correo,
+        correo=correo,
+        confirmacion_correo=correo,
+        numero_identificacion=correo,
+        evento_id=evento_id,
+        aceptacion_terminos=True
+    )
+
+def test_procesar_lote_confirma_y_rechaza(evento, cola):
+    ids = [
+        cola.encolar(inscripcion(evento, "a@example.com")),
+        cola.encolar(inscripcion(evento, "b@example.com")),
+        cola.encolar(inscripcion(evento, "a@example.com")),
+    ]
+    assert [cola.estado(i)["estado"] for i in ids] == [PENDIENTE] * 3
+
+    assert cola.procesar_lote() == 3
+    assert cola.procesar_lote() == 0
+
+    estados = [cola.estado(i) for i in ids]
+    assert [e["estado"] for e in estados] == [CONFIRMADA, CONFIRMADA, RECHAZADA]
+    assert estados[2]["codigo"] == 409
+    with TestingSessionLocal() as db:
+        assert db.query(func.count(InscripcionEvento.id)).scalar() == 2
+        assert db.get(Evento, evento).total_voluntarios == 2
+        assert {estados[0]["inscripcion_id"], estados[1]["inscripcion_id"]} == {
+            i.id for i in db.query(InscripcionEvento).all()
+        }
+
+def test_entradas_procesadas_se_purgan_al_vencer_la_retencion(evento, cola):
+    cola.retencion = 60
+    vieja = cola.encolar(inscripcion(evento, "a@example.com"))
+    cola.procesar_lote()
+    cola._conexion().execute("UPDATE cola_inscripciones SET procesada_en = procesada_en - 120")
+
+    reciente = cola.encolar(inscripcion(evento, "b@example.com"))
+    cola.procesar_lote()
+    pendiente = cola.encolar(inscripcion(evento, "c@example.com"))
+
+    assert cola.estado(vieja) is None
+    assert cola.estado(reciente)["estado"] == CONFIRMADA
+    assert cola.estado(pendiente)["estado"] == PENDIENTE
+    assert cola._conexion().execute("SELECT COUNT(*) FROM cola_inscripciones").fetchone()[0] == 2
+
+def test_cola_inactiva_no_crea_el_diario_al_consultar(tmp_path):
+    cola = ColaInscripciones(ruta=str(tmp_path / "cola.db"), session_factory=TestingSessionLocal)
+
+    assert cola.estado("no-existe") is None
+    assert cola.pendientes() == 0
+    assert list(tmp_path.iterdir()) == []
+
+def test_inscripcion_diferida_por_api(evento, cola, monkeypatch):
+    cola.activa = True
+    for modulo in ("src.endpoints.voluntario_router", "src.endpoints.aio.voluntario_router"):
+        monkeypatch.setattr(f"{modulo}.cola_inscripciones", cola, raising=False)
+
+    with TestClient(app) as client:
+        cola.iniciar()
+        try:
+            response = client.post("/api/voluntarios/inscripcion/", json=inscripcion(evento, "c@example.com").model_dump())
+            assert response.status_code == 202
+            id_seguimiento = response.json()["id_seguimiento"]
+
+            limite = time.monotonic() + 5
+            while cola.estado(id_seguimiento)["estado"] == PENDIENTE and time.monotonic() < limite:
+                time.sleep(0.02)
+        finally:
+            cola.detener()
+
+        estado = client.get(f"/api/voluntarios/inscripcion/estado/{id_seguimiento}")
+        assert estado.status_code == 200
+        assert estado.json()["estado"] == CONFIRMADA
+        assert client.get("/api/voluntarios/inscripcion/estado/desconocido").status_code == 404
@@ -0,0 +1,274 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.main import app
+from src.db.database import Base, Evento, Formulario, Opcion, Pregunta, get_db
+from src.crud import evento_crud, voluntario_crud
+from src.crud.event import create_event, drop_event, get_event, update_event
+from src.db.db_connection import Database
+from src.services.analitica_service import analitica_service
+from src.schemas.EventoSchema import EventoUpdate
+from src.schemas.VoluntarioSchema import VoluntarioInscripcion
+
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture()
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture()
+def client(db):
+    anterior = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = lambda: db
+    with TestClient(app) as c:
+        yield c
+    if anterior is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = anterior
+
+def inscripcion(evento, correo):
+    return VoluntarioInscripcion(
+        nombre=correo,
+        correo=correo,
+        confirmacion_correo=correo,
+        numero_identificacion=correo,
+        evento_id=evento.id,
+        aceptacion_terminos=True
+    )
+
+def test_contadores_se_actualizan_con_las_inscripciones(db):
+    con_inscritos = Evento(nombre="Taller", lugar="Bogotá", descripcion="Armado")
+    sin_inscritos = Evento(nombre="Jornada", lugar="Cali", descripcion="Entrega")
+    db.add_all([con_inscritos, sin_inscritos])
+    db.commit()
+    a = voluntario_crud.inscribir_voluntario(db, inscripcion(con_inscritos, "a@example.com"))
+    b = voluntario_crud.inscribir_voluntario(db, inscripcion(con_inscritos, "b@example.com"))
+    voluntario_crud.inscribir_voluntario(db, inscripcion(con_inscritos, "c@example.com"))
+    voluntario_crud.actualizar_estado_inscripcion(db, a.id, aceptado=True)
+    voluntario_crud.actualizar_estado_inscripcion(db, b.id, aceptado=True)
+    voluntario_crud.actualizar_estado_inscripcion(db, b.id, aceptado=True)
+    voluntario_crud.guardar_respuestas_formulario(db, a.id, "pre", {})
+    voluntario_crud.guardar_respuestas_formulario(db, a.id, "pre", {})
+    voluntario_crud.guardar_respuestas_formulario(db, b.id, "post", {})
+
+    estadisticas = {e.id: e for e in evento_crud.get_eventos_with_stats(db)}
+
+    assert estadisticas[con_inscritos.id].total_voluntarios == 3
+    assert estadisticas[con_inscritos.id].voluntarios_aceptados == 2
+    assert estadisticas[con_inscritos.id].completados_pre == 1
+    assert estadisticas[con_inscritos.id].completados_post == 1
+    assert estadisticas[sin_inscritos.id].total_voluntarios == 0
+    assert estadisticas[sin_inscritos.id].voluntarios_aceptados == 0
+
+def test_recalcular_contadores_reconstruye_desde_inscripciones(db):
+    evento = Evento(nombre="Taller", lugar="Bogotá", descripcion="Armado")
+    db.add(evento)
+    db.commit()
+    a = voluntario_crud.inscribir_voluntario(db, inscripcion(evento, "a@example.com"))
+    voluntario_crud.inscribir_voluntario(db, inscripcion(evento, "b@example.com"))
+    voluntario_crud.actualizar_estado_inscripcion(db, a.id, aceptado=True)
+    db.query(Evento).update({Evento.total_voluntarios: 99, Evento.voluntarios_aceptados: 0})
+    db.commit()
+
+    evento_crud.recalcular_contadores(db)
+    db.expire_all()
+
+    assert evento.total_voluntarios == 2
+    assert evento.voluntarios_aceptados == 1
+    assert evento.completados_pre == 0
+
+def test_eventos_responden_304_hasta_que_el_evento_cambia(db, client):
+    evento = Evento(
+        nombre="Taller", lugar="Bogotá", descripcion="Armado",
+        fecha_evento=date.today() + timedelta(days=30)
+    )
+    db.add(evento)
+    db.commit()
+
+    primera = client.get("/api/eventos/")
+    etag = primera.headers["etag"]
+    assert primera.status_code == 200
+    assert primera.headers["cache-control"] == "no-cache"
+
+    no_modificada = client.get("/api/eventos/", headers={"If-None-Match": etag})
+    assert no_modificada.status_code == 304
+    assert no_modificada.content == b""
+    assert client.get(f"/api/eventos/{evento.id}", headers={"If-None-Match": etag}).status_code == 200
+
+    client.put(f"/api/eventos/{evento.id}", json={"lugar": "Cali"})
+    modificada = client.get("/api/eventos/", headers={"If-None-Match": etag})
+    assert modificada.status_code == 200
+    assert modificada.headers["etag"] != etag
+    assert modificada.json()[0]["lugar"] == "Cali"
+
+def test_version_del_evento_se_incrementa_sobre_la_fila_actual(db):
+    evento = Evento(nombre="Taller", lugar="Bogotá", descripcion="Armado")
+    db.add(evento)
+    db.commit()
+    assert evento.version == 1
+    # Otra edición llevó la fila a la versión 2; el objeto en memoria conserva la 1
+    db.query(Evento).filter(Evento.id == evento.id).update({Evento.version: 2}, synchronize_session=False)
+
+    actualizado = evento_crud.update_evento(db, evento.id, EventoUpdate(lugar="Cali"))
+
+    assert actualizado.version == 3
+
+def test_eventos_paginados_por_cursor(db, client):
+    db.add_all([
+        Evento(
+            nombre=f"Evento {i}", lugar="Bogotá", descripcion="Armado",
+            fecha_evento=date.today() + timedelta(days=i + 1)
+        )
+        for i in range(5)
+    ])
+    db.commit()
+
+    nombres, cursor = [], ""
+    while cursor is not None:
+        datos = client.get("/api/eventos/", params={"cursor": cursor, "limit": 2}).json()
+        nombres.extend(evento["nombre"] for evento in datos["items"])
+        cursor = datos["next_cursor"]
+
+    assert nombres == [f"Evento {i}" for i in range(5)]
+    assert isinstance(client.get("/api/eventos/", params={"limit": 2}).json(), list)
+    assert client.get("/api/eventos/", params={"cursor": "no-es-un-cursor"}).status_code == 400
+
+def test_exportar_inscripciones_csv_y_ndjson(db, client):
+    formulario = Formulario(nombre="Pre", preguntas=[
+        Pregunta(texto="¿Experiencia?", tipo="textual", orden=0), Pregunta(texto="Comentarios", tipo="textual", orden=1),
+        Pregunta(texto="Comentarios", tipo="textual", orden=2)
+    ])
+    evento = Evento(nombre="Taller", lugar="Bogotá", descripcion="Armado", formulario_pre=formulario)
+    db.add(evento)
+    db.commit()
+    pregunta_id, comentarios, otros_comentarios = [p.id for p in formulario.preguntas]
+    a = voluntario_crud.inscribir_voluntario(db, inscripcion(evento, "a@example.com"))
+    voluntario_crud.inscribir_voluntario(db, inscripcion(evento, "b@example.com"))
+    voluntario_crud.guardar_respuestas_formulario(db, a.id, "pre", {
+        str(pregunta_id): "Dos años", str(comentarios): "Ninguno", str(otros_comentarios): "Gracias"
+    })
+
+    respuesta_csv = client.get(f"/api/voluntarios/inscripciones/evento/{evento.id}/exportar")
+    assert respuesta_csv.status_code == 200
+    assert respuesta_csv.headers["content-type"].startswith("text/csv")
+    filas = list(csv.reader(io.StringIO(respuesta_csv.text)))
+    assert filas[0][-3:] == ["pre: ¿Experiencia?", "pre: Comentarios", "pre: Comentarios"]
+    assert [fila[-3:] for fila in filas[1:]] == [["Dos años", "Ninguno", "Gracias"], ["", "", ""]]
+
+    respuesta_ndjson = client.get(
+        f"/api/voluntarios/inscripciones/evento/{evento.id}/exportar", params={"formato": "ndjson"}
+    )
+    registros = [json.loads(linea) for linea in respuesta_ndjson.text.splitlines()]
+    assert [r["correo"] for r in registros] == ["a@example.com", "b@example.com"]
+    # Las preguntas con el mismo texto conservan cada una sus respuestas
+    assert registros[0]["respuestas"] == [
+        {"formulario": "pre", "pregunta_id": pregunta_id, "pregunta": "¿Experiencia?", "respuestas": ["Dos años"]},
+        {"formulario": "pre", "pregunta_id": comentarios, "pregunta": "Comentarios", "respuestas": ["Ninguno"]},
+        {"formulario": "pre", "pregunta_id": otros_comentarios, "pregunta": "Comentarios", "respuestas": ["Gracias"]},
+    ]
+    assert [r["respuestas"] for r in registros[1]["respuestas"]] == [[], [], []]
+
+    assert client.get("/api/voluntarios/inscripciones/evento/999/exportar").status_code == 404
+    assert client.get(
+        f"/api/voluntarios/inscripciones/evento/{evento.id}/exportar", params={"formato": "xml"}
+    ).status_code == 422
+
+def test_sql_directo_parametrizado_sobre_el_pool(db, client):
+    database = Database(engine)
+    creados = create_event.create_events([
+        ("Taller", date(2025, 3, 1), "Bogotá", None),
+        ("Feria de O'Higgins", None, "Cali'; DROP TABLE eventos; --", "Con comillas"),
+    ], database=database)
+    evento_id = create_event.create_event("Carrera", date(2025, 4, 1), "Medellín", database=database)
+
+    assert creados == 2
+    assert get_event.get_all_events(database=database) == [
+        (1, "Taller"), (2, "Feria de O'Higgins"), (evento_id, "Carrera")
+    ]
+    assert list(get_event.iter_events(tamano=2, database=database)) == get_event.get_all_events(database=database)
+
+    assert update_event.update_event(evento_id, "Carrera 5K", date(2025, 4, 2), "Actualizado", database=database)
+    assert drop_event.drop_event(1, database=database)
+    assert not drop_event.drop_event(1, database=database)
+
+    respuesta = client.get("/api/eventos/stats")
+    assert respuesta.status_code == 200
+    assert [e["nombre"] for e in respuesta.json()] == ["Feria de O'Higgins", "Carrera 5K"]
+    assert respuesta.json()[1]["fecha_evento"] == "2025-04-02"
+    assert respuesta.json()[1]["descripcion"] == "Actualizado"
+    assert evento_crud.get_eventos_with_stats(db) == get_event.get_events_with_stats(database=database)
+
+    # Sobre la sesión, la consulta ve lo que la transacción todavía no confirmó
+    db.add(Evento(nombre="Sin confirmar", lugar="Pasto", descripcion="Pendiente"))
+    db.flush()
+    en_sesion = get_event.get_events_with_stats(database=Database.de_sesion(db))
+    assert [e.nombre for e in en_sesion] == ["Feria de O'Higgins", "Carrera 5K", "Sin confirmar"]
+    assert en_sesion == evento_crud.get_eventos_with_stats(db)
+    # ...y no la confirma: el rollback de la sesión la descarta
+    db.rollback()
+    assert [nombre for _, nombre in get_event.get_all_events(database=database)] == ["Feria de O'Higgins", "Carrera 5K"]
+
+def test_analitica_agrega_respuestas_y_se_invalida_con_respuestas_nuevas(db, client, monkeypatch):
+    analitica_service.cache.clear()
+    calculos = []
+    calcular = analitica_service.calcular
+    monkeypatch.setattr(analitica_service, "calcular", lambda *args: calculos.append(args) or calcular(*args))
+    unica = Pregunta(texto="¿Asistió antes?", tipo="seleccion_unica", orden=0,
+                     opciones=[Opcion(texto_opcion="Sí", orden=0), Opcion(texto_opcion="No", orden=1)])
+    multiple = Pregunta(texto="¿Qué armó?", tipo="seleccion_multiple", orden=1,
+                        opciones=[Opcion(texto_opcion="Ruedas", orden=0), Opcion(texto_opcion="Motor", orden=1)])
+    abierta = Pregunta(texto="Comentarios", tipo="textual", orden=2)
+    formulario = Formulario(nombre="Pre", preguntas=[unica, multiple, abierta])
+    evento = Evento(nombre="Taller", lugar="Bogotá", descripcion="Armado", formulario_pre=formulario)
+    db.add(evento)
+    db.commit()
+    si, no = (o.id for o in unica.opciones)
+    ruedas, motor = (o.id for o in multiple.opciones)
+    a, b, c = (voluntario_crud.inscribir_voluntario(db, inscripcion(evento, f"{n}@example.com")) for n in "abc")
+    voluntario_crud.guardar_respuestas_formulario(db, a.id, "pre", {
+        str(unica.id): {"opcion_id": si}, str(multiple.id): [ruedas, motor], str(abierta.id): "Muy bien"
+    })
+    voluntario_crud.guardar_respuestas_formulario(db, b.id, "pre", {
+        str(unica.id): {"opcion_id": si}, str(multiple.id): [motor], str(abierta.id): ""
+    })
+
+    respuesta = client.get(f"/api/eventos/{evento.id}/analitica/pre")
+    assert respuesta.status_code == 200
+    analitica = respuesta.json()
+    assert (analitica["total_voluntarios"], analitica["completados"], analitica["total_respuestas"]) == (3, 2, 2)
+    assert analitica["tasa_completado"] == round(2 / 3, 4)
+    p_unica, p_multiple, p_abierta = analitica["preguntas"]
+    assert [(o["texto"], o["conteo"]) for o in p_unica["opciones"]] == [("Sí", 2), ("No", 0)]
+    assert p_unica["opciones"][0]["porcentaje"] == 1.0
+    assert (p_multiple["respondidas"], [o["conteo"] for o in p_multiple["opciones"]]) == (2, [1, 2])
+    assert (p_abierta["respondidas"], p_abierta["respuestas_textuales"], p_abierta["tasa_respuesta"]) == (1, 1, 0.5)
+
+    # Sin respuestas nuevas se sirve desde la caché; una respuesta nueva cambia la clave
+    assert client.get(f"/api/eventos/{evento.id}/analitica/pre").json() == analitica
+    assert len(calculos) == 1
+    voluntario_crud.guardar_respuestas_formulario(db, c.id, "pre", {str(unica.id): {"opcion_id": no}})
+    actualizada = client.get(f"/api/eventos/{evento.id}/analitica/pre").json()
+    assert (len(calculos), actualizada["total_respuestas"]) == (2, 3)
+    assert [o["conteo"] for o in actualizada["preguntas"][0]["opciones"]] == [2, 1]
+
+    assert client.get(f"/api/eventos/{evento.id}/analitica/post").status_code == 404
+    assert client.get("/api/eventos/999/analitica/pre").status_code == 404
+    assert client.get(f"/api/eventos/{evento.id}/analitica/otro").status_code == 422
@@ -0,0 +1,140 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.database import Base, DetalleRespuesta, Formulario, FormularioVersion, Opcion, Pregunta
+from src.crud import formulario_crud
+from src.schemas.FormularioSchema import FormularioCreate, FormularioOut, FormularioUpdate
+from src.services.formulario_cache import formulario_cache
+
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture()
+def db():
+    Base.metadata.create_all(bind=engine)
+    formulario_cache.local.clear()
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+def crear_formulario(db, nombre="Pre evento"):
+    return formulario_crud.create_formulario(db, FormularioCreate(
+        nombre=nombre,
+        preguntas=[
+            {"texto": "¿Cómo te enteraste?", "tipo": "seleccion_unica",
+             "opciones": [{"texto_opcion": "Redes"}, {"texto_opcion": "Amigos"}]},
+            {"texto": "Comentarios", "tipo": "textual"},
+        ]
+    ))
+
+def test_formulario_cacheado_se_sirve_sin_recargar(db):
+    formulario = crear_formulario(db)
+
+    primera = formulario_cache.get_json(db, formulario.id)
+    segunda = formulario_cache.get_json(db, formulario.id)
+
+    assert primera is segunda
+    datos = json.loads(primera)
+    assert datos["nombre"] == "Pre evento"
+    assert [p["texto"] for p in datos["preguntas"]] == ["¿Cómo te enteraste?", "Comentarios"]
+    assert formulario_cache.get_json(db, 999) is None
+
+def test_actualizar_y_eliminar_invalidan_la_cache(db):
+    formulario = crear_formulario(db)
+    formulario_cache.get_json(db, formulario.id)
+
+    formulario_crud.update_formulario(db, formulario.id, FormularioUpdate(nombre="Post evento"))
+    assert json.loads(formulario_cache.get_json(db, formulario.id))["nombre"] == "Post evento"
+
+    formulario_crud.delete_formulario(db, formulario.id)
+    assert formulario_cache.get_json(db, formulario.id) is None
+    assert len(formulario_cache.local) == 0
+
+def test_actualizar_preguntas_aplica_solo_las_diferencias(db):
+    formulario = crear_formulario(db)
+    unica, comentarios = formulario.preguntas
+    redes, amigos = unica.opciones
+    extra = Pregunta(formulario_id=formulario.id, texto="¿Talla de camiseta?", tipo="textual", orden=2)
+    db.add(extra)
+    db.flush()
+    # "¿Cómo te enteraste?" -> "Amigos" ya fue respondida
+    db.add(DetalleRespuesta(respuesta_id=1, pregunta_id=unica.id, opcion_id=amigos.id))
+    db.commit()
+    extra_id = extra.id
+
+    actualizado = formulario_crud.update_formulario(db, formulario.id, FormularioUpdate(
+        nombre="Pre evento",
+        preguntas=[
+            {"id": comentarios.id, "texto": "Comentarios adicionales", "tipo": "textual"},
+            {"id": unica.id, "texto": "¿Cómo te enteraste?", "tipo": "seleccion_unica", "opciones": [
+                {"id": redes.id, "texto_opcion": "Redes sociales"},
+                {"id": amigos.id, "texto_opcion": "Amigos o familia"},
+                {"texto_opcion": "Prensa"},
+            ]},
+        ]
+    ))
+
+    salida = FormularioOut.model_validate(actualizado)
+    assert [p.texto for p in salida.preguntas] == ["Comentarios adicionales", "¿Cómo te enteraste?"]
+    # Sin respuestas se edita en el lugar; con respuestas se retira y se crea otra
+    assert salida.preguntas[0].id == comentarios.id
+    assert [(o.id == redes.id, o.texto_opcion) for o in salida.preguntas[1].opciones] == [
+        (True, "Redes sociales"), (False, "Amigos o familia"), (False, "Prensa")
+    ]
+    assert db.get(Pregunta, extra_id) is None
+    assert db.get(Opcion, amigos.id).activa is False
+    assert db.get(Opcion, amigos.id).texto_opcion == "Amigos"
+    assert db.query(DetalleRespuesta).one().opcion.texto_opcion == "Amigos"
+    assert actualizado.version == 2
+
+    # Quitar la pregunta respondida la retira en lugar de borrarla
+    formulario_crud.update_formulario(db, formulario.id, FormularioUpdate(
+        nombre="Pre evento", preguntas=[{"id": comentarios.id, "texto": "Comentarios adicionales", "tipo": "textual"}]
+    ))
+    assert db.get(Pregunta, unica.id).activa is False
+    assert [p["id"] for p in json.loads(formulario_cache.get_json(db, formulario.id))["preguntas"]] == [comentarios.id]
+
+def test_version_del_formulario_se_incrementa_sobre_la_fila_actual(db):
+    formulario = crear_formulario(db)
+    assert formulario.version == 1
+    # Otra edición llevó la fila a la versión 2; el objeto en memoria conserva la 1
+    db.query(Formulario).filter(Formulario.id == formulario.id).update({Formulario.version: 2}, synchronize_session=False)
+    db.add(FormularioVersion(formulario_id=formulario.id, version=2, contenido="{}"))
+    db.flush()
+
+    actualizado = formulario_crud.update_formulario(db, formulario.id, FormularioUpdate(nombre="Post evento"))
+
+    assert actualizado.version == 3
+    assert [v for (v,) in db.query(FormularioVersion.version).order_by(FormularioVersion.version)] == [1, 2, 3]
+
+def test_crear_formulario_inserta_preguntas_y_opciones_en_bloque(db):
+    sentencias = []
+    registrar = lambda conn, cursor, statement, *args: sentencias.append(statement)
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        formulario = formulario_crud.create_formulario(db, FormularioCreate(
+            nombre="Inscripción",
+            preguntas=[
+                {"texto": f"Pregunta {i}", "tipo": "seleccion_unica",
+                 "opciones": [{"texto_opcion": "Sí"}, {"texto_opcion": "No"}, {"texto_opcion": "Tal vez"}]}
+                for i in range(150)
+            ]
+        ))
+        salida = FormularioOut.model_validate(formulario)
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+    # formulario, preguntas, opciones y la revisión en un INSERT cada uno; luego la lectura con selectinload
+    assert [s.split()[0] for s in sentencias].count("INSERT") == 4
+    assert len(sentencias) <= 9
+    assert [p.texto for p in salida.preguntas[:2]] == ["Pregunta 0", "Pregunta 1"]
+    assert [o.texto_opcion for o in salida.preguntas[149].opciones] == ["Sí", "No", "Tal vez"]
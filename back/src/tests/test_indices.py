@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.database import Base, Evento, Voluntario, InscripcionEvento
+from src.crud import voluntario_crud
+from src.schemas.VoluntarioSchema import VoluntarioInscripcion
+from src.services.password_reset_service import password_reset_service
+
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture()
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+def registrar_selects(func):
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            consultas.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+    return consultas
+
+def recorridos_completos(db, consultas):
+    """Pasos del plan de SQLite que recorren una tabla entera sin usar un índice"""
+    recorridos = []
+    conexion = db.connection().connection.driver_connection
+    for statement, parameters in consultas:
+        for fila in conexion.execute(f"EXPLAIN QUERY PLAN {statement}", parameters):
+            detalle = fila[-1]
+            if detalle.startswith("SCAN") and "USING" not in detalle:
+                recorridos.append((statement, detalle))
+    return recorridos
+
+def datos_inscripcion(evento, correo):
+    return VoluntarioInscripcion(
+        nombre=correo,
+        correo=correo,
+        confirmacion_correo=correo,
+        numero_identificacion=correo,
+        evento_id=evento.id,
+        aceptacion_terminos=True
+    )
+
+def test_consultas_frecuentes_usan_indices(db):
+    evento = Evento(nombre="Taller", lugar="Bogotá", descripcion="Armado")
+    db.add(evento)
+    db.commit()
+    inscripcion = voluntario_crud.inscribir_voluntario(db, datos_inscripcion(evento, "a@example.com"))
+
+    def consultas_frecuentes():
+        voluntario_crud.inscribir_voluntario(db, datos_inscripcion(evento, "a@example.com"))
+        voluntario_crud.guardar_respuestas_formulario(db, inscripcion.id, "pre", {})
+        voluntario_crud.get_inscripciones_by_evento(db, evento.id, limit=10, despues_de_id=0)
+        voluntario_crud.get_inscripciones_detalladas_by_evento(db, evento.id)
+        password_reset_service.validate_token(db, "token-inexistente")
+
+    consultas = registrar_selects(consultas_frecuentes)
+
+    assert consultas
+    assert recorridos_completos(db, consultas) == []
+
+def test_unicidad_de_voluntarios_e_inscripciones(db):
+    evento = Evento(nombre="Taller", lugar="Bogotá", descripcion="Armado")
+    voluntario = Voluntario(
+        nombre="A", correo="a@example.com", confirmacion_correo="a@example.com", numero_identificacion="1"
+    )
+    db.add_all([evento, voluntario, InscripcionEvento(voluntario=voluntario, evento=evento)])
+    db.commit()
+
+    db.add(InscripcionEvento(voluntario_id=voluntario.id, evento_id=evento.id))
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
+
+    db.add(Voluntario(
+        nombre="B", correo="a@example.com", confirmacion_correo="a@example.com", numero_identificacion="2"
+    ))
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
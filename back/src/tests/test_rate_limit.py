@@ -0,0 +1,125 @@
+import asyncio
+
+from fastapi import FastAPI, Form
+from fastapi.testclient import TestClient
+
+from src.core.rate_limit import MemoriaLimites, RateLimitMiddleware, Regla
+
+def crear_app(reglas, backend=None, **opciones):
+    app = FastAPI()
+
+    @app.post("/login")
+    def login(username: str = Form(...), password: str = Form(...)):
+        return {"username": username}
+
+    @app.get("/libre")
+    def libre():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitMiddleware, reglas=reglas, backend=backend or MemoriaLimites(), **{"proxies_confiables": 1, **opciones}
+    )
+    return TestClient(app)
+
+def test_limite_por_cuenta_reenvia_el_cuerpo_y_responde_429():
+    client = crear_app({("POST", "/login"): [Regla("login_cuenta", capacidad=2, ventana=60, clave="username")]})
+
+    respuestas = [client.post("/login", data={"username": "Admin@Example.com", "password": "x"}) for _ in range(3)]
+
+    assert [r.status_code for r in respuestas] == [200, 200, 429]
+    assert respuestas[0].json() == {"username": "Admin@Example.com"}
+    assert int(respuestas[2].headers["retry-after"]) >= 1
+    # Otra cuenta tiene su propia cubeta; la clave no distingue mayúsculas
+    assert client.post("/login", data={"username": "otro@example.com", "password": "x"}).status_code == 200
+    assert client.post("/login", data={"username": "admin@example.com", "password": "x"}).status_code == 429
+    assert client.get("/libre").status_code == 200
+
+def test_limite_por_ip_usa_x_forwarded_for():
+    client = crear_app({("POST", "/login"): [Regla("login_ip", capacidad=1, ventana=60)]})
+    datos = {"username": "a@example.com", "password": "x"}
+
+    assert client.post("/login", data=datos, headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+    assert client.post("/login", data=datos, headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 429
+    assert client.post("/login", data=datos, headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 200
+    # Lo que el cliente antepone al encabezado no cambia la IP que agregó el proxy
+    assert client.post("/login", data=datos, headers={"X-Forwarded-For": "1.2.3.4, 10.0.0.2"}).status_code == 429
+
+def test_limite_por_ip_con_varios_proxies_confiables():
+    client = crear_app({("POST", "/login"): [Regla("login_ip", capacidad=1, ventana=60)]}, proxies_confiables=2)
+    datos = {"username": "a@example.com", "password": "x"}
+
+    assert client.post("/login", data=datos, headers={"X-Forwarded-For": "9.9.9.9, 10.0.0.1, 172.16.0.1"}).status_code == 200
+    assert client.post("/login", data=datos, headers={"X-Forwarded-For": "8.8.8.8, 10.0.0.1, 172.16.0.1"}).status_code == 429
+
+def test_backend_caido_deja_pasar_las_peticiones():
+    class BackendCaido(MemoriaLimites):
+        async def consumir(self, clave, regla):
+            raise ConnectionError("redis no disponible")
+
+    client = crear_app({("POST", "/login"): [Regla("login_ip", capacidad=1, ventana=60)]}, BackendCaido())
+    datos = {"username": "a@example.com", "password": "x"}
+
+    assert [client.post("/login", data=datos).status_code for _ in range(3)] == [200, 200, 200]
+
+def test_cubeta_se_recarga_con_el_tiempo(monkeypatch):
+    backend = MemoriaLimites()
+    regla = Regla("prueba", capacidad=2, ventana=10)
+    reloj = [1000.0]
+    monkeypatch.setattr("src.core.rate_limit.time.monotonic", lambda: reloj[0])
+
+    consumir = lambda: asyncio.run(backend.consumir("k", regla))
+
+    assert consumir()[0]
+    assert consumir()[0]
+    permitido, reintentar = consumir()
+    assert not permitido and reintentar == 5.0
+    reloj[0] += 5
+    assert consumir()[0]
+
+def test_cuerpo_grande_se_rechaza_sin_acumularlo():
+    client = crear_app(
+        {("POST", "/login"): [Regla("login_cuenta", capacidad=5, ventana=60, clave="username")]}, max_cuerpo=1024
+    )
+
+    grande = client.post("/login", data={"username": "a@example.com", "password": "x" * 2048})
+    assert grande.status_code == 413
+
+    def en_partes():
+        yield b"username=a%40example.com&password="
+        for _ in range(64):
+            yield b"x" * 64
+
+    # Sin content-length (chunked) se corta con el contador de bytes leídos
+    assert client.post(
+        "/login", content=en_partes(), headers={"content-type": "application/x-www-form-urlencoded"}
+    ).status_code == 413
+    assert client.post("/login", data={"username": "a@example.com", "password": "x"}).status_code == 200
+
+def test_receive_original_sigue_disponible_tras_reenviar_el_cuerpo():
+    recibidos = []
+
+    async def app(scope, receive, send):
+        while True:
+            mensaje = await receive()
+            recibidos.append(mensaje["type"])
+            if mensaje["type"] == "http.disconnect":
+                break
+
+    middleware = RateLimitMiddleware(
+        app, reglas={("POST", "/login"): [Regla("login_cuenta", capacidad=5, ventana=60, clave="username")]},
+        backend=MemoriaLimites()
+    )
+    pendientes = [
+        {"type": "http.request", "body": b"username=a", "more_body": True},
+        {"type": "http.request", "body": b"&password=x", "more_body": False},
+        {"type": "http.disconnect"},
+    ]
+
+    async def receive():
+        return pendientes.pop(0)
+
+    scope = {"type": "http", "method": "POST", "path": "/login", "headers": [], "client": ("127.0.0.1", 1)}
+    asyncio.run(middleware(scope, receive, None))
+
+    assert recibidos == ["http.request", "http.request", "http.disconnect"]
+    assert pendientes == []
@@ -0,0 +1,143 @@
+import asyncio
+import smtplib
+
+from src.core.tareas import GestorTareas
+from src.services.correo_service import CorreoService
+from src.services.password_reset_service import PasswordResetService
+
+def test_reintenta_con_backoff_y_descarta_al_agotar_intentos():
+    llamadas = {"inestable": 0, "rota": 0}
+
+    def inestable():
+        llamadas["inestable"] += 1
+        if llamadas["inestable"] < 3:
+            raise ConnectionError("relay caído")
+
+    async def rota():
+        llamadas["rota"] += 1
+        raise ValueError("siempre falla")
+
+    async def escenario():
+        gestor = GestorTareas(workers=1, backoff_base=0.01)
+        await gestor.iniciar()
+        gestor.encolar("inestable", inestable, max_intentos=3)
+        gestor.encolar("rota", rota, max_intentos=2)
+        for _ in range(100):
+            if llamadas["inestable"] == 3 and gestor.fallidas:
+                break
+            await asyncio.sleep(0.01)
+        await gestor.detener()
+        return gestor
+
+    gestor = asyncio.run(escenario())
+
+    assert llamadas == {"inestable": 3, "rota": 2}
+    assert [tarea.nombre for tarea in gestor.fallidas] == ["rota"]
+    assert "siempre falla" in gestor.fallidas[0].ultimo_error
+
+def test_programar_ejecuta_la_tarea_periodicamente():
+    ejecuciones = []
+
+    async def escenario():
+        gestor = GestorTareas(workers=1)
+        await gestor.iniciar()
+        gestor.programar("periodica", lambda: ejecuciones.append(1), 0.02)
+        await asyncio.sleep(0.15)
+        await gestor.detener()
+
+    asyncio.run(escenario())
+
+    assert len(ejecuciones) >= 3
+
+def test_detener_pasa_los_reintentos_pendientes_a_fallidas():
+    intentos = []
+
+    def caida():
+        intentos.append(1)
+        raise ConnectionError("relay caído")
+
+    async def escenario():
+        gestor = GestorTareas(workers=1, backoff_base=30)
+        await gestor.iniciar()
+        gestor.encolar("caida", caida, max_intentos=5)
+        while not intentos:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        await gestor.detener(timeout=0.1)
+        return gestor
+
+    gestor = asyncio.run(escenario())
+
+    assert len(intentos) == 1
+    assert [tarea.nombre for tarea in gestor.fallidas] == ["caida"]
+    assert "relay caído" in gestor.fallidas[0].ultimo_error
+    assert gestor._reintentos == {}
+
+def test_corrutina_en_linea_dentro_de_un_loop_se_agenda_en_el():
+    ejecutadas = []
+
+    async def enviar(destino):
+        ejecutadas.append(destino)
+
+    async def rota():
+        raise ValueError("siempre falla")
+
+    async def endpoint_async():
+        # Gestor sin iniciar, llamado desde un loop en curso (rutas aio)
+        gestor = GestorTareas()
+        gestor.encolar("enviar", enviar, "a@example.com")
+        gestor.encolar("rota", rota)
+        await asyncio.sleep(0.01)
+        return gestor
+
+    gestor = asyncio.run(endpoint_async())
+
+    assert ejecutadas == ["a@example.com"]
+    assert [tarea.nombre for tarea in gestor.fallidas] == ["rota"]
+    assert "siempre falla" in gestor.fallidas[0].ultimo_error
+
+def test_correos_de_recuperacion_reutilizan_la_conexion_smtp(monkeypatch):
+    enviados = []
+    conexiones = []
+
+    class SMTPFalso:
+        def __init__(self, servidor, puerto, timeout=None):
+            self.destino = (servidor, puerto)
+            self.abierta = True
+            self.cerrada_con_quit = False
+            conexiones.append(self)
+
+        def send_message(self, mensaje):
+            if not self.abierta:
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+            enviados.append(mensaje)
+
+        def close(self):
+            self.abierta = False
+
+        def quit(self):
+            self.cerrada_con_quit = True
+            self.close()
+
+    monkeypatch.setattr(smtplib, "SMTP", SMTPFalso)
+    correo = CorreoService()
+    correo.backend = "smtp"
+    correo.smtp_server = "relay.example.com"
+    correo.smtp_port = 2525
+    correo.smtp_starttls = False
+    correo.smtp_user = ""
+    servicio = PasswordResetService(correo=correo)
+
+    servicio.enviar_correo_recuperacion("a@example.com", "Ana", "token-a")
+    servicio.enviar_correo_recuperacion("b@example.com", "Beto", "token-b")
+
+    # Si el servidor cerró la conexión, se reconecta y el envío no falla
+    correo._conexion.close()
+    servicio.enviar_correo_recuperacion("c@example.com", "Caro", "token-c")
+    correo.cerrar()
+
+    assert [m["To"] for m in enviados] == ["a@example.com", "b@example.com", "c@example.com"]
+    assert "token-b" in enviados[1].get_content()
+    assert len(conexiones) == 2
+    assert conexiones[0].destino == ("relay.example.com", 2525)
+    assert conexiones[1].cerrada_con_quit and correo._conexion is None
@@ -0,0 +1,391 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.main import app
+from src.db.database import (
+    configurar_sqlite, get_db, Base, Evento, Formulario, Pregunta, Opcion, Voluntario,
+    InscripcionEvento, Respuesta, DetalleRespuesta
+)
+from src.crud import evento_crud, voluntario_crud
+from src.endpoints import voluntario_router
+from src.services.busqueda_service import busqueda_service
+from src.services.formulario_versiones import formulario_versiones
+from src.services.notificacion_service import NotificacionService
+from src.schemas.VoluntarioSchema import RespuestasInscripcion, VoluntarioInscripcion
+
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture()
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+def contar_consultas(func):
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        resultado = func()
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+    return resultado, consultas
+
+def crear_evento_con_formulario(db):
+    formulario = Formulario(nombre="Pre evento")
+    textual = Pregunta(texto="¿Por qué quieres participar?", tipo="textual")
+    multiple = Pregunta(texto="¿Qué días puedes?", tipo="seleccion_multiple")
+    multiple.opciones = [Opcion(texto_opcion="Sábado"), Opcion(texto_opcion="Domingo")]
+    formulario.preguntas = [textual, multiple]
+    evento = Evento(nombre="Taller", lugar="Bogotá", descripcion="Taller de armado", formulario_pre=formulario)
+    db.add(evento)
+    db.commit()
+    return evento, textual, multiple
+
+def inscribir_con_respuestas(db, evento, textual, multiple, cantidad, inicio=0):
+    for i in range(inicio, inicio + cantidad):
+        voluntario = Voluntario(
+            nombre=f"Voluntario {i}",
+            correo=f"voluntario{i}@example.com",
+            confirmacion_correo=f"voluntario{i}@example.com",
+            numero_identificacion=str(1000 + i)
+        )
+        inscripcion = InscripcionEvento(voluntario=voluntario, evento=evento, completado_pre=True)
+        respuesta = Respuesta(inscripcion=inscripcion, tipo_formulario="pre", codigo_respuesta=f"c{i}")
+        respuesta.detalles = [
+            DetalleRespuesta(pregunta=textual, texto_respuesta=f"Respuesta {i}"),
+            DetalleRespuesta(pregunta=multiple, opcion=multiple.opciones[0]),
+            DetalleRespuesta(pregunta=multiple, opcion=multiple.opciones[1]),
+        ]
+        db.add(inscripcion)
+    db.commit()
+
+def test_inscripciones_detalladas_agrupa_respuestas(db):
+    evento, textual, multiple = crear_evento_con_formulario(db)
+    inscribir_con_respuestas(db, evento, textual, multiple, 1)
+
+    resultado = voluntario_crud.get_inscripciones_detalladas_by_evento(db, evento_id=evento.id)
+
+    assert len(resultado) == 1
+    assert resultado[0]["voluntario"]["correo"] == "voluntario0@example.com"
+    respuestas = {r["pregunta_id"]: r for r in resultado[0]["respuestas_pre"]}
+    assert respuestas[textual.id]["respuesta_texto"] == "Respuesta 0"
+    assert sorted(respuestas[multiple.id]["opciones_seleccionadas"]) == ["Domingo", "Sábado"]
+
+def test_inscripciones_detalladas_cantidad_de_consultas_constante(db):
+    evento_pequeno, textual, multiple = crear_evento_con_formulario(db)
+    inscribir_con_respuestas(db, evento_pequeno, textual, multiple, 3, inicio=0)
+    evento_grande = Evento(nombre="Jornada", lugar="Medellín", descripcion="Entrega", formulario_pre=evento_pequeno.formulario_pre)
+    db.add(evento_grande)
+    db.commit()
+    inscribir_con_respuestas(db, evento_grande, textual, multiple, 40, inicio=100)
+    db.expire_all()
+
+    pocas, consultas_pocas = contar_consultas(
+        lambda: voluntario_crud.get_inscripciones_detalladas_by_evento(db, evento_id=evento_pequeno.id)
+    )
+    db.expire_all()
+    muchas, consultas_muchas = contar_consultas(
+        lambda: voluntario_crud.get_inscripciones_detalladas_by_evento(db, evento_id=evento_grande.id)
+    )
+
+    assert len(pocas) == 3
+    assert len(muchas) == 40
+    assert len(consultas_muchas) == len(consultas_pocas)
+
+def test_guardar_respuestas_lote_inserta_detalles_en_bloque(db):
+    evento, textual, multiple = crear_evento_con_formulario(db)
+    inscripciones = []
+    for i in range(5):
+        voluntario = Voluntario(
+            nombre=f"Voluntario {i}",
+            correo=f"lote{i}@example.com",
+            confirmacion_correo=f"lote{i}@example.com",
+            numero_identificacion=str(i)
+        )
+        inscripciones.append(InscripcionEvento(voluntario=voluntario, evento=evento))
+    db.add_all(inscripciones)
+    db.commit()
+    lote = [
+        RespuestasInscripcion(
+            inscripcion_id=inscripcion.id,
+            tipo_formulario="post",
+            respuestas={
+                str(textual.id): "Muy bien",
+                str(multiple.id): [opcion.id for opcion in multiple.opciones]
+            }
+        )
+        for inscripcion in inscripciones
+    ]
+
+    resultado, consultas = contar_consultas(lambda: voluntario_crud.guardar_respuestas_lote(db, lote))
+
+    assert len(resultado) == 5
+    assert len([c for c in consultas if c.startswith("INSERT INTO detalle_respuestas")]) == 1
+    assert db.query(DetalleRespuesta).count() == 15
+    assert all(inscripcion.completado_post for inscripcion in inscripciones)
+    db.refresh(evento)
+    assert evento.completados_post == 5
+
+def test_guardar_respuestas_lote_rechaza_inscripciones_inexistentes(db):
+    lote = [RespuestasInscripcion(inscripcion_id=999, tipo_formulario="pre", respuestas={"1": "x"})]
+
+    resultado = voluntario_crud.guardar_respuestas_lote(db, lote)
+
+    assert resultado[1] == 404
+    assert db.query(Respuesta).count() == 0
+
+def test_inscripciones_concurrentes_sin_duplicados(tmp_path):
+    engine_archivo = create_engine(
+        f"sqlite:///{tmp_path / 'concurrencia.db'}",
+        connect_args={"check_same_thread": False}, pool_size=32, max_overflow=0
+    )
+    configurar_sqlite(engine_archivo)
+    Base.metadata.create_all(bind=engine_archivo)
+    Sesion = sessionmaker(autocommit=False, autoflush=False, bind=engine_archivo)
+
+    with Sesion() as db:
+        evento = Evento(nombre="Apertura", lugar="Bogotá", descripcion="Inscripciones abiertas")
+        db.add(evento)
+        db.commit()
+        evento_id = evento.id
+
+    def inscribir(i):
+        correo = f"voluntario{i % 100}@example.com"
+        with Sesion() as db:
+            resultado = voluntario_crud.inscribir_voluntario(db, VoluntarioInscripcion(
+                nombre=correo,
+                correo=correo,
+                confirmacion_correo=correo,
+                numero_identificacion=str(i % 100),
+                evento_id=evento_id,
+                aceptacion_terminos=True
+            ))
+            return resultado[1] if isinstance(resultado, tuple) else 201
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        codigos = list(executor.map(inscribir, range(1000)))
+
+    with Sesion() as db:
+        assert codigos.count(201) == 100
+        assert codigos.count(409) == 900
+        assert db.query(func.count(Voluntario.id)).scalar() == 100
+        assert db.query(func.count(InscripcionEvento.id)).scalar() == 100
+        assert db.get(Evento, evento_id).total_voluntarios == 100
+    engine_archivo.dispose()
+
+def test_inscripcion_resuelve_voluntario_e_inscripcion_en_dos_sentencias(db):
+    evento = Evento(nombre="Taller", lugar="Bogotá", descripcion="Taller de armado")
+    db.add(evento)
+    db.commit()
+    datos = VoluntarioInscripcion(
+        nombre="Ana", correo="ana@example.com", confirmacion_correo="ana@example.com",
+        numero_identificacion="1", evento_id=evento.id, aceptacion_terminos=True
+    )
+
+    inscripcion, consultas = contar_consultas(lambda: voluntario_crud.inscribir_voluntario(db, datos))
+    duplicada, _ = contar_consultas(lambda: voluntario_crud.inscribir_voluntario(db, datos))
+
+    # upsert del voluntario, inserción de la inscripción, contador del evento y lectura final
+    assert [consulta.split()[0] for consulta in consultas] == ["INSERT", "INSERT", "UPDATE", "SELECT"]
+    assert inscripcion.evento_id == evento.id
+    assert duplicada == ({"message": "Ya está inscrito en este evento"}, 409)
+
+def test_aceptar_inscripciones_en_lote_notifica_con_reintentos(db, monkeypatch):
+    class PoolFalso:
+        tamano = 2
+
+        def __init__(self):
+            self.enviados = []
+            self.fallos = {"voluntario1@example.com": 1}
+
+        def enviar(self, destinatario, asunto, cuerpo):
+            if self.fallos.get(destinatario):
+                self.fallos[destinatario] -= 1
+                raise ConnectionError("relay ocupado")
+            self.enviados.append((destinatario, asunto, cuerpo))
+
+    pool = PoolFalso()
+    servicio = NotificacionService(pool=pool, espera_reintento=0)
+    monkeypatch.setattr(voluntario_router, "notificacion_service", servicio)
+    evento, textual, multiple = crear_evento_con_formulario(db)
+    inscribir_con_respuestas(db, evento, textual, multiple, 3)
+    ids = [inscripcion.id for inscripcion in db.query(InscripcionEvento).order_by(InscripcionEvento.id)]
+
+    # Sin el lifespan, el gestor de tareas ejecuta el envío en línea
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        client = TestClient(app)
+        primera = client.put("/api/voluntarios/inscripciones/aceptar", json={"inscripcion_ids": ids[:2]}).json()
+        # Las ya aceptadas no vuelven a contar ni a notificarse
+        segunda = client.put("/api/voluntarios/inscripciones/aceptar", json={"inscripcion_ids": ids}).json()
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    db.refresh(evento)
+    assert primera == {"aceptadas": 2, "notificaciones": 2}
+    assert segunda == {"aceptadas": 1, "notificaciones": 1}
+    assert evento.voluntarios_aceptados == 3
+    assert sorted(destinatario for destinatario, _, _ in pool.enviados) == [
+        "voluntario0@example.com", "voluntario1@example.com", "voluntario2@example.com"
+    ]
+    _, asunto, cuerpo = pool.enviados[0]
+    assert asunto == "Tu inscripción a Taller fue aceptada"
+    assert "Bogotá" in cuerpo and cuerpo.startswith("Hola Voluntario")
+
+    # Un "$" en los datos del evento se copia tal cual
+    evento.nombre = "Taller $nombre"
+    db.commit()
+    notificacion = servicio.construir_aceptaciones(db, ids[:1])[0]
+    assert "Taller $nombre fue aceptada" in notificacion.descripcion
+
+def test_actualizar_estados_por_filtro_en_un_update(db):
+    evento, textual, multiple = crear_evento_con_formulario(db)
+    inscribir_con_respuestas(db, evento, textual, multiple, 4)
+    db.query(InscripcionEvento).filter(InscripcionEvento.id == 4).update({"completado_pre": False})
+    db.commit()
+
+    aceptadas, consultas = contar_consultas(lambda: voluntario_crud.actualizar_estados_inscripciones(
+        db, aceptado=True, evento_id=evento.id, completado_pre=True
+    ))
+    rechazadas = voluntario_crud.actualizar_estados_inscripciones(db, aceptado=False, inscripcion_ids=[1, 4])
+
+    db.refresh(evento)
+    assert aceptadas == {"actualizadas": 3, "por_evento": {evento.id: 3}, "aceptadas_ids": [1, 2, 3]}
+    # La inscripción 4 no estaba aceptada, así que no cuenta como rechazada
+    assert rechazadas["actualizadas"] == 1 and rechazadas["aceptadas_ids"] == []
+    assert [consulta.split()[0] for consulta in consultas].count("UPDATE") == 2
+    assert evento.voluntarios_aceptados == 2
+    assert evento_crud.contar_inscripciones(db, [evento.id])[evento.id]["voluntarios_aceptados"] == 2
+
+def test_aceptar_en_bloque_solo_devuelve_las_filas_que_movio_el_update(db):
+    evento, textual, multiple = crear_evento_con_formulario(db)
+    inscribir_con_respuestas(db, evento, textual, multiple, 3)
+    concurrente = []
+
+    def aceptar_en_otra_transaccion(conn, cursor, statement, parameters, context, executemany):
+        # Entre la lectura y el UPDATE, otra transacción acepta la inscripción 2
+        if statement.startswith("UPDATE inscripciones_eventos") and not concurrente:
+            concurrente.append(statement)
+            conn.exec_driver_sql("UPDATE inscripciones_eventos SET aceptado = 1 WHERE id = 2")
+
+    event.listen(engine, "before_cursor_execute", aceptar_en_otra_transaccion)
+    try:
+        resultado = voluntario_crud.aceptar_inscripciones(db, [1, 2, 3])
+    finally:
+        event.remove(engine, "before_cursor_execute", aceptar_en_otra_transaccion)
+
+    db.refresh(evento)
+    assert resultado == {"aceptadas": 2, "aceptadas_ids": [1, 3]}
+    assert evento.voluntarios_aceptados == 2
+
+def test_respuestas_se_leen_con_la_revision_del_formulario_respondida(db):
+    formulario_versiones.cache.clear()
+    evento, textual, multiple = crear_evento_con_formulario(db)
+    datos = VoluntarioInscripcion(
+        nombre="Ana", correo="ana@example.com", confirmacion_correo="ana@example.com",
+        numero_identificacion="1", evento_id=evento.id, aceptacion_terminos=True
+    )
+    inscripcion = voluntario_crud.inscribir_voluntario(db, datos)
+    sabado = multiple.opciones[0]
+    voluntario_crud.guardar_respuestas_formulario(
+        db, inscripcion.id, "pre", {str(textual.id): "Me gusta ayudar", str(multiple.id): [sabado.id]}
+    )
+    respuesta = db.query(Respuesta).one()
+    assert respuesta.formulario_version_id is not None
+
+    # Los textos cambian en las tablas vivas después de responder
+    db.query(Pregunta).filter(Pregunta.id == multiple.id).update({"texto": "¿Qué turnos prefieres?"})
+    db.query(Opcion).filter(Opcion.id == sabado.id).update({"texto_opcion": "Mañana"})
+    db.commit()
+
+    detalladas, consultas = contar_consultas(
+        lambda: voluntario_crud.get_inscripciones_detalladas_by_evento(db, evento_id=evento.id)
+    )
+
+    assert detalladas[0]["respuestas_pre"] == [
+        {"pregunta_id": textual.id, "pregunta_texto": "¿Por qué quieres participar?",
+         "tipo_pregunta": "textual", "respuesta_texto": "Me gusta ayudar"},
+        {"pregunta_id": multiple.id, "pregunta_texto": "¿Qué días puedes?",
+         "tipo_pregunta": "seleccion_multiple", "opciones_seleccionadas": ["Sábado"]},
+    ]
+    # Los textos salen del snapshot en memoria, sin consultar preguntas, opciones ni revisiones
+    assert not [c for c in consultas if "FROM preguntas" in c or "FROM opciones" in c or "formulario_versiones" in c]
+
+def test_snapshot_de_una_revision_se_cachea_solo_al_confirmar(db):
+    formulario_versiones.cache.clear()
+    evento, _, _ = crear_evento_con_formulario(db)
+
+    revertida = formulario_versiones.registrar(db, evento.formulario_pre_evento, 2)
+    assert formulario_versiones.cache.get(revertida) is None
+    db.rollback()
+    assert formulario_versiones.cache.get(revertida) is None
+
+    confirmada = formulario_versiones.registrar(db, evento.formulario_pre_evento, 2)
+    db.commit()
+    assert formulario_versiones.cache.get(confirmada).preguntas
+
+def test_busqueda_de_texto_completo_se_mantiene_con_las_escrituras(db):
+    evento, textual, multiple = crear_evento_con_formulario(db)
+    inscribir_con_respuestas(db, evento, textual, multiple, 3)
+    ana = voluntario_crud.inscribir_voluntario(db, VoluntarioInscripcion(
+        nombre="Ana María García", correo="ana.garcia@example.com", confirmacion_correo="ana.garcia@example.com",
+        numero_identificacion="52.004.118", evento_id=evento.id, aceptacion_terminos=True
+    ))
+    voluntario_crud.guardar_respuestas_formulario(db, ana.id, "pre", {str(textual.id): "Me encantan los talleres de armado"})
+
+    assert [v["nombre"] for v in busqueda_service.buscar_voluntarios(db, "garcia ana")] == ["Ana María García"]
+    assert [v["numero_identificacion"] for v in busqueda_service.buscar_voluntarios(db, "52.004")] == ["52.004.118"]
+    assert [v["id"] for v in busqueda_service.buscar_voluntarios(db, " ana.garcia@example.com ")] == [ana.voluntario_id]
+    # Los operadores de FTS5 del texto buscado se ignoran
+    assert busqueda_service.buscar_voluntarios(db, '("voluntario*') == busqueda_service.buscar_voluntarios(db, "voluntario")
+    assert len(busqueda_service.buscar_voluntarios(db, "voluntario", limit=2)) == 2
+    assert busqueda_service.buscar_voluntarios(db, "¿?") == []
+
+    # Las actualizaciones y borrados quedan reflejados en el índice
+    db.query(Voluntario).filter(Voluntario.correo == "voluntario0@example.com").update({"nombre": "Beto Ruiz"})
+    db.commit()
+    assert [v["correo"] for v in busqueda_service.buscar_voluntarios(db, "beto")] == ["voluntario0@example.com"]
+
+    respuestas = busqueda_service.buscar_respuestas(db, "taller", evento_id=evento.id)
+    assert [(r["nombre"], r["texto_respuesta"]) for r in respuestas] == [("Ana María García", "Me encantan los talleres de armado")]
+    assert busqueda_service.buscar_respuestas(db, "taller", evento_id=evento.id + 1) == []
+    db.query(DetalleRespuesta).filter(DetalleRespuesta.id == respuestas[0]["detalle_id"]).update({"texto_respuesta": "Otra cosa"})
+    db.commit()
+    assert busqueda_service.buscar_respuestas(db, "taller") == []
+
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        with TestClient(app) as client:
+            respuesta = client.get("/api/voluntarios/buscar", params={"q": "ana"})
+            assert respuesta.status_code == 200
+            assert respuesta.json()[0]["correo"] == "ana.garcia@example.com"
+            assert client.get("/api/voluntarios/respuestas/buscar", params={"q": "otra"}).json()[0]["inscripcion_id"] == ana.id
+            assert client.get("/api/voluntarios/buscar").status_code == 422
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+def test_consulta_mysql_no_exige_palabras_que_innodb_no_indexa():
+    mysql = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+
+    assert busqueda_service._consulta(mysql, "Juan de la Cruz") == "+juan* de* la* +cruz*"
+    # "52" es más corto que innodb_ft_min_token_size
+    assert busqueda_service._consulta(mysql, "52.004.118") == "52* +004* +118*"
+    assert busqueda_service._consulta(mysql, "ana gar") == "+ana* +gar*"
+    assert busqueda_service._consulta(mysql, '+"ana" -(gar)*') == "+ana* +gar*"
@@ -64,6 +64,8 @@ export interface Evento {
 export interface EventoWithStats extends Evento {
   total_voluntarios: number;
   voluntarios_aceptados: number;
+  completados_pre?: number;
+  completados_post?: number;
 }
 
 // Voluntario interfaces